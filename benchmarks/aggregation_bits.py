@@ -0,0 +1,186 @@
+"""Latency microbenchmark of the aggregation bits decoding.
+
+Compares the former list of booleans path (one Python boolean per aggregation bit)
+with the integer path (`aggregate_attestation_bits`, then `select_bits`), on a
+synthetic block where every validator of every committee is decoded. Both decoders
+are kept here for reference: `process_suboptimal_attestations` only looks up the bits
+of our validators, at their positions in committees (see `CommitteePositions`).
+
+Usage:
+    python -m benchmarks.aggregation_bits [--attestations 128] [--committees 64] \
+        [--committee-size 512] [--iterations 100]
+"""
+
+import argparse
+import random
+from collections import defaultdict
+from itertools import chain, compress
+from time import perf_counter
+from typing import Callable, Sequence, TypeVar
+
+from eth_validator_watcher.models import Block
+from eth_validator_watcher.suboptimal_attestations import aggregate_attestation_bits
+
+SLOT = 41
+
+# Translation table from `"0"` and `"1"` characters to `0` and `1` bytes
+BITS_TABLE = bytes.maketrans(b"01", b"\x00\x01")
+
+T = TypeVar("T")
+
+Attestation = Block.Data.Message.Body.Attestation
+
+
+def build_block(nb_attestations: int, nb_committees: int, committee_size: int) -> Block:
+    """Build a block containing `nb_attestations` attestations for slot `SLOT`,
+    spread over `nb_committees` committees of `committee_size` validators."""
+    randomizer = random.Random(42)
+    attestations = []
+
+    for attestation_index in range(nb_attestations):
+        # 95 % of validators attested, plus the boundary bit
+        bits = sum(
+            1 << position
+            for position in range(committee_size)
+            if randomizer.random() < 0.95
+        )
+
+        bits |= 1 << committee_size
+        nb_bytes = committee_size // 8 + 1
+
+        attestations.append(
+            Attestation.model_construct(
+                aggregation_bits=f"0x{bits.to_bytes(nb_bytes, 'little').hex()}",
+                data=Attestation.Data.model_construct(
+                    slot=SLOT, index=attestation_index % nb_committees
+                ),
+            )
+        )
+
+    return Block.model_construct(
+        data=Block.Data.model_construct(
+            message=Block.Data.Message.model_construct(
+                body=Block.Data.Message.Body.model_construct(attestations=attestations)
+            )
+        )
+    )
+
+
+def aggregate_attestations(block: Block, slot: int) -> dict[int, list[bool]]:
+    """Former list of booleans aggregation of attestations of slot `slot`."""
+    committee_index_to_list_of_bools: dict[int, list[list[bool]]] = defaultdict(list)
+
+    for attestation in block.data.message.body.attestations:
+        if attestation.data.slot != slot:
+            continue
+
+        # Hexadecimal to booleans, by bytes in big endian order
+        hex = attestation.aggregation_bits.removeprefix("0x")
+        binary = bin(int(hex, 16))[2:].zfill(len(hex) * 4)
+        bools = [bit == "1" for bit in binary]
+
+        # Switch endianness, by group of 8 bits
+        bools = [
+            bit
+            for start in range(0, len(bools), 8)
+            for bit in bools[start : start + 8][::-1]
+        ]
+
+        # Remove the last `True` (the boundary) and all following `False`
+        last_true = len(bools) - 1 - bools[::-1].index(True)
+
+        committee_index_to_list_of_bools[attestation.data.index].append(
+            bools[:last_true]
+        )
+
+    return {
+        committee_index: [any(bools) for bools in zip(*list_of_bools)]
+        for committee_index, list_of_bools in committee_index_to_list_of_bools.items()
+    }
+
+
+def select_bits(items: Sequence[T], bits: int) -> list[T]:
+    """Former selection of items whose corresponding bit is set, bit `i`
+    corresponding to item `i`."""
+    if bits == 0:
+        return []
+
+    mask = f"{bits:b}"[::-1].encode().translate(BITS_TABLE)
+    return list(compress(items, mask))
+
+
+def decode_bools(block: Block, committees: dict[int, list[int]]) -> set[int]:
+    committee_index_to_bools = aggregate_attestations(block, SLOT)
+
+    return set(
+        chain.from_iterable(
+            (item for item, bit in zip(committees[committee_index], bools) if bit)
+            for committee_index, bools in committee_index_to_bools.items()
+        )
+    )
+
+
+def decode_bits(block: Block, committees: dict[int, list[int]]) -> set[int]:
+    committee_index_to_bits = aggregate_attestation_bits(block, SLOT)
+
+    return set(
+        chain.from_iterable(
+            select_bits(committees[committee_index], bits)
+            for committee_index, bits in committee_index_to_bits.items()
+        )
+    )
+
+
+def measure(
+    function: Callable[[Block, dict[int, list[int]]], set[int]],
+    block: Block,
+    committees: dict[int, list[int]],
+    iterations: int,
+) -> tuple[float, set[int]]:
+    """Return the mean duration (in seconds) of `function`, and its result."""
+    start = perf_counter()
+
+    for _ in range(iterations):
+        result = function(block, committees)
+
+    return (perf_counter() - start) / iterations, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attestations", type=int, default=128)
+    parser.add_argument("--committees", type=int, default=64)
+    parser.add_argument("--committee-size", type=int, default=512)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    block = build_block(args.attestations, args.committees, args.committee_size)
+
+    committees = {
+        committee_index: list(
+            range(
+                committee_index * args.committee_size,
+                (committee_index + 1) * args.committee_size,
+            )
+        )
+        for committee_index in range(args.committees)
+    }
+
+    bools_sec, bools_result = measure(decode_bools, block, committees, args.iterations)
+    bits_sec, bits_result = measure(decode_bits, block, committees, args.iterations)
+
+    assert bools_result == bits_result, "Both paths must agree"
+
+    print(
+        f"{args.attestations} attestations, {args.committees} committees of "
+        f"{args.committee_size} validators, {args.iterations} iterations"
+    )
+
+    print(f"{'mode':<6} {'latency (ms)':>12}")
+    print(f"{'bools':<6} {bools_sec * 1000:>12.2f}")
+    print(f"{'bits':<6} {bits_sec * 1000:>12.2f}")
+    print(f"speedup: {bools_sec / bits_sec:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
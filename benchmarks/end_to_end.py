@@ -0,0 +1,133 @@
+"""End to end throughput and memory benchmark of the watcher.
+
+Runs the watcher against the local simulator (see `benchmarks.simulator`) during a
+given number of epochs, and reports how far behind the chain head the watcher is,
+its peak RSS and its CPU time.
+
+Usage:
+    python -m benchmarks.end_to_end [--validators 1000000] [--our-validators 1000] \
+        [--seconds-per-slot 2] [--epochs 3] [-- <extra watcher options>]
+
+The watcher Prometheus server (port 8000) has to be free.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import sleep
+
+import requests
+
+from benchmarks.simulator import SLOTS_PER_EPOCH, Simulator, SyntheticChain, pubkey
+
+METRICS_URL = "http://127.0.0.1:8000"
+
+
+def watcher_slot() -> int | None:
+    """Return the last slot processed by the watcher, if available."""
+    try:
+        response = requests.get(METRICS_URL, timeout=1)
+    except requests.ConnectionError:
+        return None
+
+    for line in response.text.splitlines():
+        if line.startswith("slot "):
+            return int(float(line.split()[1]))
+
+    return None
+
+
+def process_stats(pid: int) -> tuple[float, float]:
+    """Return the peak RSS (in MB) and the CPU time (in seconds) of process `pid`."""
+    status = Path(f"/proc/{pid}/status").read_text()
+
+    peak_rss_kb = next(
+        int(line.split()[1]) for line in status.splitlines() if line.startswith("VmHWM")
+    )
+
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    cpu_sec = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    return peak_rss_kb / 1024, cpu_sec
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--validators", type=int, default=1_000_000)
+    parser.add_argument("--our-validators", type=int, default=1_000)
+    parser.add_argument("--seconds-per-slot", type=int, default=2)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("watcher_options", nargs="*")
+    args = parser.parse_args()
+
+    print(f"Building a chain of {args.validators} validators...")
+
+    chain = SyntheticChain(args.validators, seconds_per_slot=args.seconds_per_slot)
+
+    with Simulator(chain) as simulator, tempfile.TemporaryDirectory() as directory:
+        keys_path = Path(directory) / "keys.txt"
+        step = max(1, len(chain.active_indexes) // args.our_validators)
+
+        keys_path.write_text(
+            "\n".join(
+                pubkey(index)
+                for index in chain.active_indexes[::step][: args.our_validators]
+            )
+        )
+
+        watcher = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "from eth_validator_watcher.entrypoint import app; app()",
+                "--beacon-url",
+                simulator.url,
+                "--execution-url",
+                simulator.url,
+                "--relay-url",
+                simulator.url,
+                "--pubkeys-file-path",
+                str(keys_path),
+                *args.watcher_options,
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+
+        try:
+            first_slot = chain.current_slot()
+            last_slot = first_slot + args.epochs * SLOTS_PER_EPOCH
+            lags: list[int] = []
+            last_watcher_slot: int | None = None
+
+            while (current_slot := chain.current_slot()) < last_slot:
+                sleep(args.seconds_per_slot)
+
+                if watcher.poll() is not None:
+                    raise RuntimeError("The watcher stopped unexpectedly")
+
+                if (slot := watcher_slot()) is not None:
+                    lags.append(current_slot - slot)
+                    last_watcher_slot = slot
+
+            peak_rss_mb, cpu_sec = process_stats(watcher.pid)
+        finally:
+            watcher.terminate()
+            watcher.wait()
+
+    print(
+        f"{args.validators} validators ({args.our_validators} ours), "
+        f"{args.seconds_per_slot} seconds per slot, {args.epochs} epochs"
+    )
+
+    print(f"chain slots     : {first_slot} -> {last_slot}")
+    print(f"last slot       : {last_watcher_slot}")
+    print(f"max lag (slots) : {max(lags, default=None)}")
+    print(f"peak RSS (MB)   : {peak_rss_mb:.0f}")
+    print(f"CPU time (s)    : {cpu_sec:.1f}")
+
+
+if __name__ == "__main__":
+    main()
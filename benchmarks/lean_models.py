@@ -0,0 +1,71 @@
+"""Latency benchmark of blocks and rewards decoding, pydantic versus lean models.
+
+A block and attestations rewards of a synthetic chain (see `benchmarks.simulator`)
+are decoded into the pydantic models (`eth_validator_watcher.models`) and into the
+lean models (`eth_validator_watcher.lean_models`) used by the watcher.
+
+Usage:
+    python -m benchmarks.lean_models [--validators 1000000] [--rewards 100000] \
+        [--iterations 100]
+"""
+
+import argparse
+from time import perf_counter
+from typing import Callable
+
+from benchmarks.simulator import SLOTS_PER_EPOCH, SyntheticChain
+from eth_validator_watcher import models
+from eth_validator_watcher.lean_models import decode_block, decode_rewards
+
+SLOT = 100
+
+
+def best_duration_ms(function: Callable[[], object], nb_calls: int) -> float:
+    """Return the best mean duration of `function` over 5 runs of `nb_calls` calls,
+    in milliseconds."""
+    durations: list[float] = []
+
+    for _ in range(5):
+        start = perf_counter()
+
+        for _ in range(nb_calls):
+            function()
+
+        durations.append((perf_counter() - start) / nb_calls)
+
+    return min(durations) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--validators", type=int, default=1_000_000)
+    parser.add_argument("--rewards", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    chain = SyntheticChain(args.validators)
+    block_dict = chain.block(SLOT)
+    rewards_dict = chain.rewards(SLOT // SLOTS_PER_EPOCH, list(range(args.rewards)))
+
+    print(
+        f"Block of {args.validators} validators chain ({args.iterations} iterations), "
+        f"rewards of {args.rewards} validators"
+    )
+
+    print(f"{'model':<8} {'pydantic (ms)':>14} {'lean (ms)':>10} {'speedup':>8}")
+
+    for name, model, decode, item, nb_calls in (
+        ("block", models.Block, decode_block, block_dict, args.iterations),
+        ("rewards", models.Rewards, decode_rewards, rewards_dict, 1),
+    ):
+        pydantic_ms = best_duration_ms(lambda: model(**item), nb_calls)
+        lean_ms = best_duration_ms(lambda: decode(item), nb_calls)
+
+        print(
+            f"{name:<8} {pydantic_ms:>14.2f} {lean_ms:>10.2f} "
+            f"{pydantic_ms / lean_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Throughput benchmark of the replay mode, in slots processed per second.
+
+Replays past epochs of the local simulator (see `benchmarks.simulator`) twice: first
+from the simulator, recording an archive of responses, then from this archive only.
+The second run is deterministic and measures the processing alone.
+
+Usage:
+    python -m benchmarks.replay [--validators 100000] [--our-validators 1000] \
+        [--epochs 4]
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks.simulator import SLOTS_PER_EPOCH, Simulator, SyntheticChain, pubkey
+from eth_validator_watcher import entrypoint
+from eth_validator_watcher.models import BeaconType
+
+# Nothing listens on this port, so every request has to be served by the archive
+UNREACHABLE_URL = "http://127.0.0.1:9"
+
+
+def replay(
+    beacon_url: str,
+    pubkeys_file_path: Path,
+    archive_path: Path,
+    from_epoch: int,
+    to_epoch: int,
+) -> float:
+    """Replay epochs `from_epoch` to `to_epoch`, and return the duration in seconds."""
+    start = perf_counter()
+
+    entrypoint._handler(
+        beacon_url=[beacon_url],
+        execution_url=None,
+        pubkeys_file_path=pubkeys_file_path,
+        web3signer_url=None,
+        fee_recipient=None,
+        slack_channel=None,
+        telegram_channel=None,
+        beacon_type=BeaconType.OTHER,
+        relays_url=[],
+        liveness_file=None,
+        explorer_url=None,
+        replay_from_epoch=from_epoch,
+        replay_to_epoch=to_epoch,
+        replay_archive=archive_path,
+    )
+
+    return perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--validators", type=int, default=100_000)
+    parser.add_argument("--our-validators", type=int, default=1_000)
+    parser.add_argument("--epochs", type=int, default=4)
+    args = parser.parse_args()
+
+    # Metrics are not scraped
+    entrypoint.start_http_server = lambda _: None  # type: ignore
+
+    chain = SyntheticChain(args.validators)
+    to_epoch = chain.current_slot() // SLOTS_PER_EPOCH - 2
+    from_epoch = to_epoch - args.epochs + 1
+    nb_slots = args.epochs * SLOTS_PER_EPOCH
+
+    with tempfile.TemporaryDirectory() as directory:
+        pubkeys_file_path = Path(directory) / "pubkeys.txt"
+        archive_path = Path(directory) / "archive"
+
+        pubkeys_file_path.write_text(
+            "\n".join(
+                pubkey(index) for index in chain.active_indexes[: args.our_validators]
+            )
+        )
+
+        with Simulator(chain) as simulator:
+            live_sec = replay(
+                simulator.url, pubkeys_file_path, archive_path, from_epoch, to_epoch
+            )
+
+        archive_sec = replay(
+            UNREACHABLE_URL, pubkeys_file_path, archive_path, from_epoch, to_epoch
+        )
+
+        archive_size_bytes = sum(path.stat().st_size for path in archive_path.iterdir())
+
+    print(
+        f"{args.validators} validators ({args.our_validators} ours), "
+        f"epochs {from_epoch} -> {to_epoch}"
+    )
+
+    print(f"{'source':<10} {'slots/s':>8}")
+    print(f"{'simulator':<10} {nb_slots / live_sec:>8.1f}")
+    print(f"{'archive':<10} {nb_slots / archive_sec:>8.1f}")
+    print(f"archive size: {archive_size_bytes / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Latency benchmark of the attestations rewards processing.
+
+Rewards of a synthetic chain (see `benchmarks.simulator`) are decoded, then
+processed by `process_rewards` for the whole network and for our validators.
+
+Usage:
+    python -m benchmarks.rewards [--validators 1000000] [--our-validators 10000]
+"""
+
+import argparse
+from time import perf_counter
+
+from benchmarks.simulator import EFFECTIVE_BALANCE, SyntheticChain
+from eth_validator_watcher.lean_models import Rewards, decode_rewards
+from eth_validator_watcher.models import BeaconType, Validators
+from eth_validator_watcher.registry import ValidatorRegistry
+from eth_validator_watcher.rewards import process_rewards
+from eth_validator_watcher.utils import LimitedDict
+
+StatusEnum = Validators.DataItem.StatusEnum
+
+EPOCH = 42
+
+
+class Beacon:
+    """Beacon answering already decoded rewards."""
+
+    def __init__(self, rewards: Rewards) -> None:
+        self.rewards = rewards
+
+    def get_rewards(
+        self,
+        beacon_type: BeaconType,
+        epoch: int,
+        validators_index: set[int] | None = None,
+    ) -> Rewards:
+        return self.rewards
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--validators", type=int, default=1_000_000)
+    parser.add_argument("--our-validators", type=int, default=10_000)
+    args = parser.parse_args()
+
+    chain = SyntheticChain(args.validators)
+    rewards_dict = chain.rewards(EPOCH - 2, [])
+
+    start = perf_counter()
+    rewards = decode_rewards(rewards_dict)
+    decode_sec = perf_counter() - start
+
+    registry = ValidatorRegistry.from_items(
+        (index, StatusEnum.activeOngoing, f"0x{index:096x}", EFFECTIVE_BALANCE, False)
+        for index in chain.active_indexes
+    )
+
+    step = max(1, len(registry) // args.our_validators)
+    our_pubkeys = {f"0x{index:096x}" for index in chain.active_indexes[::step]}
+    our_registry = registry.select_pubkeys(our_pubkeys)
+
+    net_epoch_to_index_to_validator = LimitedDict(3)
+    our_epoch_to_index_to_validator = LimitedDict(3)
+
+    net_epoch_to_index_to_validator[EPOCH] = registry.view([StatusEnum.activeOngoing])
+    our_epoch_to_index_to_validator[EPOCH] = our_registry.view(
+        [StatusEnum.activeOngoing]
+    )
+
+    start = perf_counter()
+
+    process_rewards(
+        Beacon(rewards),  # type: ignore
+        BeaconType.OTHER,
+        EPOCH,
+        net_epoch_to_index_to_validator,
+        our_epoch_to_index_to_validator,
+    )
+
+    process_sec = perf_counter() - start
+
+    print(f"{len(registry)} validators, {len(our_registry)} of ours")
+    print(f"decode : {decode_sec:.3f} s")
+    print(f"process: {process_sec:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark of attestations rewards decoding, whole versus streamed.
+
+Rewards of a synthetic chain (see `benchmarks.simulator`) are serialized, then
+decoded as `Beacon.get_rewards` used to (the whole JSON tree, then the models) and
+as it does now (streamed, by batches of total rewards). Duration and peak memory
+allocated by the decoding are measured for both.
+
+Usage:
+    python -m benchmarks.rewards_stream [--validators 1000000]
+"""
+
+import argparse
+import json
+import tracemalloc
+from time import perf_counter
+from typing import Callable, Iterator
+
+from benchmarks.simulator import SyntheticChain
+from eth_validator_watcher.beacon import STREAM_CHUNK_SIZE_BYTES
+from eth_validator_watcher.json_stream import iter_json_arrays
+from eth_validator_watcher.lean_models import (
+    Rewards,
+    decode_rewards,
+    decode_streamed_rewards,
+)
+
+
+def measure(decode: Callable[[], Rewards]) -> tuple[float, float]:
+    """Return the duration (in seconds) and the peak memory (in MB) of `decode`.
+
+    Tracing allocations slows decoding down, so the duration is measured apart.
+    """
+    start = perf_counter()
+    decode()
+    duration_sec = perf_counter() - start
+
+    tracemalloc.start()
+    decode()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return duration_sec, peak_bytes / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--validators", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    chain = SyntheticChain(args.validators)
+    content = json.dumps(chain.rewards(0, []), separators=(",", ":")).encode()
+
+    def chunks() -> Iterator[bytes]:
+        for start in range(0, len(content), STREAM_CHUNK_SIZE_BYTES):
+            yield content[start : start + STREAM_CHUNK_SIZE_BYTES]
+
+    print(f"{len(content) / 1e6:.1f} MB of rewards")
+    print(f"{'decoding':<9} {'duration (s)':>13} {'peak (MB)':>10}")
+
+    for name, decode in (
+        ("whole", lambda: decode_rewards(json.loads(content))),
+        (
+            "streamed",
+            lambda: decode_streamed_rewards(
+                iter_json_arrays(chunks(), {"ideal_rewards", "total_rewards"}, ["data"])
+            ),
+        ),
+    ):
+        duration_sec, peak_mb = measure(decode)
+        print(f"{name:<9} {duration_sec:>13.2f} {peak_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,850 @@
+"""Local beacon, execution and relay nodes simulator.
+
+Serves, from a synthetic chain, every endpoint used by `Beacon`, `Execution`,
+`Relays` and `EventStream`, so the whole watcher can be run (and benchmarked) at
+mainnet scale without any network access.
+
+The chain is fully deterministic: validators statuses, missed slots and missed
+attestations only depend on the seed. The slot clock may be accelerated with
+`--seconds-per-slot`.
+
+Usage:
+    python -m benchmarks.simulator [--validators 1000000] [--seconds-per-slot 12] \
+        [--missed-slots-rate 0.01] [--missed-attestations-rate 0.02] [--port 5052]
+
+Then, in an other terminal:
+    eth-validator-watcher --beacon-url http://localhost:5052 \
+        --execution-url http://localhost:5052 --relay-url http://localhost:5052 \
+        --pubkeys-file-path keys.txt
+
+Public keys of validators are `0x` followed by the validator index, written in
+hexadecimal on 96 characters.
+"""
+
+import argparse
+import json
+import random
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import sleep, time
+from typing import Any, Iterable, Iterator
+from urllib.parse import parse_qs, urlparse
+
+SLOTS_PER_EPOCH = 32
+TARGET_COMMITTEE_SIZE = 128
+MAX_COMMITTEES_PER_SLOT = 64
+EFFECTIVE_BALANCE = 32_000_000_000
+FEE_RECIPIENT = "0x" + "fe" * 20
+FAR_FUTURE_EPOCH = 2**64 - 1
+
+# Number of validators serialized at once in the validators response
+VALIDATORS_CHUNK_SIZE = 10_000
+
+# Number of aggregates per committee in blocks
+AGGREGATES_PER_COMMITTEE = 2
+
+
+def pubkey(index: int) -> str:
+    """Public key of validator `index`."""
+    return f"0x{index:096x}"
+
+
+def root(value: int) -> str:
+    """A fake 32 bytes root derived from `value`."""
+    return f"0x{value:064x}"
+
+
+class SyntheticChain:
+    """Deterministic synthetic chain."""
+
+    def __init__(
+        self,
+        nb_validators: int,
+        seconds_per_slot: int = 12,
+        missed_slots_rate: float = 0.01,
+        missed_attestations_rate: float = 0.02,
+        committees_per_slot: int | None = None,
+        block_delay_ratio: float = 0.2,
+        start_slot: int = 10 * SLOTS_PER_EPOCH,
+        seed: int = 42,
+    ) -> None:
+        """Synthetic chain
+
+        Parameters:
+        nb_validators           : Number of validators in the registry
+        seconds_per_slot        : Slot duration, in seconds
+        missed_slots_rate       : Ratio of slots without block
+        missed_attestations_rate: Ratio of validators missing their attestation
+        committees_per_slot     : Number of committees per slot. If None, computed
+                                  as in the specification
+        block_delay_ratio       : Delay between the slot start and the block
+                                  reception, as a ratio of the slot duration
+        start_slot              : Current slot when the chain is created
+        seed                    : Seed of all random choices
+        """
+        self.nb_validators = nb_validators
+        self.seconds_per_slot = seconds_per_slot
+        self.missed_slots_rate = missed_slots_rate
+        self.missed_attestations_rate = missed_attestations_rate
+        self.block_delay_sec = block_delay_ratio * seconds_per_slot
+        self.seed = seed
+        self.genesis_time = int(time()) - start_slot * seconds_per_slot
+
+        self.active_indexes = [
+            index for index in range(nb_validators) if self.is_active(index)
+        ]
+
+        self.committees_per_slot = committees_per_slot or max(
+            1,
+            min(
+                MAX_COMMITTEES_PER_SLOT,
+                len(self.active_indexes) // SLOTS_PER_EPOCH // TARGET_COMMITTEE_SIZE,
+            ),
+        )
+
+        self.__lock = Lock()
+
+    # Randomness
+    # ----------
+    def __ratio(self, *values: int) -> float:
+        """A deterministic pseudo random number in [0, 1) derived from `values`."""
+        hash_ = self.seed
+
+        for value in values:
+            hash_ = (hash_ * 6364136223846793005 + value + 1442695040888963407) % (
+                1 << 64
+            )
+
+        hash_ ^= hash_ >> 29
+        hash_ = (hash_ * 0xBF58476D1CE4E5B9) % (1 << 64)
+        hash_ ^= hash_ >> 32
+        return hash_ / (1 << 64)
+
+    # Clock
+    # -----
+    def current_slot(self) -> int:
+        return int((time() - self.genesis_time) // self.seconds_per_slot)
+
+    def slot_start_time(self, slot: int) -> float:
+        return self.genesis_time + slot * self.seconds_per_slot
+
+    def block_time(self, slot: int) -> float:
+        return self.slot_start_time(slot) + self.block_delay_sec
+
+    def is_block_received(self, slot: int) -> bool:
+        return (
+            0 <= slot
+            and time() >= self.block_time(slot)
+            and not self.is_slot_missed(slot)
+        )
+
+    def head_slot(self) -> int:
+        slot = self.current_slot()
+
+        while slot > 0 and not self.is_block_received(slot):
+            slot -= 1
+
+        return slot
+
+    def finalized_slot(self) -> int:
+        epoch = max(0, self.current_slot() // SLOTS_PER_EPOCH - 2)
+        slot = epoch * SLOTS_PER_EPOCH
+
+        while slot > 0 and self.is_slot_missed(slot):
+            slot -= 1
+
+        return slot
+
+    # Validators
+    # ----------
+    def status(self, index: int) -> str:
+        bucket = index % 1000
+
+        if index >= self.nb_validators * 0.99:
+            return "pending_queued"
+
+        if bucket == 997:
+            return "exited_unslashed"
+
+        if bucket == 998:
+            return "withdrawal_done"
+
+        if bucket == 999 and index % 7 == 0:
+            return "exited_slashed"
+
+        return "active_ongoing"
+
+    def is_active(self, index: int) -> bool:
+        return self.status(index).startswith("active")
+
+    def is_slashed(self, index: int) -> bool:
+        return self.status(index) == "exited_slashed"
+
+    def is_slot_missed(self, slot: int) -> bool:
+        return slot > 0 and self.__ratio(1, slot) < self.missed_slots_rate
+
+    def is_attestation_missed(self, epoch: int, index: int) -> bool:
+        return self.__ratio(2, epoch, index) < self.missed_attestations_rate
+
+    # Duties
+    # ------
+    def proposer(self, slot: int) -> int:
+        active_indexes = self.active_indexes
+        return active_indexes[int(self.__ratio(3, slot) * len(active_indexes))]
+
+    @lru_cache(maxsize=4)
+    def __shuffled(self, epoch: int) -> list[int]:
+        shuffled = list(self.active_indexes)
+        random.Random(self.seed * 1_000_003 + epoch).shuffle(shuffled)
+        return shuffled
+
+    def committees(self, epoch: int) -> list[tuple[int, int, list[int]]]:
+        """Return the list of `(slot, committee index, validators)` of `epoch`."""
+        with self.__lock:
+            shuffled = self.__shuffled(epoch)
+
+        nb_committees = SLOTS_PER_EPOCH * self.committees_per_slot
+        size, remainder = divmod(len(shuffled), nb_committees)
+
+        result = []
+        start = 0
+
+        for position in range(nb_committees):
+            end = start + size + (1 if position < remainder else 0)
+            slot_in_epoch, committee_index = divmod(position, self.committees_per_slot)
+            slot = epoch * SLOTS_PER_EPOCH + slot_in_epoch
+            result.append((slot, committee_index, shuffled[start:end]))
+            start = end
+
+        return result
+
+    # Blocks
+    # ------
+    @lru_cache(maxsize=64)
+    def block(self, slot: int) -> dict[str, Any]:
+        """Return the block of `slot`, which has to exist. Do not modify it."""
+        attestations = []
+        previous_slot = slot - 1
+
+        if previous_slot >= 0:
+            previous_epoch = previous_slot // SLOTS_PER_EPOCH
+
+            for committee_slot, committee_index, validators in self.committees(
+                previous_epoch
+            ):
+                if committee_slot != previous_slot:
+                    continue
+
+                bits = [
+                    0 if self.is_attestation_missed(previous_epoch, index) else 1
+                    for index in validators
+                ]
+
+                # Split attesting validators into several aggregates
+                for aggregate in range(AGGREGATES_PER_COMMITTEE):
+                    aggregate_bits = sum(
+                        bit << position
+                        for position, bit in enumerate(bits)
+                        if position % AGGREGATES_PER_COMMITTEE == aggregate
+                    ) | (1 << len(bits))
+
+                    nb_bytes = len(bits) // 8 + 1
+
+                    attestations.append(
+                        dict(
+                            aggregation_bits="0x"
+                            + aggregate_bits.to_bytes(nb_bytes, "little").hex(),
+                            data=dict(
+                                slot=str(previous_slot),
+                                index=str(committee_index),
+                                beacon_block_root=root(previous_slot),
+                                source=dict(
+                                    epoch=str(max(0, previous_epoch - 1)),
+                                    root=root(0),
+                                ),
+                                target=dict(epoch=str(previous_epoch), root=root(0)),
+                            ),
+                            signature="0x" + "00" * 96,
+                        )
+                    )
+
+        return dict(
+            version="deneb",
+            execution_optimistic=False,
+            finalized=False,
+            data=dict(
+                message=dict(
+                    slot=str(slot),
+                    proposer_index=str(self.proposer(slot)),
+                    parent_root=root(slot - 1),
+                    state_root=root(slot),
+                    body=dict(
+                        randao_reveal="0x" + "00" * 96,
+                        eth1_data=dict(
+                            deposit_root=root(0),
+                            deposit_count=str(self.nb_validators),
+                            block_hash=root(0),
+                        ),
+                        graffiti=root(0),
+                        proposer_slashings=[],
+                        attester_slashings=[],
+                        attestations=attestations,
+                        deposits=[],
+                        voluntary_exits=[],
+                        execution_payload=dict(
+                            fee_recipient=FEE_RECIPIENT,
+                            block_hash=root(slot),
+                        ),
+                    ),
+                ),
+                signature="0x" + "00" * 96,
+            ),
+        )
+
+    @lru_cache(maxsize=64)
+    def ssz_block(self, slot: int) -> bytes:
+        """Return the block of `slot`, SSZ encoded. See `ssz_block`."""
+        return ssz_block(self.block(slot))
+
+    def header(self, slot: int) -> dict[str, Any]:
+        return dict(
+            execution_optimistic=False,
+            finalized=False,
+            data=dict(
+                root=root(slot),
+                canonical=True,
+                header=dict(
+                    message=dict(
+                        slot=str(slot),
+                        proposer_index=str(self.proposer(slot)),
+                        parent_root=root(slot - 1),
+                        state_root=root(slot),
+                        body_root=root(slot),
+                    ),
+                    signature="0x" + "00" * 96,
+                ),
+            ),
+        )
+
+    # Validators registry
+    # -------------------
+    def iter_validators(self, ids: list[str] | None) -> Iterator[bytes]:
+        """Yield the validators response, chunk by chunk."""
+        if ids is None:
+            indexes: Iterable[int] = range(self.nb_validators)
+        else:
+            indexes = sorted(
+                {
+                    int(id_, 16) if id_.startswith("0x") else int(id_)
+                    for id_ in ids
+                    if id_ != ""
+                }
+                & set(range(self.nb_validators))
+            )
+
+        yield b'{"execution_optimistic":false,"finalized":false,"data":['
+
+        chunk: list[str] = []
+        first = True
+
+        for index in indexes:
+            chunk.append(
+                f'{{"index":"{index}","balance":"{EFFECTIVE_BALANCE}",'
+                f'"status":"{self.status(index)}","validator":{{'
+                f'"pubkey":"{pubkey(index)}","withdrawal_credentials":"{root(index)}",'
+                f'"effective_balance":"{EFFECTIVE_BALANCE}",'
+                f'"slashed":{"true" if self.is_slashed(index) else "false"},'
+                f'"activation_eligibility_epoch":"0","activation_epoch":"0",'
+                f'"exit_epoch":"{FAR_FUTURE_EPOCH}",'
+                f'"withdrawable_epoch":"{FAR_FUTURE_EPOCH}"}}}}'
+            )
+
+            if len(chunk) == VALIDATORS_CHUNK_SIZE:
+                yield (("" if first else ",") + ",".join(chunk)).encode()
+                chunk, first = [], False
+
+        if len(chunk) > 0:
+            yield (("" if first else ",") + ",".join(chunk)).encode()
+
+        yield b"]}"
+
+    # Liveness and rewards
+    # --------------------
+    def liveness(self, epoch: int, indexes: list[int]) -> dict[str, Any]:
+        return dict(
+            data=[
+                dict(
+                    index=str(index),
+                    is_live=not self.is_attestation_missed(epoch, index),
+                )
+                for index in indexes
+            ]
+        )
+
+    def rewards(self, epoch: int, indexes: list[int]) -> dict[str, Any]:
+        if len(indexes) == 0:
+            indexes = self.active_indexes
+
+        total_rewards = []
+
+        for index in indexes:
+            if self.is_attestation_missed(epoch, index):
+                source, target, head = -2000, -4000, 0
+            else:
+                source, target, head = 2000, 4000, 2000
+
+            total_rewards.append(
+                dict(
+                    validator_index=str(index),
+                    head=str(head),
+                    target=str(target),
+                    source=str(source),
+                    inclusion_delay="0",
+                    inactivity="0",
+                )
+            )
+
+        return dict(
+            execution_optimistic=False,
+            finalized=False,
+            data=dict(
+                ideal_rewards=[
+                    dict(
+                        effective_balance=str(EFFECTIVE_BALANCE),
+                        head="2000",
+                        target="4000",
+                        source="2000",
+                        inclusion_delay="0",
+                        inactivity="0",
+                    )
+                ],
+                total_rewards=total_rewards,
+            ),
+        )
+
+
+class Simulator:
+    """HTTP server serving a synthetic chain, as beacon, execution and relay node."""
+
+    def __init__(self, chain: SyntheticChain, port: int = 0) -> None:
+        """Simulator
+
+        Parameters:
+        chain: Synthetic chain to serve
+        port : Port to listen on. If 0, a free port is chosen.
+        """
+        self.chain = chain
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            # Headers and body are written separately: without this, small responses
+            # wait for delayed acknowledgements
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                simulator.handle(self, "GET")
+
+            def do_POST(self) -> None:
+                simulator.handle(self, "POST")
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.__server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.__server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.__server.server_port}"
+        self.__thread = Thread(target=self.__server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "Simulator":
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def serve_forever(self) -> None:
+        self.__server.serve_forever()
+
+    def handle(self, request: BaseHTTPRequestHandler, method: str) -> None:
+        url = urlparse(request.path)
+        parts = url.path.strip("/").split("/")
+        query = parse_qs(url.query)
+        chain = self.chain
+
+        body: Any = None
+
+        if method == "POST":
+            length = int(request.headers.get("Content-Length", 0))
+            body = json.loads(request.rfile.read(length) or b"null")
+
+        match method, parts:
+            case "GET", ["eth", "v1", "beacon", "genesis"]:
+                send_json(
+                    request,
+                    dict(
+                        data=dict(
+                            genesis_time=str(chain.genesis_time),
+                            genesis_validators_root=root(0),
+                            genesis_fork_version="0x00000000",
+                        )
+                    ),
+                )
+
+            case "GET", ["eth", "v1", "config", "spec"]:
+                send_json(
+                    request,
+                    dict(
+                        data=dict(
+                            SECONDS_PER_SLOT=str(chain.seconds_per_slot),
+                            SLOTS_PER_EPOCH=str(SLOTS_PER_EPOCH),
+                        )
+                    ),
+                )
+
+            case "GET", ["eth", "v1", "beacon", "headers", block_identifier]:
+                slot = {
+                    "head": chain.head_slot,
+                    "finalized": chain.finalized_slot,
+                    "genesis": lambda: 0,
+                }.get(block_identifier, lambda: int(block_identifier))()
+
+                if not chain.is_block_received(slot) and slot != 0:
+                    send_not_found(request)
+                else:
+                    send_json(request, chain.header(slot))
+
+            case "GET", ["eth", "v2", "beacon", "blocks", slot_str]:
+                slot = int(slot_str)
+
+                if not chain.is_block_received(slot):
+                    send_not_found(request)
+                elif "application/octet-stream" in request.headers.get("Accept", ""):
+                    version = chain.block(slot)["version"]
+                    send_ssz(request, chain.ssz_block(slot), version)
+                else:
+                    send_json(request, chain.block(slot))
+
+            case "GET", ["eth", "v1", "validator", "duties", "proposer", epoch_str]:
+                epoch = int(epoch_str)
+                slots = range(epoch * SLOTS_PER_EPOCH, (epoch + 1) * SLOTS_PER_EPOCH)
+
+                send_json(
+                    request,
+                    dict(
+                        dependent_root=root(max(0, epoch * SLOTS_PER_EPOCH - 1)),
+                        execution_optimistic=False,
+                        data=[
+                            dict(
+                                pubkey=pubkey(chain.proposer(slot)),
+                                validator_index=str(chain.proposer(slot)),
+                                slot=str(slot),
+                            )
+                            for slot in slots
+                        ],
+                    ),
+                )
+
+            case "GET", ["eth", "v1", "beacon", "states", _, "committees"]:
+                epoch = int(query["epoch"][0])
+
+                send_json(
+                    request,
+                    dict(
+                        execution_optimistic=False,
+                        finalized=False,
+                        data=[
+                            dict(
+                                index=str(committee_index),
+                                slot=str(slot),
+                                validators=[str(index) for index in validators],
+                            )
+                            for slot, committee_index, validators in chain.committees(
+                                epoch
+                            )
+                        ],
+                    ),
+                )
+
+            case "GET", ["eth", "v1", "beacon", "states", _, "validators"]:
+                ids = ",".join(query["id"]).split(",") if "id" in query else None
+
+                send_chunks(request, chain.iter_validators(ids))
+
+            case "POST", ["eth", "v1", "validator", "liveness", epoch_str]:
+                indexes = body["indices"] if isinstance(body, dict) else body
+                send_json(
+                    request,
+                    chain.liveness(int(epoch_str), [int(index) for index in indexes]),
+                )
+
+            case "POST", ["lighthouse", "liveness"]:
+                send_json(
+                    request,
+                    chain.liveness(
+                        int(body["epoch"]), [int(index) for index in body["indices"]]
+                    ),
+                )
+
+            case "POST", ["eth", "v1", "beacon", "rewards", "attestations", epoch_str]:
+                send_json(
+                    request,
+                    chain.rewards(int(epoch_str), [int(index) for index in body]),
+                )
+
+            case "GET", ["eth", "v1", "events"]:
+                send_chunks(request, iter_events(chain))
+
+            case "GET", [
+                "relay",
+                "v1",
+                "data",
+                "bidtraces",
+                "proposer_payload_delivered",
+            ]:
+                slot = int(query["slot"][0])
+                delivered = chain.is_block_received(slot)
+
+                send_json(
+                    request,
+                    [dict(slot=str(slot), block_hash=root(slot))] if delivered else [],
+                )
+
+            case "POST", [""] if body is not None and body.get(
+                "method"
+            ) == "eth_getBlockByHash":
+                send_json(
+                    request,
+                    dict(
+                        jsonrpc="2.0",
+                        id=int(body.get("id", 1)),
+                        result=dict(transactions=[dict(to=FEE_RECIPIENT)]),
+                    ),
+                )
+
+            case _:
+                send_not_found(request)
+
+
+def iter_events(chain: SyntheticChain) -> Iterator[bytes]:
+    """Yield Server-Sent Events, at each received block."""
+    slot = chain.current_slot() + 1
+
+    while True:
+        sleep(max(0, chain.block_time(slot) - time()))
+
+        if chain.is_block_received(slot):
+            epoch = slot // SLOTS_PER_EPOCH
+
+            head = dict(
+                slot=str(slot),
+                block=root(slot),
+                state=root(slot),
+                epoch_transition=slot % SLOTS_PER_EPOCH == 0,
+                previous_duty_dependent_root=root(
+                    max(0, (epoch - 1) * SLOTS_PER_EPOCH - 1)
+                ),
+                current_duty_dependent_root=root(max(0, epoch * SLOTS_PER_EPOCH - 1)),
+                execution_optimistic=False,
+            )
+
+            block = dict(slot=str(slot), block=root(slot), execution_optimistic=False)
+
+            yield (
+                f"event: block\ndata: {json.dumps(block)}\n\n"
+                f"event: head\ndata: {json.dumps(head)}\n\n"
+            ).encode()
+
+        slot += 1
+
+
+def ssz_block(block: dict[str, Any]) -> bytes:
+    """SSZ encoding of a deneb signed block returned by `SyntheticChain.block`.
+
+    Fields absent from the JSON block (sync aggregate, most of the execution
+    payload...) are zeroed, and lists absent or empty in the JSON block are empty.
+    """
+
+    def uint32(value: int) -> bytes:
+        return value.to_bytes(4, "little")
+
+    def uint64(value: str | int) -> bytes:
+        return int(value).to_bytes(8, "little")
+
+    def hex_bytes(value: str) -> bytes:
+        return bytes.fromhex(value[2:])
+
+    def variable_list(items: list[bytes]) -> bytes:
+        offsets = b"".join(
+            uint32(4 * len(items) + sum(len(item) for item in items[:position]))
+            for position in range(len(items))
+        )
+
+        return offsets + b"".join(items)
+
+    def container(*fields: bytes | list[bytes]) -> bytes:
+        """Fixed size fields are given as bytes, variable size ones as a list with
+        a single item."""
+        fixed_size = sum(
+            4 if isinstance(field, list) else len(field) for field in fields
+        )
+        fixed, variable = b"", b""
+
+        for field in fields:
+            if isinstance(field, list):
+                fixed += uint32(fixed_size + len(variable))
+                variable += field[0]
+            else:
+                fixed += field
+
+        return fixed + variable
+
+    message = block["data"]["message"]
+    body = message["body"]
+    payload = body["execution_payload"]
+
+    attestations = [
+        container(
+            [hex_bytes(attestation["aggregation_bits"])],
+            uint64(attestation["data"]["slot"])
+            + uint64(attestation["data"]["index"])
+            + hex_bytes(attestation["data"]["beacon_block_root"])
+            + uint64(attestation["data"]["source"]["epoch"])
+            + hex_bytes(attestation["data"]["source"]["root"])
+            + uint64(attestation["data"]["target"]["epoch"])
+            + hex_bytes(attestation["data"]["target"]["root"]),
+            hex_bytes(attestation["signature"]),
+        )
+        for attestation in body["attestations"]
+    ]
+
+    execution_payload = container(
+        bytes(32),  # parent_hash
+        hex_bytes(payload["fee_recipient"]),
+        bytes(32 + 32 + 256 + 32),  # state_root, receipts_root, logs_bloom, prev_randao
+        bytes(8 * 4),  # block_number, gas_limit, gas_used, timestamp
+        [b""],  # extra_data
+        bytes(32),  # base_fee_per_gas
+        hex_bytes(payload["block_hash"]),
+        [b""],  # transactions
+        [b""],  # withdrawals
+        bytes(8 + 8),  # blob_gas_used, excess_blob_gas
+    )
+
+    eth1_data = body["eth1_data"]
+
+    block_body = container(
+        hex_bytes(body["randao_reveal"]),
+        hex_bytes(eth1_data["deposit_root"])
+        + uint64(eth1_data["deposit_count"])
+        + hex_bytes(eth1_data["block_hash"]),
+        hex_bytes(body["graffiti"]),
+        [b""],  # proposer_slashings
+        [b""],  # attester_slashings
+        [variable_list(attestations)],
+        [b""],  # deposits
+        [b""],  # voluntary_exits
+        bytes(64 + 96),  # sync_aggregate
+        [execution_payload],
+        [b""],  # bls_to_execution_changes
+        [b""],  # blob_kzg_commitments
+    )
+
+    beacon_block = container(
+        uint64(message["slot"]),
+        uint64(message["proposer_index"]),
+        hex_bytes(message["parent_root"]),
+        hex_bytes(message["state_root"]),
+        [block_body],
+    )
+
+    signature = block["data"].get("signature", "0x" + "00" * 96)
+    return container([beacon_block], hex_bytes(signature))
+
+
+def send_ssz(request: BaseHTTPRequestHandler, content: bytes, version: str) -> None:
+    request.send_response(200)
+    request.send_header("Content-Type", "application/octet-stream")
+    request.send_header("Eth-Consensus-Version", version)
+    request.send_header("Content-Length", str(len(content)))
+    request.end_headers()
+    request.wfile.write(content)
+
+
+def send_json(request: BaseHTTPRequestHandler, data: Any) -> None:
+    content = json.dumps(data, separators=(",", ":")).encode()
+
+    request.send_response(200)
+    request.send_header("Content-Type", "application/json")
+    request.send_header("Content-Length", str(len(content)))
+    request.end_headers()
+    request.wfile.write(content)
+
+
+def send_not_found(request: BaseHTTPRequestHandler) -> None:
+    content = b'{"code":404,"message":"Not found"}'
+
+    request.send_response(404)
+    request.send_header("Content-Type", "application/json")
+    request.send_header("Content-Length", str(len(content)))
+    request.end_headers()
+    request.wfile.write(content)
+
+
+def send_chunks(request: BaseHTTPRequestHandler, chunks: Iterable[bytes]) -> None:
+    request.send_response(200)
+    request.send_header("Content-Type", "application/json")
+    request.send_header("Transfer-Encoding", "chunked")
+    request.end_headers()
+
+    try:
+        for chunk in chunks:
+            request.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            request.wfile.flush()
+
+        request.wfile.write(b"0\r\n\r\n")
+    except (BrokenPipeError, ConnectionResetError):
+        request.close_connection = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--validators", type=int, default=1_000_000)
+    parser.add_argument("--seconds-per-slot", type=int, default=12)
+    parser.add_argument("--missed-slots-rate", type=float, default=0.01)
+    parser.add_argument("--missed-attestations-rate", type=float, default=0.02)
+    parser.add_argument("--committees-per-slot", type=int, default=None)
+    parser.add_argument("--block-delay-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=5052)
+    args = parser.parse_args()
+
+    chain = SyntheticChain(
+        args.validators,
+        seconds_per_slot=args.seconds_per_slot,
+        missed_slots_rate=args.missed_slots_rate,
+        missed_attestations_rate=args.missed_attestations_rate,
+        committees_per_slot=args.committees_per_slot,
+        block_delay_ratio=args.block_delay_ratio,
+        seed=args.seed,
+    )
+
+    simulator = Simulator(chain, port=args.port)
+
+    print(
+        f"Simulating {args.validators} validators ({len(chain.active_indexes)} "
+        f"active, {chain.committees_per_slot} committees per slot), "
+        f"{args.seconds_per_slot} seconds per slot, on {simulator.url}"
+    )
+
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
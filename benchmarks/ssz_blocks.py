@@ -0,0 +1,87 @@
+"""Benchmark of blocks retrieval, JSON versus SSZ encoded.
+
+Blocks of the local simulator (see `benchmarks.simulator`) are retrieved with
+`Beacon.get_block`, first JSON encoded, then SSZ encoded. Decoding alone (from
+already received bodies) is measured too.
+
+Usage:
+    python -m benchmarks.ssz_blocks [--validators 1000000] [--blocks 32]
+"""
+
+import argparse
+import json
+from time import perf_counter
+from typing import Callable
+
+from benchmarks.simulator import SLOTS_PER_EPOCH, Simulator, SyntheticChain, ssz_block
+from eth_validator_watcher.beacon import Beacon
+from eth_validator_watcher.lean_models import decode_block as decode_json_block
+from eth_validator_watcher.ssz import decode_block as decode_ssz_block
+
+
+def duration_ms(function: Callable[[], object], nb_runs: int) -> float:
+    """Return the mean duration of `function`, in milliseconds."""
+    start = perf_counter()
+
+    for _ in range(nb_runs):
+        function()
+
+    return (perf_counter() - start) / nb_runs * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--validators", type=int, default=1_000_000)
+    parser.add_argument("--blocks", type=int, default=32)
+    args = parser.parse_args()
+
+    chain = SyntheticChain(args.validators)
+
+    # Past, received blocks
+    slots = [
+        slot
+        for slot in range(chain.head_slot() - 4 * SLOTS_PER_EPOCH, chain.head_slot())
+        if chain.is_block_received(slot)
+    ][: args.blocks]
+
+    # Blocks are generated once, so only their retrieval is measured
+    for slot in slots:
+        chain.ssz_block(slot)
+
+    block_dict = chain.block(slots[0])
+    json_content = json.dumps(block_dict, separators=(",", ":")).encode()
+    ssz_content = ssz_block(block_dict)
+
+    json_decode_ms = duration_ms(
+        lambda: decode_json_block(json.loads(json_content)), 100
+    )
+    ssz_decode_ms = duration_ms(lambda: decode_ssz_block(ssz_content, "deneb"), 100)
+
+    with Simulator(chain) as simulator:
+        fetch_ms = {
+            ssz: duration_ms(
+                lambda beacon=Beacon(simulator.url, ssz=ssz): [  # type: ignore
+                    beacon.get_block(slot) for slot in slots
+                ],
+                1,
+            )
+            / len(slots)
+            for ssz in (False, True)
+        }
+
+    nb_attestations = len(block_dict["data"]["message"]["body"]["attestations"])
+    print(f"{args.validators} validators, {nb_attestations} attestations per block")
+
+    print(f"{'encoding':<9} {'size (kB)':>10} {'decode (ms)':>12} {'get (ms)':>9}")
+
+    for name, content, decode_ms, get_ms in (
+        ("JSON", json_content, json_decode_ms, fetch_ms[False]),
+        ("SSZ", ssz_content, ssz_decode_ms, fetch_ms[True]),
+    ):
+        print(
+            f"{name:<9} {len(content) / 1000:>10.1f} {decode_ms:>12.3f} {get_ms:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
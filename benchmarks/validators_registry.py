@@ -0,0 +1,143 @@
+"""Memory and latency benchmark of the full validators registry decoding.
+
+Compares the former `response.json()` + `Validators` model path with the streaming
+path used by `Beacon.iter_validators`.
+
+Usage:
+    python -m benchmarks.validators_registry [--count 1000000] [--fixture PATH]
+
+If `--fixture` points to a non existing file, a synthetic registry of `--count`
+validators is recorded there first. A real `/eth/v1/beacon/states/head/validators`
+response can be used as well.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from time import perf_counter
+
+from eth_validator_watcher.beacon import STREAM_CHUNK_SIZE_BYTES
+from eth_validator_watcher.json_stream import iter_json_array
+from eth_validator_watcher.models import Validators
+
+STATUSES = ["active_ongoing"] * 90 + ["exited_unslashed"] * 5 + ["pending_queued"] * 5
+
+
+def record_fixture(path: Path, count: int) -> None:
+    """Write a synthetic validators response of `count` validators to `path`."""
+    with path.open("w") as file_descriptor:
+        file_descriptor.write('{"execution_optimistic":false,"finalized":false,')
+        file_descriptor.write('"data":[')
+
+        for index in range(count):
+            if index > 0:
+                file_descriptor.write(",")
+
+            item = {
+                "index": str(index),
+                "balance": "32001234567",
+                "status": STATUSES[index % len(STATUSES)],
+                "validator": {
+                    "pubkey": f"0x{index:096x}",
+                    "withdrawal_credentials": f"0x{index:064x}",
+                    "effective_balance": "32000000000",
+                    "slashed": False,
+                    "activation_eligibility_epoch": "0",
+                    "activation_epoch": "0",
+                    "exit_epoch": "18446744073709551615",
+                    "withdrawable_epoch": "18446744073709551615",
+                },
+            }
+
+            json.dump(item, file_descriptor, separators=(",", ":"))
+
+        file_descriptor.write("]}")
+
+
+def chunks(path: Path):
+    with path.open("rb") as file_descriptor:
+        while chunk := file_descriptor.read(STREAM_CHUNK_SIZE_BYTES):
+            yield chunk
+
+
+def decode_json(path: Path) -> int:
+    content = b"".join(chunks(path))
+    validators = Validators(**json.loads(content))
+
+    result: dict = defaultdict(dict)
+
+    for item in validators.data:
+        result[item.status][item.index] = item.validator
+
+    return sum(len(value) for value in result.values())
+
+
+def decode_stream(path: Path) -> int:
+    result: dict = defaultdict(dict)
+
+    for item in iter_json_array(chunks(path), "data"):
+        validator = item["validator"]
+
+        result[item["status"]][int(item["index"])] = (
+            validator["pubkey"],
+            int(validator["effective_balance"]),
+            validator["slashed"],
+        )
+
+    return sum(len(value) for value in result.values())
+
+
+MODES = {"json": decode_json, "stream": decode_stream}
+
+
+def run(mode: str, path: Path) -> None:
+    """Run one mode and print `count latency_sec peak_rss_mb` on stdout."""
+    start = perf_counter()
+    count = MODES[mode](path)
+    latency_sec = perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{count} {latency_sec:.3f} {peak_rss_mb:.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--fixture", type=Path, default=None)
+    parser.add_argument("--mode", choices=MODES, default=None)
+    args = parser.parse_args()
+
+    fixture = args.fixture or Path(tempfile.gettempdir()) / (
+        f"validators-{args.count}.json"
+    )
+
+    if args.mode is not None:
+        run(args.mode, fixture)
+        return
+
+    if not fixture.exists():
+        print(f"Recording {args.count} validators to {fixture}...")
+        record_fixture(fixture, args.count)
+
+    size_mb = fixture.stat().st_size / 1024 / 1024
+    print(f"Fixture: {fixture} ({size_mb:.0f} MB)")
+
+    # Each mode runs in its own process, so peak RSS are not mixed up
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, "-m", __spec__.name, "--mode", mode, "--fixture", fixture],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+        count, latency_sec, peak_rss_mb = output.split()
+        print(f"{mode:>6}: {count} validators, {latency_sec} s, {peak_rss_mb} MB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+"""Contains the ResponseArchive class, an on-disk archive of HTTP responses split into
+per-epoch chunks, and the ArchiveAdapter class, which records responses to and serves
+them from such an archive."""
+
+import io
+import json
+import mmap
+import zlib
+from bisect import bisect_right
+from enum import Enum
+from hashlib import sha256
+from pathlib import Path
+from shutil import copyfileobj
+from tempfile import SpooledTemporaryFile
+from threading import Lock
+from time import perf_counter
+from typing import IO, Any, Callable, Iterator, NamedTuple
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter, Retry
+from requests.exceptions import ConnectionError
+from urllib3 import HTTPResponse
+
+from .clock import Clock
+
+INDEX_FILE_NAME = "index.jsonl"
+
+# Response headers kept in the archive. Others (content length, encoding...) do not
+# match the archived (decoded) body.
+ARCHIVED_HEADERS = {"content-type", "eth-consensus-version"}
+
+# Compressed bodies being recorded are kept in memory up to this size, then spilled to
+# a temporary file
+SPOOL_MAX_SIZE_BYTES = 8 << 20
+
+# Size of compressed data decompressed at once when reading a body
+READ_SIZE_BYTES = 1 << 16
+
+
+class ArchiveMode(str, Enum):
+    # Serve archived responses, send (and archive) other requests
+    READ_THROUGH = "read-through"
+
+    # Send all requests, and archive all responses
+    RECORD = "record"
+
+    # Serve archived responses only, never send requests
+    PLAYBACK = "playback"
+
+
+class Record(NamedTuple):
+    """Archived response."""
+
+    key: str
+    epoch: int  # Epoch of the chunk containing the body
+    offset: int  # Offset of the compressed body in the chunk
+    length: int  # Length of the compressed body
+    status: int
+    headers: dict[str, str]
+    time: float  # Time the request was sent, in seconds since epoch
+    latency: float  # Time to receive the response headers, in seconds
+
+
+def request_key(request: PreparedRequest) -> str:
+    """Return the archive key of `request`.
+
+    The key depends on the method, the path, the query, the accepted media types and
+    the body of the request, but not on the host, so an archive can be replayed
+    against any URL.
+    """
+    body = request.body or b""
+    body = body.encode() if isinstance(body, str) else body
+    accept = request.headers.get("Accept", "")
+
+    digest = sha256(f"{request.method} {request.path_url}\n{accept}\n".encode())
+    digest.update(body)
+
+    return digest.hexdigest()
+
+
+def chunk_path(path: Path, epoch: int) -> Path:
+    return path / f"epoch-{epoch}.bin.z"
+
+
+class BodyReader(io.RawIOBase):
+    """Decompress, on the fly, a zlib compressed body."""
+
+    def __init__(self, data: memoryview) -> None:
+        """Body reader
+
+        Parameters:
+        data: Compressed body, typically a slice of a memory mapped chunk
+        """
+        self.__data = data
+        self.__offset = 0
+        self.__decompressor = zlib.decompressobj()
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        # Releases the memory mapped chunk
+        self.__data.release()
+        super().close()
+
+    def readinto(self, buffer: Any) -> int:
+        while True:
+            if self.__decompressor.unconsumed_tail:
+                data = self.__decompressor.unconsumed_tail
+            elif not self.__decompressor.eof and self.__offset < len(self.__data):
+                data = self.__data[self.__offset : self.__offset + READ_SIZE_BYTES]
+                self.__offset += len(data)
+            else:
+                return 0
+
+            if output := self.__decompressor.decompress(data, len(buffer)):
+                buffer[: len(output)] = output
+                return len(output)
+
+
+class RecordingBody:
+    """Wrapper of a response body (`Response.raw`), compressing what is read.
+
+    Once the body is fully read, the compressed body is given to `on_complete`.
+    Bodies not fully read are not archived.
+    """
+
+    def __init__(self, raw: Any, on_complete: Callable[[IO[bytes]], None]) -> None:
+        """Recording body
+
+        Parameters:
+        raw        : Wrapped body
+        on_complete: Function called with the compressed body, rewound
+        """
+        self.__raw = raw
+        self.__on_complete = on_complete
+        self.__compressor = zlib.compressobj()
+        self.__spool: IO[bytes] = SpooledTemporaryFile(SPOOL_MAX_SIZE_BYTES)
+        self.__is_complete = False
+        self.__has_failed = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__raw, name)
+
+    def stream(self, amt: int = 1 << 16, decode_content: Any = None) -> Iterator[bytes]:
+        try:
+            for data in self.__raw.stream(amt, decode_content=decode_content):
+                self.__spool.write(self.__compressor.compress(data))
+                yield data
+        except Exception:
+            self.__has_failed = True
+            raise
+
+        self.__complete()
+
+    def read(self, amt: int | None = None, *args: Any, **kwargs: Any) -> bytes:
+        try:
+            data = self.__raw.read(amt, *args, **kwargs)
+        except Exception:
+            self.__has_failed = True
+            raise
+
+        self.__spool.write(self.__compressor.compress(data))
+
+        if amt is None or len(data) == 0:
+            self.__complete()
+
+        return data
+
+    def close(self) -> None:
+        # Streamed JSON decoders may stop before the end of the body (closing brace,
+        # trailing whitespace...): the remainder is read so the body is archived.
+        # A body smaller than a stream chunk may already be fully read, the stream
+        # being not exhausted though.
+        if not self.__is_complete and not self.__has_failed:
+            if self.__raw.closed:
+                self.__complete()
+            else:
+                try:
+                    while self.read(READ_SIZE_BYTES):
+                        pass
+                except Exception:
+                    # Connection lost while reading the remainder: not archived
+                    pass
+
+        self.__raw.close()
+
+    def __complete(self) -> None:
+        if self.__is_complete:
+            return
+
+        self.__is_complete = True
+        self.__spool.write(self.__compressor.flush())
+        self.__spool.seek(0)
+
+        with self.__spool:
+            self.__on_complete(self.__spool)
+
+
+class ResponseArchive:
+    """On-disk archive of HTTP responses.
+
+    Bodies are grouped by epoch (the epoch being processed when they were archived)
+    into chunks. Each body is compressed independently, so a response is read
+    without decompressing its whole chunk. Chunks are memory mapped, and bodies are
+    decompressed on the fly while read: multi-GB archives of validators registries
+    are never fully loaded.
+
+    An index (one JSON line per response) maps each request key to its responses.
+    A request may be archived several times (for instance, head of the chain).
+    In playback mode, the last response archived before the time of the clock is
+    served. Otherwise, the first archived response is served.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        mode: ArchiveMode = ArchiveMode.READ_THROUGH,
+        clock: Clock = Clock(),
+    ) -> None:
+        """Response archive
+
+        Parameters:
+        path : Directory of the archive. Created if it does not exist.
+        mode : Archive mode
+        clock: Clock used to time recorded responses, and to select played back
+               responses
+        """
+        self.mode = mode
+        self.clock = clock
+        self.epoch = 0
+
+        self.__path = path
+        self.__lock = Lock()
+
+        path.mkdir(parents=True, exist_ok=True)
+        index_path = path / INDEX_FILE_NAME
+
+        # key -> records, sorted by time
+        self.__key_to_records: dict[str, list[Record]] = {}
+        self.__nb_records = 0
+        self.__start_time: float | None = None
+        self.__end_time: float | None = None
+
+        if index_path.exists():
+            with index_path.open() as index_file:
+                for line in index_file:
+                    try:
+                        record = Record(**json.loads(line))
+                    except ValueError:
+                        # Last line of an interrupted recording
+                        continue
+
+                    self.__add(record)
+
+            for records in self.__key_to_records.values():
+                records.sort(key=lambda record: record.time)
+
+        self.__index_file: IO[str] | None = None
+        self.__chunk_files: dict[int, IO[bytes]] = {}
+        self.__epoch_to_mmap: dict[int, mmap.mmap] = {}
+
+    def __len__(self) -> int:
+        return self.__nb_records
+
+    @property
+    def start_time(self) -> float | None:
+        """Time the first archived request was sent, in seconds since epoch."""
+        return self.__start_time
+
+    @property
+    def end_time(self) -> float | None:
+        """Time the last archived response was received, in seconds since epoch."""
+        return self.__end_time
+
+    def get(self, key: str) -> Record | None:
+        """Return the response archived with key `key`, if any."""
+        with self.__lock:
+            records = self.__key_to_records.get(key)
+
+        if records is None:
+            return None
+
+        if self.mode != ArchiveMode.PLAYBACK:
+            return records[0]
+
+        index = bisect_right(records, self.clock.time(), key=lambda r: r.time)
+        return records[max(0, index - 1)]
+
+    def open(self, record: Record) -> IO[bytes]:
+        """Return the (decompressed) body of `record`, as a file."""
+        with self.__lock:
+            data = self.__mmap(record.epoch, record.offset + record.length)
+
+        body = memoryview(data)[record.offset : record.offset + record.length]
+        return io.BufferedReader(BodyReader(body), buffer_size=READ_SIZE_BYTES)
+
+    def put(
+        self,
+        key: str,
+        status: int,
+        headers: dict[str, str],
+        time: float,
+        latency: float,
+        body: IO[bytes],
+    ) -> Record:
+        """Archive a response, in the chunk of the current epoch.
+
+        Parameters:
+        key    : Key of the request
+        status : Status code
+        headers: Headers
+        time   : Time the request was sent, in seconds since epoch
+        latency: Time to receive the response headers, in seconds
+        body   : zlib compressed body
+        """
+        with self.__lock:
+            epoch = self.epoch
+
+            if (chunk_file := self.__chunk_files.get(epoch)) is None:
+                chunk_file = chunk_path(self.__path, epoch).open("ab")
+                self.__chunk_files[epoch] = chunk_file
+
+            offset = chunk_file.seek(0, io.SEEK_END)
+            copyfileobj(body, chunk_file)
+            chunk_file.flush()
+
+            length = chunk_file.tell() - offset
+            record = Record(key, epoch, offset, length, status, headers, time, latency)
+
+            if self.__index_file is None:
+                self.__index_file = (self.__path / INDEX_FILE_NAME).open("a")
+
+            self.__index_file.write(json.dumps(record._asdict()) + "\n")
+            self.__index_file.flush()
+
+            self.__add(record)
+
+        return record
+
+    def close(self) -> None:
+        """Close files of the archive."""
+        with self.__lock:
+            for file in [*self.__chunk_files.values(), self.__index_file]:
+                if file is not None:
+                    file.close()
+
+            for data in self.__epoch_to_mmap.values():
+                try:
+                    data.close()
+                except BufferError:
+                    # A body is still being read, the mapping will be closed once
+                    # garbage collected
+                    pass
+
+            self.__chunk_files, self.__index_file, self.__epoch_to_mmap = {}, None, {}
+
+    def __add(self, record: Record) -> None:
+        self.__key_to_records.setdefault(record.key, []).append(record)
+        self.__nb_records += 1
+
+        end_time = record.time + record.latency
+
+        if self.__start_time is None or record.time < self.__start_time:
+            self.__start_time = record.time
+
+        if self.__end_time is None or end_time > self.__end_time:
+            self.__end_time = end_time
+
+    def __mmap(self, epoch: int, size: int) -> mmap.mmap:
+        """Return chunk of `epoch` memory mapped, with at least `size` bytes."""
+        data = self.__epoch_to_mmap.get(epoch)
+
+        # The chunk may have grown since it was mapped
+        if data is None or len(data) < size:
+            with chunk_path(self.__path, epoch).open("rb") as chunk_file:
+                data = mmap.mmap(chunk_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            # Previous mappings are not closed: bodies being read may still use them
+            self.__epoch_to_mmap[epoch] = data
+
+        return data
+
+
+class ArchiveAdapter(HTTPAdapter):
+    """Transport adapter recording responses to, and serving them from, a response
+    archive, according to the archive mode.
+
+    Server errors are not archived.
+    """
+
+    def __init__(self, archive: ResponseArchive, **kwargs: Any) -> None:
+        """Archive adapter
+
+        Parameters:
+        archive: Response archive
+        kwargs : Arguments of `HTTPAdapter`
+        """
+        super().__init__(**kwargs)
+        self.__archive = archive
+
+    def send(  # type: ignore[override]
+        self, request: PreparedRequest, **kwargs: Any
+    ) -> Response:
+        archive = self.__archive
+        key = request_key(request)
+
+        if archive.mode != ArchiveMode.RECORD:
+            if (record := archive.get(key)) is not None:
+                if archive.mode == ArchiveMode.PLAYBACK:
+                    archive.clock.sleep(record.latency)
+
+                raw = HTTPResponse(
+                    body=archive.open(record),
+                    headers=record.headers,
+                    status=record.status,
+                    preload_content=False,
+                )
+
+                return self.build_response(request, raw)
+
+            if archive.mode == ArchiveMode.PLAYBACK:
+                raise ConnectionError(
+                    f"No archived response for {request.method} {request.path_url}",
+                    request=request,
+                )
+
+        time = archive.clock.time()
+        start = perf_counter()
+        response = super().send(request, **kwargs)
+        latency = perf_counter() - start
+
+        if response.status_code < 500:
+            status = response.status_code
+
+            headers = {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() in ARCHIVED_HEADERS
+            }
+
+            # The response is archived once its body is fully read, by the caller
+            response.raw = RecordingBody(
+                response.raw,
+                lambda body: archive.put(key, status, headers, time, latency, body),
+            )
+
+        return response
+
+
+def make_adapter(
+    archive: ResponseArchive | None, max_retries: Retry | int = 0
+) -> HTTPAdapter:
+    """Return an adapter using `archive` if set, else a regular adapter.
+
+    Parameters:
+    archive    : Response archive, if any
+    max_retries: Retry policy, see `HTTPAdapter`
+    """
+    if archive is None:
+        return HTTPAdapter(max_retries=max_retries)
+
+    return ArchiveAdapter(archive, max_retries=max_retries)
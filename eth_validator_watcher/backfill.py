@@ -0,0 +1,265 @@
+"""Contains the Backfill class, which catches up with epochs missed while the watcher
+or the beacon node was down."""
+
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from threading import Event, Lock
+from time import perf_counter, sleep
+from typing import Any, Callable
+
+from prometheus_client import Gauge
+
+from .beacon import Beacon
+from .messengers import Messenger
+from .missed_attestations import process_past_missed_attestations
+from .missed_blocks import process_missed_blocks_finalized_slots
+from .models import BeaconType
+from .registry import IndexToValidator
+from .rewards import process_past_rewards
+from .store import ValidatorStore
+from .utils import NB_SLOT_PER_EPOCH, LimitedDict
+
+print = functools.partial(print, flush=True)
+
+# Number of backfill tasks run concurrently, by default
+BACKFILL_WORKERS = 2
+
+# Minimum duration between the starts of two backfill tasks
+BACKFILL_MIN_INTERVAL_SEC = 0.5
+
+# Maximum number of epochs backfilled (around one day), older ones are skipped
+MAX_BACKFILL_EPOCHS = 225
+
+# Maximum number of epochs whose liveness is backfilled. Beacon nodes answer liveness
+# requests of recent epochs only.
+MAX_LIVENESS_BACKFILL_EPOCHS = 1
+
+metric_backfill_lag_epochs_gauge = Gauge(
+    "backfill_lag_epochs",
+    "Number of missed epochs still to be backfilled",
+)
+
+
+class Backfill:
+    """Catch up engine.
+
+    Missed blocks at finalized, missed attestations and rewards of our validators of
+    epochs missed during a downtime are processed in the background, one task per
+    epoch, by a bounded pool of workers. Liveness and rewards are added to the store,
+    if any, but metrics of the last processed epoch are left untouched. Missed
+    attestations are only backfilled for the last `MAX_LIVENESS_BACKFILL_EPOCHS`
+    epochs, since older liveness is not available.
+
+    So the live slot path is not starved:
+    - at most `workers` tasks run concurrently,
+    - two tasks start at least `min_interval_sec` apart,
+    - tasks do not start while the slot loop is busy (see `pause` and `resume`).
+    """
+
+    def __init__(
+        self,
+        beacon: Beacon,
+        beacon_type: BeaconType,
+        messenger: Messenger | None,
+        store: ValidatorStore | None = None,
+        workers: int = BACKFILL_WORKERS,
+        min_interval_sec: float = BACKFILL_MIN_INTERVAL_SEC,
+        slots_per_epoch: int = NB_SLOT_PER_EPOCH,
+        explorer_url: str | None = None,
+    ) -> None:
+        """Backfill
+
+        Parameters:
+        beacon          : Beacon instance
+        beacon_type     : Beacon type
+        messenger       : Messenger instance, alerted of missed blocks
+        store           : Store where liveness and rewards are added, if any
+        workers         : Maximum number of tasks run concurrently
+        min_interval_sec: Minimum duration between the starts of two tasks
+        slots_per_epoch : Slots per epoch
+        explorer_url    : Beacon explorer URL
+        """
+        assert workers > 0, "workers must be positive"
+
+        self.__beacon = beacon
+        self.__beacon_type = beacon_type
+        self.__messenger = messenger
+        self.__store = store
+        self.__min_interval_sec = min_interval_sec
+        self.__slots_per_epoch = slots_per_epoch
+        self.__explorer_url = explorer_url
+
+        self.__executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="backfill"
+        )
+
+        self.__is_live_idle = Event()
+        self.__is_live_idle.set()
+
+        self.__lock = Lock()
+        self.__next_start_sec = 0.0
+        self.__epoch_to_nb_pending_tasks: dict[int, int] = {}
+
+    @property
+    def lag_epochs(self) -> int:
+        """Number of epochs still having tasks to run."""
+        with self.__lock:
+            return len(self.__epoch_to_nb_pending_tasks)
+
+    def pause(self) -> None:
+        """Do not start any task until `resume` is called. Running tasks go on."""
+        self.__is_live_idle.clear()
+
+    def resume(self) -> None:
+        """Start tasks again."""
+        self.__is_live_idle.set()
+
+    def submit_blocks(self, slots: range, our_pubkeys: set[str]) -> None:
+        """Backfill missed blocks detection at finalized.
+
+        Parameters:
+        slots      : Finalized slots
+        our_pubkeys: Set of our validators public keys
+        """
+        slots = self.__bounded(slots, self.__slots_per_epoch)
+
+        for epoch, epoch_slots in groupby(
+            slots, lambda slot: slot // self.__slots_per_epoch
+        ):
+            epoch_slots = list(epoch_slots)
+
+            self.__submit(
+                epoch,
+                process_missed_blocks_finalized_slots,
+                self.__beacon,
+                range(epoch_slots[0], epoch_slots[-1] + 1),
+                our_pubkeys,
+                self.__messenger,
+                slots_per_epoch=self.__slots_per_epoch,
+                explorer_url=self.__explorer_url,
+            )
+
+    def submit_liveness(
+        self,
+        epochs: range,
+        our_epoch_to_index_to_validator: LimitedDict,
+        our_index_to_validator: IndexToValidator,
+    ) -> None:
+        """Backfill missed attestations detection, for the last
+        `MAX_LIVENESS_BACKFILL_EPOCHS` epochs of `epochs` only.
+
+        Parameters:
+        epochs                         : Epochs of the attestations
+        our_epoch_to_index_to_validator: Our active validators, per epoch
+        our_index_to_validator         : Our active validators, used for epochs
+                                         not in `our_epoch_to_index_to_validator`
+        """
+        for epoch in epochs[-MAX_LIVENESS_BACKFILL_EPOCHS:]:
+            self.__submit(
+                epoch,
+                process_past_missed_attestations,
+                self.__beacon,
+                self.__beacon_type,
+                epoch,
+                (
+                    our_epoch_to_index_to_validator[epoch]
+                    if epoch in our_epoch_to_index_to_validator
+                    else our_index_to_validator
+                ),
+                store=self.__store,
+                # Liveness of a missed epoch may not be served anymore, which is not
+                # a misconfiguration
+                warn_epoch_too_old=False,
+            )
+
+    def submit_rewards(
+        self,
+        epochs: range,
+        our_epoch_to_index_to_validator: LimitedDict,
+        our_index_to_validator: IndexToValidator,
+    ) -> None:
+        """Backfill rewards of our validators.
+
+        Parameters:
+        epochs                         : Epochs of the rewards
+        our_epoch_to_index_to_validator: Our active validators, per epoch
+        our_index_to_validator         : Our active validators, used for epochs
+                                         not in `our_epoch_to_index_to_validator`
+        """
+        for epoch in self.__bounded(epochs):
+            self.__submit(
+                epoch,
+                process_past_rewards,
+                self.__beacon,
+                self.__beacon_type,
+                epoch,
+                (
+                    our_epoch_to_index_to_validator[epoch]
+                    if epoch in our_epoch_to_index_to_validator
+                    else our_index_to_validator
+                ),
+                store=self.__store,
+            )
+
+    def shutdown(self) -> None:
+        """Cancel tasks not started yet, wait for running ones, and stop workers."""
+        self.__is_live_idle.set()
+        self.__executor.shutdown(wait=True, cancel_futures=True)
+
+        with self.__lock:
+            self.__epoch_to_nb_pending_tasks.clear()
+
+        metric_backfill_lag_epochs_gauge.set(0)
+
+    def __bounded(self, items: range, nb_items_per_epoch: int = 1) -> range:
+        """Return the last `MAX_BACKFILL_EPOCHS` epochs of `items`."""
+        max_nb_items = MAX_BACKFILL_EPOCHS * nb_items_per_epoch
+
+        if len(items) > max_nb_items:
+            nb_skipped_epochs = (len(items) - max_nb_items) // nb_items_per_epoch
+            print(f"⚠️     Too many epochs to backfill, {nb_skipped_epochs} skipped")
+
+        return items[-max_nb_items:]
+
+    def __submit(
+        self, epoch: int, function: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> None:
+        with self.__lock:
+            self.__epoch_to_nb_pending_tasks[epoch] = (
+                self.__epoch_to_nb_pending_tasks.get(epoch, 0) + 1
+            )
+
+            metric_backfill_lag_epochs_gauge.set(len(self.__epoch_to_nb_pending_tasks))
+
+        self.__executor.submit(self.__run, epoch, function, *args, **kwargs)
+
+    def __run(
+        self, epoch: int, function: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> None:
+        try:
+            self.__wait_for_turn()
+            function(*args, **kwargs)
+        except Exception as e:
+            print(f"⚠️     Backfill of epoch {epoch} failed: {e}")
+        finally:
+            with self.__lock:
+                self.__epoch_to_nb_pending_tasks[epoch] -= 1
+
+                if self.__epoch_to_nb_pending_tasks[epoch] == 0:
+                    self.__epoch_to_nb_pending_tasks.pop(epoch)
+
+                metric_backfill_lag_epochs_gauge.set(
+                    len(self.__epoch_to_nb_pending_tasks)
+                )
+
+    def __wait_for_turn(self) -> None:
+        """Wait for the minimum interval since the previous task start, then for the
+        slot loop to be idle."""
+        with self.__lock:
+            now_sec = perf_counter()
+            start_sec = max(now_sec, self.__next_start_sec)
+            self.__next_start_sec = start_sec + self.__min_interval_sec
+
+        sleep(start_sec - now_sec)
+        self.__is_live_idle.wait()
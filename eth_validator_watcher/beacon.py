@@ -2,62 +2,184 @@
 
 
 import functools
+from bisect import bisect_left
 from collections import defaultdict
-from functools import lru_cache
-from typing import Any, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, Sequence, Union
 
+from more_itertools import chunked
+from prometheus_client import Counter, Histogram
 from requests import HTTPError, Response, Session, codes
-from requests.adapters import HTTPAdapter, Retry
-from requests.exceptions import ChunkedEncodingError, RetryError
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+from requests.adapters import Retry
+from requests.exceptions import (
+    ChunkedEncodingError,
+    ConnectionError,
+    RequestException,
+    RetryError,
+)
+from tenacity import (
+    Retrying,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_fixed,
+)
 
+from .archive import ResponseArchive, make_adapter
+from .beacon_nodes import BeaconNodes
+from .duty_cache import DutyCache
+from .instrumentation import LATENCY_BUCKETS_SEC, timed_request
+from .json_stream import iter_json_array, iter_json_arrays
+from .lean_models import (
+    Block,
+    Rewards,
+    TotalRewards,
+    decode_block,
+    decode_streamed_rewards,
+)
 from .models import (
     BeaconType,
-    Block,
     BlockIdentierType,
+    ChainReorgEvent,
     Committees,
     Genesis,
     Spec,
     Header,
+    HeadEvent,
     ProposerDuties,
-    Rewards,
     Validators,
     ValidatorsLivenessRequestLighthouse,
     ValidatorsLivenessRequestTeku,
     ValidatorsLivenessResponse,
 )
+from .proposer_schedule import ProposerSchedule
+from .registry import ValidatorItem, ValidatorRegistry
+from .ssz import SSZ_BLOCK_VERSIONS, SSZ_MEDIA_TYPE
+from .ssz import decode_block as decode_ssz_block
 
 StatusEnum = Validators.DataItem.StatusEnum
+Validator = Validators.DataItem.Validator
 
 
 # Hard-coded for now, will need to move this to a config.
 TIMEOUT_BEACON_SEC = 90
 
+# Size of chunks read from streamed responses
+STREAM_CHUNK_SIZE_BYTES = 1 << 20
+
+# Number of attempts to read a streamed response, and delay between them
+STREAM_ATTEMPTS = 5
+STREAM_RETRY_WAIT_SEC = 3
+
+# Maximum number of validator ids (indexes or public keys) per request
+VALIDATORS_IDS_CHUNK_SIZE = 64
+
+# Maximum number of requests sent concurrently to the beacon node
+MAX_CONCURRENT_REQUESTS = 8
+
+# Default maximum number of validators indexes per liveness request
+LIVENESS_CHUNK_SIZE = 4096
+
+# Maximum number of validators indexes per rewards request
+REWARDS_CHUNK_SIZE = 4096
+
+# Maximum number of epochs kept in duty caches. Committees are big (one entry per
+# active validator), proposer schedules are small.
+PROPOSER_SCHEDULES_CACHE_EPOCHS = 16
+COMMITTEES_CACHE_EPOCHS = 3
+
 
 print = functools.partial(print, flush=True)
 
+metric_liveness_chunk_duration_sec = Histogram(
+    "liveness_chunk_duration_sec",
+    "Duration of a validators liveness request (of one chunk of indexes), in seconds",
+    buckets=LATENCY_BUCKETS_SEC,
+)
+
+metric_liveness_chunk_errors_count = Counter(
+    "liveness_chunk_errors_count",
+    "Number of validators liveness requests (of one chunk of indexes) which failed",
+)
+
 
 class NoBlockError(Exception):
     pass
 
 
+def _stream_attempts() -> Retrying:
+    """Attempts to send a request and read its streamed response. All of them are
+    retried if the connection breaks while the response is read."""
+    return Retrying(
+        stop=stop_after_attempt(STREAM_ATTEMPTS),
+        wait=wait_fixed(STREAM_RETRY_WAIT_SEC),
+        retry=retry_if_exception_type((ChunkedEncodingError, ConnectionError)),
+        reraise=True,
+    )
+
+
+def _counted(chunks: Iterator[bytes], chunks_size: list[int]) -> Iterator[bytes]:
+    """Yield `chunks`, appending the size of each of them to `chunks_size`."""
+    for chunk in chunks:
+        chunks_size.append(len(chunk))
+        yield chunk
+
+
 class Beacon:
     """Beacon node abstraction."""
 
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self,
+        url: str | list[str],
+        archive: ResponseArchive | None = None,
+        ssz: bool = False,
+        liveness_chunk_size: int = LIVENESS_CHUNK_SIZE,
+    ) -> None:
         """Beacon
 
         Parameters:
-        url: URL where the beacon can be reached
+        url                : URL where the beacon can be reached, or URLs of several
+                             beacon nodes in order of preference (see `BeaconNodes`)
+        archive            : Archive responses are served from (and recorded to), if
+                             any
+        ssz                : Request blocks SSZ encoded. Beacon nodes not supporting
+                             SSZ answer JSON encoded blocks.
+        liveness_chunk_size: Maximum number of validators indexes per liveness
+                             request
         """
-        self.__url = url
+        self.__nodes = BeaconNodes([url] if isinstance(url, str) else url)
+        self.__ssz = ssz
+        self.__liveness_chunk_size = liveness_chunk_size
+        self.__epoch_states_slots_per_epoch: int | None = None
         self.__http_retry_not_found = Session()
         self.__http = Session()
         self.__first_liveness_call = True
         self.__first_rewards_call = True
 
-        adapter_retry_not_found = HTTPAdapter(
-            max_retries=Retry(
+        self.__proposer_schedules: DutyCache[ProposerSchedule] = DutyCache(
+            "proposer_schedules",
+            PROPOSER_SCHEDULES_CACHE_EPOCHS,
+            dependent_root_of=lambda _, schedule: schedule.dependent_root,
+        )
+
+        # Committees responses do not contain their dependent root: the block of the
+        # last slot of the epoch before the previous one. It is also the dependent
+        # root of proposer duties of the previous epoch.
+        self.__committees: DutyCache[dict[int, dict[int, list[int]]]] = DutyCache(
+            "committees",
+            COMMITTEES_CACHE_EPOCHS,
+            dependent_root_of=lambda epoch, _: (
+                self.get_proposer_schedule(epoch - 1).dependent_root
+                if epoch >= 1
+                else None
+            ),
+        )
+
+        adapter_retry_not_found = make_adapter(
+            archive,
+            Retry(
                 backoff_factor=0.5,
                 total=3,
                 status_forcelist=[
@@ -65,18 +187,19 @@ class Beacon:
                     codes.bad_gateway,
                     codes.service_unavailable,
                 ],
-            )
+            ),
         )
 
-        adapter = HTTPAdapter(
-            max_retries=Retry(
+        adapter = make_adapter(
+            archive,
+            Retry(
                 backoff_factor=0.5,
                 total=3,
                 status_forcelist=[
                     codes.bad_gateway,
                     codes.service_unavailable,
                 ],
-            )
+            ),
         )
 
         self.__http_retry_not_found.mount("http://", adapter_retry_not_found)
@@ -92,7 +215,7 @@ class Beacon:
     )
     def __get_retry_not_found(self, *args: Any, **kwargs: Any) -> Response:
         """Wrapper around requests.get() with retry on 404"""
-        return self.__http_retry_not_found.get(*args, **kwargs)
+        return timed_request("GET", self.__http_retry_not_found.get, *args, **kwargs)
 
     @retry(
         stop=stop_after_attempt(5),
@@ -101,7 +224,7 @@ class Beacon:
     )
     def __get(self, *args: Any, **kwargs: Any) -> Response:
         """Wrapper around requests.get()"""
-        return self.__http.get(*args, **kwargs)
+        return timed_request("GET", self.__http.get, *args, **kwargs)
 
     @retry(
         stop=stop_after_attempt(5),
@@ -110,12 +233,14 @@ class Beacon:
     )
     def __post_retry_not_found(self, *args: Any, **kwargs: Any) -> Response:
         """Wrapper around requests.get() with retry on 404"""
-        return self.__http_retry_not_found.post(*args, **kwargs)
+        return timed_request("POST", self.__http_retry_not_found.post, *args, **kwargs)
 
     def get_genesis(self) -> Genesis:
         """Get genesis data."""
-        response = self.__get_retry_not_found(
-            f"{self.__url}/eth/v1/beacon/genesis", timeout=TIMEOUT_BEACON_SEC
+        response = self.__nodes.failover(
+            lambda url: self.__get_retry_not_found(
+                f"{url}/eth/v1/beacon/genesis", timeout=TIMEOUT_BEACON_SEC
+            )
         )
         response.raise_for_status()
         genesis_dict = response.json()
@@ -123,8 +248,10 @@ class Beacon:
 
     def get_spec(self) -> Spec:
         """Get network specification."""
-        response = self.__get_retry_not_found(
-            f"{self.__url}/eth/v1/config/spec", timeout=TIMEOUT_BEACON_SEC
+        response = self.__nodes.failover(
+            lambda url: self.__get_retry_not_found(
+                f"{url}/eth/v1/config/spec", timeout=TIMEOUT_BEACON_SEC
+            )
         )
         response.raise_for_status()
         spec_dict = response.json()
@@ -138,9 +265,11 @@ class Beacon:
                           retrieve
         """
         try:
-            response = self.__get(
-                f"{self.__url}/eth/v1/beacon/headers/{block_identifier}",
-                timeout=TIMEOUT_BEACON_SEC,
+            response = self.__nodes.hedged(
+                lambda url: self.__get(
+                    f"{url}/eth/v1/beacon/headers/{block_identifier}",
+                    timeout=TIMEOUT_BEACON_SEC,
+                )
             )
 
             response.raise_for_status()
@@ -162,9 +291,30 @@ class Beacon:
         Parameters
         slot: Slot corresponding to the block to retrieve
         """
+        # JSON is still accepted, for beacon nodes not supporting SSZ
+        accept = f"{SSZ_MEDIA_TYPE};q=1.0,application/json;q=0.9"
+        response = self.__get_block_response(slot, accept if self.__ssz else None)
+
+        if response.headers.get("Content-Type", "").startswith(SSZ_MEDIA_TYPE):
+            version = response.headers.get("Eth-Consensus-Version", "")
+
+            if version in SSZ_BLOCK_VERSIONS:
+                return decode_ssz_block(response.content, version)
+
+            # Block of a fork unknown by the SSZ decoder
+            response = self.__get_block_response(slot, "application/json")
+
+        block_dict = response.json()
+        return decode_block(block_dict)
+
+    def __get_block_response(self, slot: int, accept: str | None) -> Response:
         try:
-            response = self.__get(
-                f"{self.__url}/eth/v2/beacon/blocks/{slot}", timeout=TIMEOUT_BEACON_SEC
+            response = self.__nodes.hedged(
+                lambda url: self.__get(
+                    f"{url}/eth/v2/beacon/blocks/{slot}",
+                    headers=dict(Accept=accept) if accept is not None else None,
+                    timeout=TIMEOUT_BEACON_SEC,
+                )
             )
 
             response.raise_for_status()
@@ -177,18 +327,18 @@ class Beacon:
             # If we are here, it's an other error
             raise
 
-        block_dict = response.json()
-        return Block(**block_dict)
+        return response
 
-    @lru_cache()
     def get_proposer_duties(self, epoch: int) -> ProposerDuties:
         """Get proposer duties
 
         epoch: Epoch corresponding to the proposer duties to retrieve
         """
-        response = self.__get_retry_not_found(
-            f"{self.__url}/eth/v1/validator/duties/proposer/{epoch}",
-            timeout=TIMEOUT_BEACON_SEC,
+        response = self.__nodes.failover(
+            lambda url: self.__get_retry_not_found(
+                f"{url}/eth/v1/validator/duties/proposer/{epoch}",
+                timeout=TIMEOUT_BEACON_SEC,
+            )
         )
 
         response.raise_for_status()
@@ -196,59 +346,252 @@ class Beacon:
         proposer_duties_dict = response.json()
         return ProposerDuties(**proposer_duties_dict)
 
+    def get_proposer_schedule(self, epoch: int) -> ProposerSchedule:
+        """Get proposer duties, indexed by slot. Schedules are cached.
+
+        epoch: Epoch corresponding to the proposer duties to retrieve
+        """
+        return self.__proposer_schedules.get(
+            epoch, lambda epoch: ProposerSchedule(self.get_proposer_duties(epoch))
+        )
+
+    def observe_head(self, head: HeadEvent, slots_per_epoch: int) -> None:
+        """Evict cached duties made obsolete by a new head (after a reorg).
+
+        Parameters:
+        head           : Head event
+        slots_per_epoch: Slots per epoch
+        """
+        epoch = head.slot // slots_per_epoch
+
+        self.__proposer_schedules.observe_dependent_root(
+            epoch, head.current_duty_dependent_root
+        )
+
+        # Attester duties of the current epoch depend on the previous duty dependent
+        # root, and attester duties of the next epoch on the current one.
+        self.__committees.observe_dependent_root(
+            epoch, head.previous_duty_dependent_root
+        )
+
+        self.__committees.observe_dependent_root(
+            epoch + 1, head.current_duty_dependent_root
+        )
+
+    def refresh_proposer_schedule(self, epoch: int) -> ProposerSchedule:
+        """Retrieve proposer duties of `epoch` again, and evict cached duties made
+        obsolete by a reorg, from their dependent root.
+
+        Used when head events (see `observe_head`) are not received.
+
+        Parameters:
+        epoch: Current epoch
+
+        Returns the proposer schedule of `epoch`, which is cached again from the
+        retrieved duties if it was evicted.
+        """
+        proposer_duties = self.get_proposer_duties(epoch)
+        dependent_root = proposer_duties.dependent_root
+
+        self.__proposer_schedules.observe_dependent_root(epoch, dependent_root)
+        self.__committees.observe_dependent_root(epoch + 1, dependent_root)
+
+        return self.__proposer_schedules.get(
+            epoch, lambda _: ProposerSchedule(proposer_duties)
+        )
+
+    def observe_reorg(self, reorg: ChainReorgEvent, slots_per_epoch: int) -> None:
+        """Evict cached duties depending on blocks replaced by a reorg.
+
+        Parameters:
+        reorg          : Chain reorg event
+        slots_per_epoch: Slots per epoch
+        """
+        # Slots after the common ancestor of the old and new heads
+        first_reorged_slot = reorg.slot - reorg.depth + 1
+
+        # Proposer duties of an epoch depend on the block of the last slot of the
+        # previous epoch, and attester duties on the one of the epoch before.
+        first_epoch = (first_reorged_slot + slots_per_epoch) // slots_per_epoch
+
+        self.__proposer_schedules.evict_since(first_epoch)
+        self.__committees.evict_since(first_epoch + 1)
+
+    def evict_finalized(self, finalized_epoch: int) -> None:
+        """Evict cached duties of epochs older than `finalized_epoch`."""
+        self.__proposer_schedules.evict_finalized(finalized_epoch)
+        self.__committees.evict_finalized(finalized_epoch)
+
+    def use_epoch_states(self, slots_per_epoch: int) -> None:
+        """Retrieve validators and committees of an epoch from the state at the first
+        slot of this epoch, instead of the head state.
+
+        Needed to process past epochs. The beacon node has to keep these states.
+
+        Parameters:
+        slots_per_epoch: Number of slots per epoch
+        """
+        self.__epoch_states_slots_per_epoch = slots_per_epoch
+
+    def __state_id(self, epoch: int | None) -> str:
+        if epoch is None or self.__epoch_states_slots_per_epoch is None:
+            return "head"
+
+        return str(epoch * self.__epoch_states_slots_per_epoch)
+
+    def iter_validators(
+        self, ids: Sequence[int | str] | None = None, epoch: int | None = None
+    ) -> Iterator[ValidatorItem]:
+        """Iterate over validators of the head state (or of the state of `epoch`,
+        if epoch states are used, see `use_epoch_states`).
+
+        The response is streamed and decoded one validator at a time, so neither the
+        whole JSON tree nor the whole `Validators` model is ever held in memory.
+
+        Parameters:
+        ids  : Indexes or public keys of validators to retrieve. If None, all
+               validators are retrieved.
+        epoch: Epoch being processed
+
+        Yields `(index, status, pubkey, effective_balance, slashed)` tuples.
+        """
+        state_id = self.__state_id(epoch)
+        nb_yielded_items = 0
+
+        # If the connection breaks while the response is read, the request is sent
+        # again, and items already yielded are skipped.
+        for attempt in _stream_attempts():
+            with attempt:
+                for position, item in enumerate(
+                    self.__iter_validators_response(state_id, ids)
+                ):
+                    if position < nb_yielded_items:
+                        continue
+
+                    nb_yielded_items += 1
+                    yield item
+
+    def __iter_validators_response(
+        self, state_id: str, ids: Sequence[int | str] | None
+    ) -> Iterator[ValidatorItem]:
+        start = perf_counter()
+        chunks_size: list[int] = []
+
+        node, response = self.__nodes.fastest(
+            lambda url: self.__get_retry_not_found(
+                f"{url}/eth/v1/beacon/states/{state_id}/validators",
+                params=(
+                    dict(id=",".join(str(item) for item in ids))
+                    if ids is not None
+                    else None
+                ),
+                timeout=TIMEOUT_BEACON_SEC,
+                stream=True,
+            )
+        )
+
+        with response:
+            response.raise_for_status()
+
+            chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE_BYTES)
+
+            for item in iter_json_array(_counted(chunks, chunks_size), "data"):
+                validator = item["validator"]
+
+                yield (
+                    int(item["index"]),
+                    StatusEnum(item["status"]),
+                    validator["pubkey"],
+                    int(validator["effective_balance"]),
+                    validator["slashed"],
+                )
+
+        node.observe_transfer(sum(chunks_size), perf_counter() - start)
+
     def get_status_to_index_to_validator(
         self,
-    ) -> dict[StatusEnum, dict[int, Validators.DataItem.Validator]]:
+    ) -> dict[StatusEnum, dict[int, Validator]]:
         """Get a nested dictionnary with:
         outer key               : Status
         outer value (=inner key): Index of validator
         inner value             : Validator
         """
-        response = self.__get_retry_not_found(
-            f"{self.__url}/eth/v1/beacon/states/head/validators",
-            timeout=TIMEOUT_BEACON_SEC,
-        )
+        result: dict[StatusEnum, dict[int, Validator]] = defaultdict(dict)
 
-        response.raise_for_status()
-        validators_dict = response.json()
+        for index, status, pubkey, effective_balance, slashed in self.iter_validators():
+            result[status][index] = Validator.model_construct(
+                pubkey=pubkey, effective_balance=effective_balance, slashed=slashed
+            )
 
-        validators = Validators(**validators_dict)
+        return result
 
-        result: dict[
-            StatusEnum, dict[int, Validators.DataItem.Validator]
-        ] = defaultdict(dict)
+    def get_validator_registry(
+        self, ids: Sequence[int | str] | None = None, epoch: int | None = None
+    ) -> ValidatorRegistry:
+        """Get the columnar registry of validators of the head state (or of the
+        state of `epoch`, if epoch states are used, see `use_epoch_states`).
 
-        for item in validators.data:
-            result[item.status][item.index] = item.validator
+        Parameters:
+        ids  : Indexes or public keys of validators to retrieve. If None, all
+               validators are retrieved with a single request. Else, ids are split
+               into chunks of `VALIDATORS_IDS_CHUNK_SIZE`, retrieved concurrently.
+        epoch: Epoch being processed
+        """
+        if ids is None:
+            return ValidatorRegistry.from_items(self.iter_validators(epoch=epoch))
 
-        return result
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            items_per_chunk = executor.map(
+                lambda chunk: list(self.iter_validators(chunk, epoch)),
+                chunked(ids, VALIDATORS_IDS_CHUNK_SIZE),
+            )
+
+            return ValidatorRegistry.from_items(chain.from_iterable(items_per_chunk))
 
-    @lru_cache(maxsize=1)
     def get_duty_slot_to_committee_index_to_validators_index(
-        self, epoch: int
+        self, epoch: int, state_slot: int | None = None
     ) -> dict[int, dict[int, list[int]]]:
-        """Get a nested dictionnary.
+        """Get a nested dictionnary. Committees are cached.
         outer key               : Slot number
         outer value (=inner key): Committee index
         inner value             : Index of validators that have to attest in the
                                   given committee index at the given slot
 
         Parameters:
-        epoch: Epoch
+        epoch     : Epoch
+        state_slot: Slot of the state committees are retrieved from, if not cached.
+                    If None, the head state (or the state of `epoch`, if epoch
+                    states are used, see `use_epoch_states`) is used.
         """
-        response = self.__get_retry_not_found(
-            f"{self.__url}/eth/v1/beacon/states/head/committees",
-            params=dict(epoch=epoch),
-            timeout=TIMEOUT_BEACON_SEC,
+        return self.__committees.get(
+            epoch,
+            lambda epoch_: self.__get_duty_slot_to_committee_index_to_validators_index(
+                epoch_, state_slot
+            ),
+        )
+
+    def __get_duty_slot_to_committee_index_to_validators_index(
+        self, epoch: int, state_slot: int | None
+    ) -> dict[int, dict[int, list[int]]]:
+        state_id = str(state_slot) if state_slot is not None else self.__state_id(epoch)
+
+        start = perf_counter()
+
+        node, response = self.__nodes.fastest(
+            lambda url: self.__get_retry_not_found(
+                f"{url}/eth/v1/beacon/states/{state_id}/committees",
+                params=dict(epoch=epoch),
+                timeout=TIMEOUT_BEACON_SEC,
+            )
         )
 
         response.raise_for_status()
+        node.observe_transfer(len(response.content), perf_counter() - start)
         committees_dict = response.json()
 
         committees = Committees(**committees_dict)
         data = committees.data
 
-        # TODO: Do it with dict comprehension
         result: dict[int, dict[int, list[int]]] = defaultdict(dict)
 
         for item in data:
@@ -268,8 +611,13 @@ class Beacon:
         beacon_type     : Type of beacon node
         epoch           : Epoch corresponding to the rewards to retrieve
         validators_index: Set of validator indexes corresponding to the rewards to
-                          retrieve. If None, rewards for all validators will be
-                          retrieved.
+                          retrieve. If None (or empty), rewards for all validators
+                          will be retrieved.
+
+        Indexes are split into chunks of `REWARDS_CHUNK_SIZE`, retrieved
+        concurrently. Responses are streamed and decoded by batches into the columns
+        of `TotalRewards`, sorted by validator index, so the memory needed by
+        responses is bounded by the chunk size.
         """
 
         # On Prysm, because of
@@ -295,30 +643,150 @@ class Beacon:
 
             return Rewards(data=Rewards.Data(ideal_rewards=[], total_rewards=[]))
 
-        response = self.__post_retry_not_found(
-            f"{self.__url}/eth/v1/beacon/rewards/attestations/{epoch}",
-            json=(
-                [str(index) for index in sorted(validators_index)]
-                if validators_index is not None
-                else []
-            ),
-            timeout=TIMEOUT_BEACON_SEC,
+        if validators_index is None or len(validators_index) == 0:
+            return self.__get_rewards_chunk(epoch, [])
+
+        sorted_validators_index = sorted(validators_index)
+        nb_validators = len(sorted_validators_index)
+
+        # Total rewards are written at the position of their validator index in
+        # `sorted_validators_index`. Validators without rewards are removed at the end.
+        total_rewards = TotalRewards.preallocated(sorted_validators_index)
+        has_rewards = bytearray(nb_validators)
+
+        def get_chunk(start: int) -> list[Rewards.Data.IdealReward]:
+            end = min(start + REWARDS_CHUNK_SIZE, nb_validators)
+            chunk = self.__get_rewards_chunk(
+                epoch, sorted_validators_index[start:end]
+            ).data
+
+            chunk_total_rewards = TotalRewards.from_items(chunk.total_rewards)
+
+            for validator_index, source, target, head in zip(
+                chunk_total_rewards.validator_indexes,
+                chunk_total_rewards.sources,
+                chunk_total_rewards.targets,
+                chunk_total_rewards.heads,
+            ):
+                position = bisect_left(
+                    sorted_validators_index, validator_index, start, end
+                )
+
+                if (
+                    position == end
+                    or sorted_validators_index[position] != validator_index
+                ):
+                    raise ValueError(
+                        f"Invalid rewards: unexpected validator index {validator_index}"
+                    )
+
+                total_rewards.set(position, source, target, head)
+                has_rewards[position] = True
+
+            return chunk.ideal_rewards
+
+        starts = range(0, nb_validators, REWARDS_CHUNK_SIZE)
+
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CONCURRENT_REQUESTS, len(starts))
+        ) as executor:
+            chunks_ideal_rewards = list(executor.map(get_chunk, starts))
+
+        # Ideal rewards depend on the effective balance only
+        effective_balance_to_ideal_reward = {
+            ideal_reward.effective_balance: ideal_reward
+            for ideal_rewards in chunks_ideal_rewards
+            for ideal_reward in ideal_rewards
+        }
+
+        return Rewards(
+            data=Rewards.Data(
+                ideal_rewards=[
+                    effective_balance_to_ideal_reward[effective_balance]
+                    for effective_balance in sorted(effective_balance_to_ideal_reward)
+                ],
+                total_rewards=(
+                    total_rewards
+                    if all(has_rewards)
+                    else total_rewards.select(has_rewards)
+                ),
+            )
         )
 
-        response.raise_for_status()
-        rewards_dict = response.json()
-        return Rewards(**rewards_dict)
+    def __get_rewards_chunk(self, epoch: int, validators_index: list[int]) -> Rewards:
+        """Get rewards of a chunk of validators. The response is streamed, and only
+        one batch of total rewards is decoded at a time.
+
+        Parameters:
+        epoch           : Epoch corresponding to the rewards to retrieve
+        validators_index: Validator indexes corresponding to the rewards to retrieve.
+                          If empty, rewards for all validators are retrieved.
+        """
+        # If the connection breaks while the response is read, the whole chunk is
+        # retrieved again.
+        for attempt in _stream_attempts():
+            with attempt:
+                rewards = self.__get_rewards_chunk_response(epoch, validators_index)
+
+        return rewards
+
+    def __get_rewards_chunk_response(
+        self, epoch: int, validators_index: list[int]
+    ) -> Rewards:
+        start = perf_counter()
+        chunks_size: list[int] = []
+
+        node, response = self.__nodes.fastest(
+            lambda url: self.__post_retry_not_found(
+                f"{url}/eth/v1/beacon/rewards/attestations/{epoch}",
+                json=[str(index) for index in validators_index],
+                timeout=TIMEOUT_BEACON_SEC,
+                stream=True,
+            )
+        )
+
+        with response:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE_BYTES)
+
+            rewards = decode_streamed_rewards(
+                iter_json_arrays(
+                    _counted(chunks, chunks_size),
+                    {"ideal_rewards", "total_rewards"},
+                    ["data"],
+                )
+            )
+
+        node.observe_transfer(sum(chunks_size), perf_counter() - start)
+        return rewards
 
     def get_validators_liveness(
-        self, beacon_type: BeaconType, epoch: int, validators_index: set[int]
+        self,
+        beacon_type: BeaconType,
+        epoch: int,
+        validators_index: set[int],
+        assume_live: bool = True,
+        warn_epoch_too_old: bool = True,
     ) -> dict[int, bool]:
         """Get validators liveness.
 
-        Parameters      :
-        beacon_type     : Type of beacon node
-        epoch           : Epoch corresponding to the validators liveness to retrieve
-        validators_index: Set of validator indexs corresponding to the liveness to
-                          retrieve
+        Parameters        :
+        beacon_type       : Type of beacon node
+        epoch             : Epoch corresponding to the validators liveness to
+                            retrieve
+        validators_index  : Set of validator indexs corresponding to the liveness to
+                            retrieve
+        assume_live       : If True, validators whose liveness cannot be retrieved
+                            are considered as live. Else, they are not part of the
+                            result.
+        warn_epoch_too_old: If True, a message is printed if the beacon node does not
+                            serve the liveness of `epoch` (which may be a
+                            `--beacon-type` misconfiguration)
+
+        Indexes are split into chunks of `liveness_chunk_size`, retrieved
+        concurrently. Validators of a failed chunk are considered as live (if
+        `assume_live`), so the other chunks are still checked. If all chunks fail,
+        the error is raised.
         """
 
         # On Nimbus, because of
@@ -336,7 +804,7 @@ class Beacon:
                     )
                 )
 
-            return {index: True for index in validators_index}
+            return {index: True for index in validators_index} if assume_live else {}
 
         beacon_type_to_function = {
             BeaconType.LIGHTHOUSE: self.__get_validators_liveness_lighthouse,
@@ -345,14 +813,53 @@ class Beacon:
             BeaconType.OTHER: self.__get_validators_liveness_beacon_api,
         }
 
-        response = beacon_type_to_function[beacon_type](epoch, validators_index)
+        if len(validators_index) == 0:
+            return {}
 
-        try:
-            response.raise_for_status()
-        except HTTPError as e:
-            if e.response.status_code != codes.bad_request:
-                raise
+        get_response = beacon_type_to_function[beacon_type]
+        chunks = list(chunked(sorted(validators_index), self.__liveness_chunk_size))
+
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CONCURRENT_REQUESTS, len(chunks))
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self.__get_validators_liveness_chunk, get_response, epoch, chunk
+                )
+                for chunk in chunks
+            ]
+
+        result: dict[int, bool] = {}
+        errors: list[RequestException] = []
+        is_epoch_too_old = False
+
+        for chunk, future in zip(chunks, futures):
+            try:
+                result.update(future.result())
+            except RequestException as e:
+                if isinstance(e, HTTPError) and (
+                    e.response.status_code == codes.bad_request
+                ):
+                    is_epoch_too_old = True
+                else:
+                    metric_liveness_chunk_errors_count.inc()
+                    errors.append(e)
+
+                if assume_live:
+                    result.update({index: True for index in chunk})
+
+        if len(errors) == len(chunks):
+            raise errors[0]
+
+        if len(errors) > 0:
+            print(
+                f"❗     Liveness of {len(errors)} chunk(s) of validators could not be "
+                f"retrieved for epoch {epoch}"
+                + (", their validators are considered as live" if assume_live else "")
+                + f": {errors[0]}"
+            )
 
+        if is_epoch_too_old and warn_epoch_too_old:
             # If we are here, it means the requested epoch is too old, which
             # could be normal if the watcher just started
             print(
@@ -367,12 +874,7 @@ class Beacon:
 
             print("❓     Use `--help` for more details.")
 
-            return {index: True for index in validators_index}
-
-        validators_liveness_dict = response.json()
-        validators_liveness = ValidatorsLivenessResponse(**validators_liveness_dict)
-
-        return {item.index: item.is_live for item in validators_liveness.data}
+        return result
 
     def get_potential_block(self, slot) -> Block | None:
         """Get a block if it exists, otherwise return None.
@@ -388,8 +890,35 @@ class Beacon:
             # orphaned before we could fetch it.
             return None
 
+    def __get_validators_liveness_chunk(
+        self,
+        get_response: Callable[[int, list[int]], Response],
+        epoch: int,
+        validators_index: list[int],
+    ) -> dict[int, bool]:
+        """Get validators liveness of a chunk of validators.
+
+        Parameters:
+        get_response    : Function sending the liveness request
+        epoch           : Epoch corresponding to the validators liveness to retrieve
+        validators_index: Sorted validator indexes corresponding to the liveness to
+                          retrieve
+        """
+        start = perf_counter()
+
+        try:
+            response = get_response(epoch, validators_index)
+            response.raise_for_status()
+        finally:
+            metric_liveness_chunk_duration_sec.observe(perf_counter() - start)
+
+        validators_liveness_dict = response.json()
+        validators_liveness = ValidatorsLivenessResponse(**validators_liveness_dict)
+
+        return {item.index: item.is_live for item in validators_liveness.data}
+
     def __get_validators_liveness_lighthouse(
-        self, epoch: int, validators_index: set[int]
+        self, epoch: int, validators_index: list[int]
     ) -> Response:
         """Get validators liveness from Lighthouse.
 
@@ -397,19 +926,21 @@ class Beacon:
 
         Parameters:
         epoch           : Epoch corresponding to the validators liveness to retrieve
-        validators_index: Set of validator indexs corresponding to the liveness to
+        validators_index: Sorted validator indexes corresponding to the liveness to
                           retrieve
         """
-        return self.__post_retry_not_found(
-            f"{self.__url}/lighthouse/liveness",
-            json=ValidatorsLivenessRequestLighthouse(
-                epoch=epoch, indices=sorted(list(validators_index))
-            ).model_dump(),
-            timeout=TIMEOUT_BEACON_SEC,
+        return self.__nodes.hedged(
+            lambda url: self.__post_retry_not_found(
+                f"{url}/lighthouse/liveness",
+                json=ValidatorsLivenessRequestLighthouse(
+                    epoch=epoch, indices=validators_index
+                ).model_dump(),
+                timeout=TIMEOUT_BEACON_SEC,
+            )
         )
 
     def __get_validators_liveness_old_teku(
-        self, epoch: int, validators_index: set[int]
+        self, epoch: int, validators_index: list[int]
     ) -> Response:
         """Get validators liveness from Teku.
 
@@ -417,19 +948,21 @@ class Beacon:
 
         Parameters:
         epoch           : Epoch corresponding to the validators liveness to retrieve
-        validators_index: Set of validator indexs corresponding to the liveness to
+        validators_index: Sorted validator indexes corresponding to the liveness to
                           retrieve
         """
-        return self.__post_retry_not_found(
-            f"{self.__url}/eth/v1/validator/liveness/{epoch}",
-            json=ValidatorsLivenessRequestTeku(
-                indices=sorted(list(validators_index))
-            ).model_dump(),
-            timeout=TIMEOUT_BEACON_SEC,
+        return self.__nodes.hedged(
+            lambda url: self.__post_retry_not_found(
+                f"{url}/eth/v1/validator/liveness/{epoch}",
+                json=ValidatorsLivenessRequestTeku(
+                    indices=validators_index
+                ).model_dump(),
+                timeout=TIMEOUT_BEACON_SEC,
+            )
         )
 
     def __get_validators_liveness_beacon_api(
-        self, epoch: int, validators_index: set[int]
+        self, epoch: int, validators_index: list[int]
     ) -> Response:
         """Get validators liveness from neither Lighthouse nor Teku.
 
@@ -437,14 +970,13 @@ class Beacon:
 
         Parameters:
         epoch           : Epoch corresponding to the validators liveness to retrieve
-        validators_index: Set of validator indexs corresponding to the liveness to
+        validators_index: Sorted validator indexes corresponding to the liveness to
                           retrieve
         """
-        return self.__post_retry_not_found(
-            f"{self.__url}/eth/v1/validator/liveness/{epoch}",
-            json=[
-                str(validator_index)
-                for validator_index in sorted(list(validators_index))
-            ],
-            timeout=TIMEOUT_BEACON_SEC,
+        return self.__nodes.hedged(
+            lambda url: self.__post_retry_not_found(
+                f"{url}/eth/v1/validator/liveness/{epoch}",
+                json=[str(validator_index) for validator_index in validators_index],
+                timeout=TIMEOUT_BEACON_SEC,
+            )
         )
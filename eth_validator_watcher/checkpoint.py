@@ -0,0 +1,187 @@
+"""Contains the Checkpoint class, the state of the watcher loop saved to a local file,
+so a restarted watcher does not start from scratch."""
+
+import functools
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .registry import (
+    ACTIVE_STATUSES,
+    PUBKEY_SIZE,
+    IndexToValidator,
+    StatusEnum,
+    ValidatorRegistry,
+)
+
+print = functools.partial(print, flush=True)
+
+# Incremented each time the format of the checkpoint changes. Checkpoints written
+# with another version are ignored.
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint(NamedTuple):
+    """State of the watcher loop.
+
+    - `genesis_time`                          : Genesis time of the chain, a
+                                                checkpoint of another chain is ignored
+    - `last_processed_finalized_slot`         : Last slot checked for missed blocks
+                                                at finalized
+    - `last_missed_attestations_process_epoch`: Last epoch missed attestations were
+                                                processed at
+    - `last_rewards_process_epoch`            : Last epoch rewards were processed at
+    - `our_missed_attestation_indexes`        : Indexes of our validators which
+                                                missed their last attestation
+    - `our_exited_unslashed_indexes`          : See `ExitedValidators`
+    - `total_exited_slashed_indexes`          : See `SlashedValidators`
+    - `our_exited_slashed_indexes`            : See `SlashedValidators`
+    - `our_epoch_to_active_index_to_validator`: Our active validators, per epoch
+    """
+
+    genesis_time: int
+    last_processed_finalized_slot: int | None
+    last_missed_attestations_process_epoch: int | None
+    last_rewards_process_epoch: int | None
+    our_missed_attestation_indexes: set[int]
+    our_exited_unslashed_indexes: set[int] | None
+    total_exited_slashed_indexes: set[int] | None
+    our_exited_slashed_indexes: set[int] | None
+    our_epoch_to_active_index_to_validator: dict[int, IndexToValidator]
+
+    def write(self, path: Path) -> None:
+        """Write the checkpoint to `path`, as zlib compressed JSON.
+
+        The checkpoint is written to a temporary file first, then renamed, so `path`
+        always contains a complete checkpoint, even if the watcher is stopped
+        while writing.
+        """
+        content = dict(
+            version=CHECKPOINT_VERSION,
+            genesis_time=self.genesis_time,
+            last_processed_finalized_slot=self.last_processed_finalized_slot,
+            last_missed_attestations_process_epoch=(
+                self.last_missed_attestations_process_epoch
+            ),
+            last_rewards_process_epoch=self.last_rewards_process_epoch,
+            our_missed_attestation_indexes=sorted(self.our_missed_attestation_indexes),
+            our_exited_unslashed_indexes=_dump_indexes(
+                self.our_exited_unslashed_indexes
+            ),
+            total_exited_slashed_indexes=_dump_indexes(
+                self.total_exited_slashed_indexes
+            ),
+            our_exited_slashed_indexes=_dump_indexes(self.our_exited_slashed_indexes),
+            our_epoch_to_active_validators={
+                str(epoch): _dump_validators(index_to_validator)
+                for epoch, index_to_validator in (
+                    self.our_epoch_to_active_index_to_validator.items()
+                )
+            },
+        )
+
+        temporary_path = path.with_name(f"{path.name}.tmp")
+
+        with temporary_path.open("wb") as file:
+            file.write(zlib.compress(json.dumps(content).encode()))
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def read(cls, path: Path) -> "Checkpoint | None":
+        """Read the checkpoint written to `path`.
+
+        Returns None if there is no checkpoint, or if it cannot be read.
+        """
+        if not path.exists():
+            return None
+
+        try:
+            content = json.loads(zlib.decompress(path.read_bytes()))
+
+            if content["version"] != CHECKPOINT_VERSION:
+                print(f"⚠️     Checkpoint {path} has another version, ignored")
+                return None
+
+            return cls(
+                genesis_time=content["genesis_time"],
+                last_processed_finalized_slot=content["last_processed_finalized_slot"],
+                last_missed_attestations_process_epoch=content[
+                    "last_missed_attestations_process_epoch"
+                ],
+                last_rewards_process_epoch=content["last_rewards_process_epoch"],
+                our_missed_attestation_indexes=set(
+                    content["our_missed_attestation_indexes"]
+                ),
+                our_exited_unslashed_indexes=_load_indexes(
+                    content["our_exited_unslashed_indexes"]
+                ),
+                total_exited_slashed_indexes=_load_indexes(
+                    content["total_exited_slashed_indexes"]
+                ),
+                our_exited_slashed_indexes=_load_indexes(
+                    content["our_exited_slashed_indexes"]
+                ),
+                our_epoch_to_active_index_to_validator={
+                    int(epoch): _load_validators(validators)
+                    for epoch, validators in (
+                        content["our_epoch_to_active_validators"].items()
+                    )
+                },
+            )
+        except (OSError, ValueError, KeyError, TypeError, zlib.error) as e:
+            print(f"⚠️     Checkpoint {path} cannot be read, ignored: {e}")
+            return None
+
+
+def _dump_indexes(indexes: set[int] | None) -> list[int] | None:
+    return sorted(indexes) if indexes is not None else None
+
+
+def _load_indexes(indexes: list[int] | None) -> set[int] | None:
+    return set(indexes) if indexes is not None else None
+
+
+def _dump_validators(index_to_validator: IndexToValidator) -> dict[str, Any]:
+    """Dump validators as columns, public keys being concatenated."""
+    indexes = sorted(index_to_validator)
+    validators = [index_to_validator[index] for index in indexes]
+
+    return dict(
+        indexes=indexes,
+        pubkeys="".join(
+            validator.pubkey.removeprefix("0x") for validator in validators
+        ),
+        effective_balances=[validator.effective_balance for validator in validators],
+        slashed=[int(validator.slashed) for validator in validators],
+    )
+
+
+def _load_validators(columns: dict[str, Any]) -> IndexToValidator:
+    """Load validators dumped by `_dump_validators`, as a registry view."""
+    pubkeys: str = columns["pubkeys"]
+    pubkey_length = 2 * PUBKEY_SIZE
+
+    registry = ValidatorRegistry.from_items(
+        (
+            index,
+            StatusEnum.activeSlashed if slashed else StatusEnum.activeOngoing,
+            pubkeys[row * pubkey_length : (row + 1) * pubkey_length],
+            effective_balance,
+            bool(slashed),
+        )
+        for row, (index, effective_balance, slashed) in enumerate(
+            zip(
+                columns["indexes"],
+                columns["effective_balances"],
+                columns["slashed"],
+                strict=True,
+            )
+        )
+    )
+
+    return registry.view(ACTIVE_STATUSES)
@@ -0,0 +1,41 @@
+"""Contains the clocks driving the watcher: the wall clock, and a virtual clock used to
+play recordings back, possibly faster than they were recorded."""
+
+from time import monotonic, sleep, time
+
+
+class Clock:
+    """Wall clock."""
+
+    def time(self) -> float:
+        """Return the current time, in seconds since epoch."""
+        return time()
+
+    def sleep(self, seconds: float) -> None:
+        """Wait `seconds` seconds. Negative durations do not wait."""
+        sleep(max(0, seconds))
+
+
+class VirtualClock(Clock):
+    """Clock starting at a given time, and running `speed` times faster than the wall
+    clock."""
+
+    def __init__(self, start_time_sec: float, speed: float = 1) -> None:
+        """Virtual clock
+
+        Parameters:
+        start_time_sec: Time of the clock when created, in seconds since epoch
+        speed         : Speed of the clock, relative to the wall clock
+        """
+        assert speed > 0, "speed must be positive"
+
+        self.__start_time_sec = start_time_sec
+        self.__start_monotonic_sec = monotonic()
+        self.__speed = speed
+
+    def time(self) -> float:
+        elapsed_sec = monotonic() - self.__start_monotonic_sec
+        return self.__start_time_sec + elapsed_sec * self.__speed
+
+    def sleep(self, seconds: float) -> None:
+        sleep(max(0, seconds) / self.__speed)
@@ -4,6 +4,7 @@ from prometheus_client import Gauge
 from pydantic import parse_obj_as
 from requests import Session
 
+from .archive import ResponseArchive, make_adapter
 from .models import CoinbaseTrade
 
 URL = "https://api.pro.coinbase.com/products/ETH-USD/trades"
@@ -13,10 +14,19 @@ metric_eth_usd_gauge = Gauge("eth_usd", "ETH/USD conversion rate")
 class Coinbase:
     """Coinbase abstraction."""
 
-    def __init__(self) -> None:
-        """Coinbase"""
+    def __init__(self, archive: ResponseArchive | None = None) -> None:
+        """Coinbase
+
+        Parameters:
+        archive: Archive responses are recorded to (or served from), if any
+        """
         self.__http = Session()
 
+        if archive is not None:
+            adapter = make_adapter(archive)
+            self.__http.mount("http://", adapter)
+            self.__http.mount("https://", adapter)
+
     def emit_eth_usd_conversion_rate(self) -> None:
         """Emit the ETH/USD conversion rate to Prometheus Gauge.
 
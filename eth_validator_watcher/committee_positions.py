@@ -0,0 +1,142 @@
+"""Contains the CommitteePositions class, which locates our validators in the
+committees of an epoch."""
+
+from array import array
+from bisect import bisect_left
+from typing import Iterator
+
+from .beacon import Beacon
+from .registry import IndexToValidator
+from .utils import LimitedDict
+
+# Maximum number of epochs whose positions are kept
+POSITIONS_CACHE_EPOCHS = 3
+
+
+class EpochCommitteePositions:
+    """Positions of our validators in the committees of an epoch.
+
+    Positions are stored in parallel arrays, sorted by slot, then committee index,
+    then position:
+    - `slots`            : slot the validator has to attest during
+    - `committee_indexes`: index of the committee of the validator
+    - `positions`        : position of the validator in its committee, which is also
+                           the position of its bit in aggregation bits
+    - `validators_index` : index of the validator
+
+    Checking whether our validators attested is then a direct bit lookup, whose
+    cost only depends on the number of our validators.
+    """
+
+    def __init__(
+        self,
+        duty_slot_to_committee_index_to_validators_index: dict[
+            int, dict[int, list[int]]
+        ],
+        our_validators_index: set[int],
+    ) -> None:
+        """EpochCommitteePositions
+
+        Parameters:
+        duty_slot_to_committee_index_to_validators_index: Committees of the epoch,
+                                                          as returned by `Beacon`
+        our_validators_index                            : Indexes of our validators
+        """
+        self.slots = array("Q")
+        self.committee_indexes = array("Q")
+        self.positions = array("Q")
+        self.validators_index = array("Q")
+
+        for slot in sorted(duty_slot_to_committee_index_to_validators_index):
+            committee_index_to_validators_index = (
+                duty_slot_to_committee_index_to_validators_index[slot]
+            )
+
+            for committee_index in sorted(committee_index_to_validators_index):
+                validators_index = committee_index_to_validators_index[committee_index]
+
+                for position, validator_index in enumerate(validators_index):
+                    if validator_index in our_validators_index:
+                        self.slots.append(slot)
+                        self.committee_indexes.append(committee_index)
+                        self.positions.append(position)
+                        self.validators_index.append(validator_index)
+
+    def __len__(self) -> int:
+        return len(self.validators_index)
+
+    def __iter__(self) -> Iterator[tuple[int, int, int, int]]:
+        """Iterate over `(slot, committee index, position, validator index)`."""
+        return zip(
+            self.slots, self.committee_indexes, self.positions, self.validators_index
+        )
+
+    def of_slot(self, slot: int) -> Iterator[tuple[int, int, int]]:
+        """Iterate over `(committee index, position, validator index)` of our
+        validators which have to attest during `slot`."""
+        start = bisect_left(self.slots, slot)
+        end = bisect_left(self.slots, slot + 1, start)
+
+        return zip(
+            self.committee_indexes[start:end],
+            self.positions[start:end],
+            self.validators_index[start:end],
+        )
+
+
+class CommitteePositions:
+    """Positions of our validators in committees, computed once per epoch.
+
+    Positions of an epoch are computed again only if its committees (reorg) or our
+    active validators changed.
+    """
+
+    def __init__(self, beacon: Beacon) -> None:
+        """CommitteePositions
+
+        Parameters:
+        beacon: Beacon instance
+        """
+        self.__beacon = beacon
+        self.__epoch_to_entry = LimitedDict(POSITIONS_CACHE_EPOCHS)
+
+    def get(
+        self,
+        epoch: int,
+        our_active_validators_index_to_validator: IndexToValidator,
+        state_slot: int | None = None,
+    ) -> EpochCommitteePositions:
+        """Get positions of our validators in the committees of `epoch`.
+
+        Parameters:
+        epoch                                   : Epoch
+        our_active_validators_index_to_validator: Our active validators, per index
+        state_slot                              : Slot of the state committees are
+                                                  retrieved from, see `Beacon`
+        """
+        committees = self.__beacon.get_duty_slot_to_committee_index_to_validators_index(
+            epoch, state_slot
+        )
+
+        if epoch in self.__epoch_to_entry:
+            cached_committees, cached_validators, positions = self.__epoch_to_entry[
+                epoch
+            ]
+
+            if (
+                cached_committees is committees
+                and cached_validators is our_active_validators_index_to_validator
+            ):
+                return positions
+
+        positions = EpochCommitteePositions(
+            committees, set(our_active_validators_index_to_validator)
+        )
+
+        self.__epoch_to_entry[epoch] = (
+            committees,
+            our_active_validators_index_to_validator,
+            positions,
+        )
+
+        return positions
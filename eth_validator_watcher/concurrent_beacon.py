@@ -0,0 +1,83 @@
+"""Contains the ConcurrentBeacon class which is used to interact concurrently with
+the consensus layer node."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar, Union
+
+from .beacon import MAX_CONCURRENT_REQUESTS, Beacon
+from .lean_models import Block
+from .models import BlockIdentierType, Header
+from .proposer_schedule import ProposerSchedule
+
+T = TypeVar("T")
+
+
+class ConcurrentBeacon:
+    """Concurrent beacon node abstraction.
+
+    Every call is delegated to a worker thread, of a pool living as long as the
+    instance, running the corresponding `Beacon` method. `Beacon` is synchronous
+    (`requests`), so threads are used rather than asyncio: requests share the
+    `Beacon` connection pools and keep exactly the same retry semantics. Each call
+    returns a future, so independent requests run concurrently (see
+    `run_concurrently`), and the wall time of a batch of requests is roughly the one
+    of the slowest request instead of the sum of all of them.
+    """
+
+    def __init__(
+        self, beacon: Beacon, max_workers: int = MAX_CONCURRENT_REQUESTS
+    ) -> None:
+        """Concurrent beacon
+
+        Parameters:
+        beacon     : Beacon instance every call is delegated to
+        max_workers: Maximum number of calls run concurrently
+        """
+        self.__beacon = beacon
+
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="concurrent_beacon"
+        )
+
+    def __call(self, function: Callable[..., T], *args: Any) -> Future[T]:
+        return self.__executor.submit(function, *args)
+
+    def shutdown(self) -> None:
+        """Wait for running calls, and stop workers."""
+        self.__executor.shutdown(wait=True)
+
+    def get_header(
+        self, block_identifier: Union[BlockIdentierType, int]
+    ) -> Future[Header]:
+        """Get a header. See `Beacon.get_header`."""
+        return self.__call(self.__beacon.get_header, block_identifier)
+
+    def get_potential_block(self, slot: int) -> Future[Block | None]:
+        """Get a block if it exists. See `Beacon.get_potential_block`."""
+        return self.__call(self.__beacon.get_potential_block, slot)
+
+    def get_proposer_schedule(self, epoch: int) -> Future[ProposerSchedule]:
+        """Get proposer schedule. See `Beacon.get_proposer_schedule`."""
+        return self.__call(self.__beacon.get_proposer_schedule, epoch)
+
+    def refresh_proposer_schedule(self, epoch: int) -> Future[ProposerSchedule]:
+        """Refresh proposer schedule. See `Beacon.refresh_proposer_schedule`."""
+        return self.__call(self.__beacon.refresh_proposer_schedule, epoch)
+
+    def get_duty_slot_to_committee_index_to_validators_index(
+        self, epoch: int
+    ) -> Future[dict[int, dict[int, list[int]]]]:
+        """Get committees. See
+        `Beacon.get_duty_slot_to_committee_index_to_validators_index`."""
+        return self.__call(
+            self.__beacon.get_duty_slot_to_committee_index_to_validators_index, epoch
+        )
+
+
+def run_concurrently(*futures: Future[Any]) -> list[Any]:
+    """Wait for futures returned by `ConcurrentBeacon` calls, which run concurrently.
+
+    Returns the list of results, in the same order than `futures`.
+    If any call raises, the exception is propagated.
+    """
+    return [future.result() for future in futures]
@@ -0,0 +1,129 @@
+"""Contains the DutyCache class, a bounded epoch keyed cache for duties (proposer
+duties, committees) aware of reorgs."""
+
+from threading import Lock
+from typing import Callable, Generic, TypeVar
+
+from prometheus_client import Counter
+
+T = TypeVar("T")
+
+metric_duty_cache_hits_count = Counter(
+    "duty_cache_hits_count",
+    "Duty cache hits count",
+    ["cache"],
+)
+
+metric_duty_cache_misses_count = Counter(
+    "duty_cache_misses_count",
+    "Duty cache misses count",
+    ["cache"],
+)
+
+metric_duty_cache_evictions_count = Counter(
+    "duty_cache_evictions_count",
+    "Duty cache evictions count",
+    ["cache", "reason"],
+)
+
+
+class DutyCache(Generic[T]):
+    """Epoch keyed duties cache.
+
+    At most `max_epochs` epochs are kept. When the cache is full, the oldest epoch
+    is evicted.
+
+    Duties of an epoch only depend on a block root (the dependent root), so an entry
+    stays valid as long as this root does not change. `observe_dependent_root` evicts
+    entries whose dependent root changed, typically after a reorg. Entries without
+    dependent root (duties depending on the genesis block) are never evicted this way.
+
+    The cache can be used from several threads. A value may be fetched twice if
+    requested concurrently for the same epoch, but only one is kept.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_epochs: int,
+        dependent_root_of: Callable[[int, T], str | None] = lambda *_: None,
+    ) -> None:
+        """Duty cache
+
+        Parameters:
+        name             : Name of the cache, used as metrics label
+        max_epochs       : Maximum number of epochs kept
+        dependent_root_of: Function returning the dependent root of the value of an
+                           epoch, called as `dependent_root_of(epoch, value)`
+        """
+        assert max_epochs > 0, "max_epochs must be positive"
+
+        self.__name = name
+        self.__max_epochs = max_epochs
+        self.__dependent_root_of = dependent_root_of
+        self.__lock = Lock()
+
+        # epoch -> (value, dependent root)
+        self.__epoch_to_entry: dict[int, tuple[T, str | None]] = {}
+
+    def __contains__(self, epoch: object) -> bool:
+        return epoch in self.__epoch_to_entry
+
+    def __len__(self) -> int:
+        return len(self.__epoch_to_entry)
+
+    def get(self, epoch: int, fetch: Callable[[int], T]) -> T:
+        """Return the value of epoch `epoch`, calling `fetch(epoch)` if needed."""
+        with self.__lock:
+            entry = self.__epoch_to_entry.get(epoch)
+
+        if entry is not None:
+            metric_duty_cache_hits_count.labels(cache=self.__name).inc()
+            return entry[0]
+
+        metric_duty_cache_misses_count.labels(cache=self.__name).inc()
+        value = fetch(epoch)
+        dependent_root = self.__dependent_root_of(epoch, value)
+
+        with self.__lock:
+            self.__epoch_to_entry[epoch] = value, dependent_root
+
+            while len(self.__epoch_to_entry) > self.__max_epochs:
+                self.__evict(min(self.__epoch_to_entry), "size")
+
+        return value
+
+    def evict_finalized(self, finalized_epoch: int) -> None:
+        """Evict epochs strictly older than `finalized_epoch`."""
+        with self.__lock:
+            for epoch in [e for e in self.__epoch_to_entry if e < finalized_epoch]:
+                self.__evict(epoch, "finalized")
+
+    def evict_since(self, first_epoch: int) -> None:
+        """Evict epochs more recent than `first_epoch`, included, whose duties were
+        made obsolete by a reorg."""
+        with self.__lock:
+            for epoch in [e for e in self.__epoch_to_entry if e >= first_epoch]:
+                self.__evict(epoch, "reorg")
+
+    def observe_dependent_root(self, epoch: int, dependent_root: str) -> None:
+        """Evict epoch `epoch` if its dependent root is not `dependent_root`.
+
+        Parameters:
+        epoch         : Epoch
+        dependent_root: Current dependent root of duties of `epoch`
+        """
+        with self.__lock:
+            entry = self.__epoch_to_entry.get(epoch)
+
+            if entry is None:
+                return
+
+            _, known_dependent_root = entry
+
+            if known_dependent_root not in {None, dependent_root}:
+                self.__evict(epoch, "reorg")
+
+    def __evict(self, epoch: int, reason: str) -> None:
+        self.__epoch_to_entry.pop(epoch)
+        metric_duty_cache_evictions_count.labels(cache=self.__name, reason=reason).inc()
@@ -3,40 +3,56 @@
 import functools
 from os import environ
 from pathlib import Path
-from time import sleep, time
-from typing import List, Optional
+from time import time
+from typing import List, NamedTuple, Optional
 
 import typer
 from prometheus_client import Gauge, start_http_server
 from typer import Option
 
-from .beacon import Beacon
+from .archive import ArchiveMode, ResponseArchive
+from .backfill import BACKFILL_WORKERS, Backfill
+from .beacon import LIVENESS_CHUNK_SIZE, Beacon
+from .checkpoint import Checkpoint
+from .clock import Clock, VirtualClock
 from .coinbase import Coinbase
+from .concurrent_beacon import ConcurrentBeacon, run_concurrently
 from .entry_queue import export_duration_sec as export_entry_queue_dur_sec
+from .events import EventStream
 from .execution import Execution
+from .committee_positions import CommitteePositions
 from .exited_validators import ExitedValidators
 from .fee_recipient import process_fee_recipient
+from .inclusions import EpochInclusions
+from .instrumentation import observe_slot_end, stage
 from .messengers import Messenger, Slack, Telegram, MultiMessenger
 from .missed_attestations import (
     process_double_missed_attestations,
     process_missed_attestations,
 )
 from .missed_blocks import process_missed_blocks_finalized, process_missed_blocks_head
-from .models import BeaconType, Validators
+from .models import BeaconType, BlockIdentierType, Validators
+from .profiling import start_debug_http_server
 from .next_blocks_proposal import process_future_blocks_proposal
+from .registry import ACTIVE_STATUSES, WITHDRAWABLE_STATUSES, IndexToValidator
+from .registry_refresher import RegistryRefresher
 from .relays import Relays
+from .scheduler import EpochPipeline
 from .rewards import process_rewards
 from .slashed_validators import SlashedValidators
+from .store import DEFAULT_RETENTION_EPOCHS, ValidatorStore
 from .suboptimal_attestations import process_suboptimal_attestations
 from .utils import (
     CHUCK_NORRIS,
     MISSED_BLOCK_TIMEOUT_SEC,
+    NB_SECOND_PER_SLOT,
     SLOT_FOR_MISSED_ATTESTATIONS_PROCESS,
     SLOT_FOR_REWARDS_PROCESS,
     LimitedDict,
     convert_seconds_to_dhms,
     eth1_address_lower_0x_prefixed,
     get_our_pubkeys,
+    replay_slots,
     slots,
     write_liveness_file,
 )
@@ -72,9 +88,24 @@ metric_net_active_validators_gauge = Gauge(
 )
 
 
+class EpochSnapshot(NamedTuple):
+    """Epoch level data published to the slot loop."""
+
+    net_active_idx2val: IndexToValidator
+    our_active_idx2val: IndexToValidator
+
+
 @app.command()
 def handler(
-    beacon_url: str = Option(..., help="URL of beacon node", show_default=False),
+    beacon_url: List[str] = Option(
+        ...,
+        help=(
+            "URL of beacon node - Can be repeated to use several beacon nodes, in order "
+            "of preference: failing nodes are avoided, latency critical requests are "
+            "hedged, heavy requests are sent to the node with the best throughput"
+        ),
+        show_default=False,
+    ),
     execution_url: str = Option(None, help="URL of execution node", show_default=False),
     pubkeys_file_path: Optional[Path] = Option(
         None,
@@ -125,6 +156,144 @@ def handler(
     explorer_url: Optional[str] = Option(
         None, help="URL of beacon chain explorer", show_default=False
     ),
+    full_registry_refresh_epochs: int = Option(
+        1,
+        min=1,
+        help=(
+            "Number of epochs between two retrievals of the full network validators "
+            "registry. In between, only our validators are retrieved and network "
+            "metrics are computed from the last full registry."
+        ),
+        show_default=True,
+    ),
+    beacon_events: bool = Option(
+        False,
+        help=(
+            "Subscribe to beacon node events, to process blocks as soon as they are "
+            "received. Blocks not received 10 seconds after the slot start are "
+            "still considered as missed."
+        ),
+        show_default=True,
+    ),
+    debug_endpoints: bool = Option(
+        False,
+        help=(
+            "Serve debug endpoints on the Prometheus server: `/debug/profile` "
+            "(sampling profiler) and `/debug/memory` (memory allocations snapshots)."
+        ),
+        show_default=True,
+    ),
+    replay_from_epoch: Optional[int] = Option(
+        None,
+        min=0,
+        help=(
+            "Replay past epochs from this one, as fast as the beacon node answers, "
+            "instead of following the head. `--replay-to-epoch` must be set. The "
+            "beacon node has to keep states of replayed epochs."
+        ),
+        show_default=False,
+    ),
+    replay_to_epoch: Optional[int] = Option(
+        None,
+        min=0,
+        help="Last replayed epoch (included) - `--replay-from-epoch` must be set",
+        show_default=False,
+    ),
+    replay_archive: Optional[Path] = Option(
+        None,
+        help=(
+            "Directory of an archive of beacon node responses, used when replaying. "
+            "Archived responses are not requested again, others are archived, so a "
+            "replay can be run again offline."
+        ),
+        file_okay=False,
+        dir_okay=True,
+        show_default=False,
+    ),
+    record_archive: Optional[Path] = Option(
+        None,
+        help=(
+            "Directory of an archive all responses (beacon node, execution node, "
+            "relays, Web3Signer and Coinbase) are recorded to, to be played back "
+            "with `--playback-archive`."
+        ),
+        file_okay=False,
+        dir_okay=True,
+        show_default=False,
+    ),
+    playback_archive: Optional[Path] = Option(
+        None,
+        help=(
+            "Directory of an archive recorded with `--record-archive`, to play back "
+            "instead of querying the beacon node, execution node, relays, "
+            "Web3Signer and Coinbase."
+        ),
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        show_default=False,
+    ),
+    playback_speed: float = Option(
+        1,
+        help="Speed of the playback, relative to the recording",
+        show_default=True,
+    ),
+    beacon_ssz: bool = Option(
+        False,
+        help=(
+            "Request blocks SSZ encoded, smaller and faster to decode than JSON. "
+            "Beacon nodes not supporting SSZ answer JSON."
+        ),
+        show_default=True,
+    ),
+    liveness_chunk_size: int = Option(
+        LIVENESS_CHUNK_SIZE,
+        min=1,
+        help=(
+            "Maximum number of validators per liveness request. Chunks are "
+            "requested concurrently, and a failed chunk does not disable missed "
+            "attestations detection for the other ones."
+        ),
+        show_default=True,
+    ),
+    store_path: Optional[Path] = Option(
+        None,
+        help=(
+            "Path of a SQLite database where the per epoch rewards, liveness and "
+            "attestation inclusion of our validators are stored."
+        ),
+        file_okay=True,
+        dir_okay=False,
+        show_default=False,
+    ),
+    store_retention_epochs: int = Option(
+        DEFAULT_RETENTION_EPOCHS,
+        min=1,
+        help="Number of epochs kept in the store (see `--store-path`)",
+        show_default=True,
+    ),
+    checkpoint_path: Optional[Path] = Option(
+        None,
+        help=(
+            "Path of a file where the state of the watcher is saved at each epoch, "
+            "and restored from at startup, so a restarted watcher does not start "
+            "from scratch."
+        ),
+        file_okay=True,
+        dir_okay=False,
+        show_default=False,
+    ),
+    backfill_workers: int = Option(
+        BACKFILL_WORKERS,
+        min=0,
+        help=(
+            "Maximum number of epochs missed during a downtime (missed blocks at "
+            "finalized, missed attestations and rewards) processed concurrently, "
+            "in the background. Epochs processed before the downtime are known from "
+            "`--checkpoint-path`. 0 disables the backfill."
+        ),
+        show_default=True,
+    ),
 ) -> None:
     """
     🚨 Ethereum Validator Watcher 🚨
@@ -190,13 +359,28 @@ def handler(
             relay_url,
             liveness_file,
             explorer_url,
+            full_registry_refresh_epochs,
+            beacon_events,
+            debug_endpoints,
+            replay_from_epoch,
+            replay_to_epoch,
+            replay_archive,
+            record_archive,
+            playback_archive,
+            playback_speed,
+            beacon_ssz,
+            liveness_chunk_size,
+            store_path,
+            store_retention_epochs,
+            checkpoint_path,
+            backfill_workers,
         )
     except KeyboardInterrupt:  # pragma: no cover
         print("👋     Bye!")
 
 
 def _handler(
-    beacon_url: str,
+    beacon_url: List[str],
     execution_url: str | None,
     pubkeys_file_path: Path | None,
     web3signer_url: str | None,
@@ -207,6 +391,21 @@ def _handler(
     relays_url: List[str],
     liveness_file: Path | None,
     explorer_url: str | None,
+    full_registry_refresh_epochs: int = 1,
+    beacon_events: bool = False,
+    debug_endpoints: bool = False,
+    replay_from_epoch: int | None = None,
+    replay_to_epoch: int | None = None,
+    replay_archive: Path | None = None,
+    record_archive: Path | None = None,
+    playback_archive: Path | None = None,
+    playback_speed: float = 1,
+    beacon_ssz: bool = False,
+    liveness_chunk_size: int = LIVENESS_CHUNK_SIZE,
+    store_path: Path | None = None,
+    store_retention_epochs: int = DEFAULT_RETENTION_EPOCHS,
+    checkpoint_path: Path | None = None,
+    backfill_workers: int = BACKFILL_WORKERS,
 ) -> None:
     """Just a wrapper to be able to test the handler function"""
     slack_token = environ.get("SLACK_TOKEN")
@@ -233,6 +432,50 @@ def _handler(
             "TELEGRAM_TOKEN env var must be set if you want to use `telegram-channel`"
         )
 
+    if (replay_from_epoch is None) != (replay_to_epoch is None):
+        raise typer.BadParameter(
+            "`replay-from-epoch` and `replay-to-epoch` must be set together"
+        )
+
+    is_replay = replay_from_epoch is not None
+
+    if (
+        replay_from_epoch is not None
+        and replay_to_epoch is not None
+        and replay_from_epoch > replay_to_epoch
+    ):
+        raise typer.BadParameter(
+            "`replay-from-epoch` must be lower than or equal to `replay-to-epoch`"
+        )
+
+    if replay_archive is not None and not is_replay:
+        raise typer.BadParameter(
+            "`replay-archive` can only be used with `replay-from-epoch`"
+        )
+
+    if beacon_events and is_replay:
+        raise typer.BadParameter("`beacon-events` cannot be used when replaying")
+
+    if checkpoint_path is not None and is_replay:
+        raise typer.BadParameter("`checkpoint-path` cannot be used when replaying")
+
+    archive_paths = [replay_archive, record_archive, playback_archive]
+
+    if sum(path is not None for path in archive_paths) > 1:
+        raise typer.BadParameter(
+            "Only one of `replay-archive`, `record-archive` and `playback-archive` "
+            "can be used"
+        )
+
+    if is_replay and (record_archive is not None or playback_archive is not None):
+        raise typer.BadParameter("Use `replay-archive` to record or play back a replay")
+
+    if beacon_events and playback_archive is not None:
+        raise typer.BadParameter("`beacon-events` cannot be used when playing back")
+
+    if playback_speed <= 0:
+        raise typer.BadParameter("`playback-speed` must be positive")
+
     # Create messengers
     messenger: Messenger = None
     messengers: list[Messenger | None] = [
@@ -258,14 +501,52 @@ def _handler(
             else:
                 messenger = MultiMessenger(messenger, candidate)
 
-    beacon = Beacon(beacon_url)
-    execution = Execution(execution_url) if execution_url is not None else None
-    coinbase = Coinbase()
-    web3signer = Web3Signer(web3signer_url) if web3signer_url is not None else None
-    relays = Relays(relays_url)
+    clock = Clock()
+    archive: ResponseArchive | None = None
+    playback_end_time_sec: float | None = None
+
+    if replay_archive is not None:
+        archive = ResponseArchive(replay_archive)
+    elif record_archive is not None:
+        archive = ResponseArchive(record_archive, ArchiveMode.RECORD)
+    elif playback_archive is not None:
+        archive = ResponseArchive(playback_archive, ArchiveMode.PLAYBACK)
+
+        if archive.start_time is None:
+            raise typer.BadParameter("`playback-archive` is empty")
+
+        # Time flows from the start of the recording
+        clock = VirtualClock(archive.start_time, playback_speed)
+        archive.clock = clock
+        playback_end_time_sec = archive.end_time
+
+    beacon = Beacon(beacon_url, archive, beacon_ssz, liveness_chunk_size)
+    concurrent_beacon = ConcurrentBeacon(beacon)
+
+    execution = Execution(execution_url, archive) if execution_url is not None else None
+
+    coinbase = Coinbase(archive)
+
+    web3signer = (
+        Web3Signer(web3signer_url, archive) if web3signer_url is not None else None
+    )
+
+    relays = Relays(relays_url, archive)
+
+    store = (
+        ValidatorStore(store_path, store_retention_epochs)
+        if store_path is not None
+        else None
+    )
+    registry_refresher = RegistryRefresher(beacon, full_registry_refresh_epochs)
+    epoch_pipeline: EpochPipeline[EpochSnapshot] = EpochPipeline()
+    event_stream = EventStream(beacon_url[0]) if beacon_events else None
+
+    if event_stream is not None:
+        event_stream.start()
 
     our_pubkeys: set[str] = set()
-    our_active_idx2val: dict[int, Validators.DataItem.Validator] = {}
+    our_active_idx2val: IndexToValidator = {}
     our_validators_indexes_that_missed_attestation: set[int] = set()
     our_validators_indexes_that_missed_previous_attestation: set[int] = set()
     our_epoch2active_idx2val = LimitedDict(3)
@@ -276,22 +557,109 @@ def _handler(
 
     last_missed_attestations_process_epoch: int | None = None
     last_rewards_process_epoch: int | None = None
+    last_checkpoint_epoch: int | None = None
 
     previous_epoch: int | None = None
     last_processed_finalized_slot: int | None = None
 
     genesis = beacon.get_genesis()
 
+    checkpoint = Checkpoint.read(checkpoint_path) if checkpoint_path else None
+
+    if checkpoint is not None and checkpoint.genesis_time != genesis.data.genesis_time:
+        print(f"⚠️     Checkpoint {checkpoint_path} is from another chain, ignored")
+        checkpoint = None
+
+    if checkpoint is not None:
+        # Validators sets, epochs already processed and our active validators of
+        # the last epochs are restored, so the first slots are fully processed
+        print(f"♻️     Restoring state from checkpoint {checkpoint_path}")
+
+        last_processed_finalized_slot = checkpoint.last_processed_finalized_slot
+        last_missed_attestations_process_epoch = (
+            checkpoint.last_missed_attestations_process_epoch
+        )
+        last_rewards_process_epoch = checkpoint.last_rewards_process_epoch
+
+        our_validators_indexes_that_missed_attestation = (
+            checkpoint.our_missed_attestation_indexes
+        )
+        our_validators_indexes_that_missed_previous_attestation = (
+            checkpoint.our_missed_attestation_indexes
+        )
+
+        exited_validators.our_exited_unslashed_indexes = (
+            checkpoint.our_exited_unslashed_indexes
+        )
+        slashed_validators.total_exited_slashed_indexes = (
+            checkpoint.total_exited_slashed_indexes
+        )
+        slashed_validators.our_exited_slashed_indexes = (
+            checkpoint.our_exited_slashed_indexes
+        )
+
+        for epoch, index_to_validator in sorted(
+            checkpoint.our_epoch_to_active_index_to_validator.items()
+        ):
+            our_epoch2active_idx2val[epoch] = index_to_validator
+            our_active_idx2val = index_to_validator
+
     spec = beacon.get_spec()
     seconds_per_slot = spec.data.SECONDS_PER_SLOT
     slots_per_epoch = spec.data.SLOTS_PER_EPOCH
 
-    for idx, (slot, slot_start_time_sec) in enumerate(
-        slots(
+    committee_positions = CommitteePositions(beacon)
+
+    # When replaying, no epoch is missed
+    backfill = (
+        Backfill(
+            beacon,
+            beacon_type,
+            messenger,
+            store=store,
+            workers=backfill_workers,
+            slots_per_epoch=slots_per_epoch,
+            explorer_url=explorer_url,
+        )
+        if backfill_workers > 0 and not is_replay
+        else None
+    )
+
+    inclusions = EpochInclusions(committee_positions, slots_per_epoch, store)
+
+    # The missed block timeout is relative to a 12 seconds slot
+    missed_block_timeout_sec = (
+        MISSED_BLOCK_TIMEOUT_SEC * seconds_per_slot / NB_SECOND_PER_SLOT
+    )
+
+    if replay_from_epoch is not None and replay_to_epoch is not None:
+        # Past epochs are processed from their own states, as fast as possible
+        beacon.use_epoch_states(slots_per_epoch)
+
+        iter_slots = replay_slots(
             genesis.data.genesis_time,
+            replay_from_epoch * slots_per_epoch,
+            (replay_to_epoch + 1) * slots_per_epoch - 1,
             seconds_per_slot=seconds_per_slot,
         )
-    ):
+    else:
+        iter_slots = slots(
+            genesis.data.genesis_time,
+            seconds_per_slot=seconds_per_slot,
+            clock=clock,
+        )
+
+    replay_start_time_sec = time()
+
+    for idx, (slot, slot_start_time_sec) in enumerate(iter_slots):
+        # The recording may have been stopped while its last slot was processed
+        if (
+            playback_end_time_sec is not None
+            and slot_start_time_sec + seconds_per_slot > playback_end_time_sec
+        ):
+            print("⏹️     End of the playback")
+            break
+
         if slot < 0:
             chain_start_in_sec = -slot * seconds_per_slot
             days, hours, minutes, seconds = convert_seconds_to_dhms(chain_start_in_sec)
@@ -315,80 +683,42 @@ def _handler(
         metric_slot_gauge.set(slot)
         metric_epoch_gauge.set(epoch)
 
+        if backfill is not None:
+            # Backfill tasks do not start while this slot is processed, except while
+            # waiting for its block
+            backfill.pause()
+
         is_new_epoch = previous_epoch is None or previous_epoch != epoch
 
-        if last_processed_finalized_slot is None:
+        if (
+            last_processed_finalized_slot is None
+            or last_processed_finalized_slot > slot
+        ):
             last_processed_finalized_slot = slot
 
         if is_new_epoch:
+            if archive is not None:
+                archive.epoch = epoch
+
             try:
                 our_pubkeys = get_our_pubkeys(pubkeys_file_path, web3signer)
             except ValueError:
                 raise typer.BadParameter("Some pubkeys are invalid")
 
-            # Network validators
-            # ------------------
-            net_status2idx2val = beacon.get_status_to_index_to_validator()
-
-            net_pending_q_idx2val = net_status2idx2val.get(Status.pendingQueued, {})
-            nb_total_pending_q_vals = len(net_pending_q_idx2val)
-            metric_net_pending_q_vals_gauge.set(nb_total_pending_q_vals)
-
-            active_ongoing = net_status2idx2val.get(Status.activeOngoing, {})
-            active_exiting = net_status2idx2val.get(Status.activeExiting, {})
-            active_slashed = net_status2idx2val.get(Status.activeSlashed, {})
-            net_active_idx2val = active_ongoing | active_exiting | active_slashed
-            net_epoch2active_idx2val[epoch] = net_active_idx2val
-
-            net_active_vals_count = len(net_active_idx2val)
-            metric_net_active_validators_gauge.set(net_active_vals_count)
-
-            net_exited_s_idx2val = net_status2idx2val.get(Status.exitedSlashed, {})
-
-            with_poss = net_status2idx2val.get(Status.withdrawalPossible, {})
-            with_done = net_status2idx2val.get(Status.withdrawalDone, {})
-            net_withdrawable_idx2val = with_poss | with_done
-
-            # Our validators
-            # --------------
-            our_status2idx2val = {
-                status: {
-                    index: validator
-                    for index, validator in validator.items()
-                    if validator.pubkey in our_pubkeys
-                }
-                for status, validator in net_status2idx2val.items()
-            }
-
-            our_queued_idx2val = our_status2idx2val.get(Status.pendingQueued, {})
-            metric_our_queued_vals_gauge.set(len(our_queued_idx2val))
-
-            ongoing = our_status2idx2val.get(Status.activeOngoing, {})
-            active_exiting = our_status2idx2val.get(Status.activeExiting, {})
-            active_slashed = our_status2idx2val.get(Status.activeSlashed, {})
-            our_active_idx2val = ongoing | active_exiting | active_slashed
-            our_epoch2active_idx2val[epoch] = our_active_idx2val
-
-            metric_our_active_validators_gauge.set(len(our_active_idx2val))
-            our_exited_u_idx2val = our_status2idx2val.get(Status.exitedUnslashed, {})
-            our_exited_s_idx2val = our_status2idx2val.get(Status.exitedSlashed, {})
-
-            with_poss = our_status2idx2val.get(Status.withdrawalPossible, {})
-            with_done = our_status2idx2val.get(Status.withdrawalDone, {})
-            our_withdrawable_idx2val = with_poss | with_done
-
-            exited_validators.process(our_exited_u_idx2val, our_withdrawable_idx2val)
-
-            slashed_validators.process(
-                net_exited_s_idx2val,
-                our_exited_s_idx2val,
-                net_withdrawable_idx2val,
-                our_withdrawable_idx2val,
+            # Heavy epoch level stages run in the background, so the slot work is
+            # not delayed. The slot loop keeps using the previous epoch snapshot
+            # until the current one is published.
+            epoch_pipeline.submit(
+                epoch,
+                _process_epoch,
+                registry_refresher,
+                exited_validators,
+                slashed_validators,
+                coinbase,
+                epoch,
+                our_pubkeys,
             )
 
-            export_entry_queue_dur_sec(net_active_vals_count, nb_total_pending_q_vals)
-            coinbase.emit_eth_usd_conversion_rate()
-
         if previous_epoch is not None and previous_epoch != epoch:
             print(f"🎂     Epoch     {epoch}     starts")
 
@@ -400,100 +730,228 @@ def _handler(
             )
         )
 
+        is_slot_big_enough = slot_in_epoch >= SLOT_FOR_REWARDS_PROCESS
+        is_last_rewards_epoch_none = last_rewards_process_epoch is None
+        is_new_rewards_epoch = last_rewards_process_epoch != epoch
+        epoch_condition = is_last_rewards_epoch_none or is_new_rewards_epoch
+        should_process_rewards = is_slot_big_enough and epoch_condition
+
+        # Missed attestations and rewards need the snapshot of the current epoch, so
+        # we wait for it. Otherwise, we only publish it if it is already available.
+        # Our active validators may have been restored from a checkpoint, but not the
+        # network ones.
+        must_wait = should_process_missed_attestations or should_process_rewards
+
+        if epoch not in net_epoch2active_idx2val and (
+            must_wait or epoch_pipeline.is_ready(epoch)
+        ):
+            with stage("epoch_snapshot_wait"):
+                snapshot = epoch_pipeline.get(epoch)
+            net_epoch2active_idx2val[epoch] = snapshot.net_active_idx2val
+            our_epoch2active_idx2val[epoch] = snapshot.our_active_idx2val
+            our_active_idx2val = snapshot.our_active_idx2val
+
         if should_process_missed_attestations:
-            our_validators_indexes_that_missed_attestation = (
-                process_missed_attestations(
-                    beacon,
-                    beacon_type,
+            if (
+                backfill is not None
+                and last_missed_attestations_process_epoch is not None
+            ):
+                # Liveness of epoch `N - 1` is processed at epoch `N`. Only the
+                # last missed epoch is backfilled, see `Backfill.submit_liveness`.
+                backfill.submit_liveness(
+                    range(last_missed_attestations_process_epoch, epoch - 1),
                     our_epoch2active_idx2val,
-                    epoch,
+                    our_active_idx2val,
                 )
-            )
 
-            process_double_missed_attestations(
-                our_validators_indexes_that_missed_attestation,
-                our_validators_indexes_that_missed_previous_attestation,
-                our_epoch2active_idx2val,
-                epoch,
-                messenger,
-                explorer_url=explorer_url,
-            )
+            with stage("missed_attestations"):
+                our_validators_indexes_that_missed_attestation = (
+                    process_missed_attestations(
+                        beacon,
+                        beacon_type,
+                        our_epoch2active_idx2val,
+                        epoch,
+                        store=store,
+                    )
+                )
 
-            last_missed_attestations_process_epoch = epoch
+                process_double_missed_attestations(
+                    our_validators_indexes_that_missed_attestation,
+                    our_validators_indexes_that_missed_previous_attestation,
+                    our_epoch2active_idx2val,
+                    epoch,
+                    messenger,
+                    explorer_url=explorer_url,
+                )
 
-        is_slot_big_enough = slot_in_epoch >= SLOT_FOR_REWARDS_PROCESS
-        is_last_rewards_epoch_none = last_rewards_process_epoch is None
-        is_new_rewards_epoch = last_rewards_process_epoch != epoch
-        epoch_condition = is_last_rewards_epoch_none or is_new_rewards_epoch
-        should_process_rewards = is_slot_big_enough and epoch_condition
+            last_missed_attestations_process_epoch = epoch
 
         if should_process_rewards:
-            process_rewards(
-                beacon,
-                beacon_type,
-                epoch,
-                net_epoch2active_idx2val,
-                our_epoch2active_idx2val,
-            )
+            if backfill is not None and last_rewards_process_epoch is not None:
+                # Rewards of epoch `N - 2` are processed at epoch `N`
+                backfill.submit_rewards(
+                    range(max(last_rewards_process_epoch - 1, 0), epoch - 2),
+                    our_epoch2active_idx2val,
+                    our_active_idx2val,
+                )
+
+            with stage("rewards"):
+                process_rewards(
+                    beacon,
+                    beacon_type,
+                    epoch,
+                    net_epoch2active_idx2val,
+                    our_epoch2active_idx2val,
+                    store=store,
+                )
 
             last_rewards_process_epoch = epoch
 
-        process_future_blocks_proposal(
-            beacon,
-            our_pubkeys,
-            slot,
-            is_new_epoch,
-            slots_per_epoch=slots_per_epoch,
-        )
+        if not is_replay:
+            # When replaying, past blocks are already finalized (and processed at
+            # head), and future blocks proposals are irrelevant.
+            # Independent requests needed by the slot processing are sent concurrently.
+            # Proposer schedules are memoized by `beacon`, so the processing functions
+            # below will not request them again.
+            with stage("duties_prefetch"):
+                # Without head events, reorgs are detected from the dependent root
+                # of proposer duties, retrieved again once per epoch
+                *_, last_finalized_header = run_concurrently(
+                    (
+                        concurrent_beacon.refresh_proposer_schedule(epoch)
+                        if event_stream is None and is_new_epoch
+                        else concurrent_beacon.get_proposer_schedule(epoch)
+                    ),
+                    concurrent_beacon.get_proposer_schedule(epoch + 1),
+                    concurrent_beacon.get_header(BlockIdentierType.FINALIZED),
+                )
 
-        last_processed_finalized_slot = process_missed_blocks_finalized(
-            beacon,
-            last_processed_finalized_slot,
-            slot,
-            our_pubkeys,
-            messenger,
-            slots_per_epoch=slots_per_epoch,
-            explorer_url=explorer_url,
-        )
+            with stage("future_blocks_proposal"):
+                process_future_blocks_proposal(
+                    beacon,
+                    our_pubkeys,
+                    slot,
+                    is_new_epoch,
+                    slots_per_epoch=slots_per_epoch,
+                )
+
+            last_finalized_slot = last_finalized_header.data.header.message.slot
+
+            if (
+                backfill is not None
+                and last_finalized_slot - last_processed_finalized_slot
+                > 2 * slots_per_epoch
+            ):
+                # Slots finalized during a downtime are processed in the background,
+                # but the last epoch of them
+                first_slot = last_finalized_slot - slots_per_epoch + 1
+
+                backfill.submit_blocks(
+                    range(last_processed_finalized_slot + 1, first_slot), our_pubkeys
+                )
+
+                last_processed_finalized_slot = first_slot - 1
 
-        delta_sec = MISSED_BLOCK_TIMEOUT_SEC - (time() - slot_start_time_sec)
-        sleep(max(0, delta_sec))
+            with stage("missed_blocks_finalized"):
+                last_processed_finalized_slot = process_missed_blocks_finalized(
+                    beacon,
+                    last_processed_finalized_slot,
+                    slot,
+                    our_pubkeys,
+                    messenger,
+                    slots_per_epoch=slots_per_epoch,
+                    explorer_url=explorer_url,
+                    last_finalized_header=last_finalized_header,
+                )
+
+            # Duties of finalized epochs cannot change anymore, and are already processed
+            beacon.evict_finalized(last_processed_finalized_slot // slots_per_epoch)
+
+        delta_sec = missed_block_timeout_sec - (clock.time() - slot_start_time_sec)
+
+        if backfill is not None:
+            # Backfill tasks may start while waiting for the block
+            backfill.resume()
+
+        if is_replay:
+            # Past blocks are already there
+            pass
+        elif event_stream is not None:
+            # Stop waiting as soon as the block is received
+            event_stream.wait_for_block(slot, delta_sec)
+
+            # Evict cached duties made obsolete by a reorg, if any
+            if event_stream.last_head is not None:
+                beacon.observe_head(event_stream.last_head, slots_per_epoch)
+
+            for reorg in event_stream.pop_chain_reorgs():
+                beacon.observe_reorg(reorg, slots_per_epoch)
+        else:
+            clock.sleep(delta_sec)
+
+        if backfill is not None:
+            backfill.pause()
+
+        # Committees of the previous slot are memoized by `beacon`, and will be used
+        # by `process_suboptimal_attestations`
+        with stage("block_fetch"):
+            potential_block, *_ = run_concurrently(
+                concurrent_beacon.get_potential_block(slot),
+                *(
+                    [
+                        concurrent_beacon.get_duty_slot_to_committee_index_to_validators_index(
+                            (slot - 1) // slots_per_epoch
+                        )
+                    ]
+                    if slot >= 1
+                    else []
+                ),
+            )
 
-        potential_block = beacon.get_potential_block(slot)
+        with stage("inclusions"):
+            inclusions.process(
+                slot, potential_block, our_epoch2active_idx2val, our_active_idx2val
+            )
 
         if potential_block is not None:
             block = potential_block
 
-            process_suboptimal_attestations(
+            with stage("suboptimal_attestations"):
+                process_suboptimal_attestations(
+                    beacon,
+                    block,
+                    slot,
+                    our_active_idx2val,
+                    slots_per_epoch=slots_per_epoch,
+                    store=store,
+                    committee_positions=committee_positions,
+                )
+
+            with stage("fee_recipient"):
+                process_fee_recipient(
+                    block,
+                    our_active_idx2val,
+                    execution,
+                    fee_recipient,
+                    messenger,
+                    slots_per_epoch=slots_per_epoch,
+                    explorer_url=explorer_url,
+                )
+
+        with stage("missed_blocks_head"):
+            is_our_validator = process_missed_blocks_head(
                 beacon,
-                block,
+                potential_block,
                 slot,
-                our_active_idx2val,
-                slots_per_epoch=slots_per_epoch,
-            )
-
-            process_fee_recipient(
-                block,
-                our_active_idx2val,
-                execution,
-                fee_recipient,
+                our_pubkeys,
                 messenger,
                 slots_per_epoch=slots_per_epoch,
                 explorer_url=explorer_url,
             )
 
-        is_our_validator = process_missed_blocks_head(
-            beacon,
-            potential_block,
-            slot,
-            our_pubkeys,
-            messenger,
-            slots_per_epoch=slots_per_epoch,
-            explorer_url=explorer_url,
-        )
-
         if is_our_validator and potential_block is not None:
-            relays.process(slot)
+            with stage("relays"):
+                relays.process(slot)
 
         our_validators_indexes_that_missed_previous_attestation = (
             our_validators_indexes_that_missed_attestation
@@ -501,11 +959,133 @@ def _handler(
 
         previous_epoch = epoch
 
+        if not is_replay:
+            # Processing of this slot is over
+            observe_slot_end(slot_start_time_sec, seconds_per_slot, clock.time())
+
+        if backfill is not None:
+            backfill.resume()
+
         if slot_in_epoch >= SLOT_FOR_MISSED_ATTESTATIONS_PROCESS:
             should_process_missed_attestations = True
 
         if liveness_file is not None:
             write_liveness_file(liveness_file)
 
+        # Once per epoch, when epoch level processing is over
+        if (
+            checkpoint_path is not None
+            and last_rewards_process_epoch == epoch
+            and last_checkpoint_epoch != epoch
+        ):
+            with stage("checkpoint"):
+                Checkpoint(
+                    genesis.data.genesis_time,
+                    last_processed_finalized_slot,
+                    last_missed_attestations_process_epoch,
+                    last_rewards_process_epoch,
+                    our_validators_indexes_that_missed_attestation,
+                    exited_validators.our_exited_unslashed_indexes,
+                    slashed_validators.total_exited_slashed_indexes,
+                    slashed_validators.our_exited_slashed_indexes,
+                    {
+                        epoch_: our_epoch2active_idx2val[epoch_]
+                        for epoch_ in our_epoch2active_idx2val
+                    },
+                ).write(checkpoint_path)
+
+            last_checkpoint_epoch = epoch
+
         if idx == 0:
-            start_http_server(8000)
+            if debug_endpoints:
+                start_debug_http_server(8000)
+            else:
+                start_http_server(8000)
+
+    epoch_pipeline.shutdown()
+    concurrent_beacon.shutdown()
+
+    if backfill is not None:
+        backfill.shutdown()
+
+    if archive is not None:
+        archive.close()
+
+    if store is not None:
+        store.close()
+
+    if is_replay and previous_epoch is not None:
+        nb_slots = idx + 1
+        duration_sec = time() - replay_start_time_sec
+
+        print(
+            f"⏩     Replayed {nb_slots} slots in {duration_sec:.1f} seconds "
+            f"({nb_slots / duration_sec:.1f} slots per second)"
+        )
+
+    if event_stream is not None:
+        event_stream.stop()
+
+
+def _process_epoch(
+    registry_refresher: RegistryRefresher,
+    exited_validators: ExitedValidators,
+    slashed_validators: SlashedValidators,
+    coinbase: Coinbase,
+    epoch: int,
+    our_pubkeys: set[str],
+) -> EpochSnapshot:
+    """Run epoch level stages. Run in the background by the epoch pipeline.
+
+    Parameters:
+    registry_refresher: Registry refresher
+    exited_validators : Exited validators
+    slashed_validators: Slashed validators
+    coinbase          : Coinbase
+    epoch             : Epoch to process
+    our_pubkeys       : Set of our validators public keys
+
+    Returns the snapshot of active validators for `epoch`.
+    """
+    # Network validators
+    # ------------------
+    with stage("registry"):
+        net_registry, our_registry = registry_refresher.refresh(epoch, our_pubkeys)
+
+    nb_total_pending_q_vals = net_registry.count({Status.pendingQueued})
+    metric_net_pending_q_vals_gauge.set(nb_total_pending_q_vals)
+
+    net_active_idx2val = net_registry.view(ACTIVE_STATUSES)
+
+    net_active_vals_count = len(net_active_idx2val)
+    metric_net_active_validators_gauge.set(net_active_vals_count)
+
+    net_exited_s_idx2val = net_registry.view({Status.exitedSlashed})
+    net_withdrawable_idx2val = net_registry.view(WITHDRAWABLE_STATUSES)
+
+    # Our validators
+    # --------------
+    metric_our_queued_vals_gauge.set(our_registry.count({Status.pendingQueued}))
+
+    our_active_idx2val = our_registry.view(ACTIVE_STATUSES)
+
+    metric_our_active_validators_gauge.set(len(our_active_idx2val))
+    our_exited_u_idx2val = our_registry.view({Status.exitedUnslashed})
+    our_exited_s_idx2val = our_registry.view({Status.exitedSlashed})
+    our_withdrawable_idx2val = our_registry.view(WITHDRAWABLE_STATUSES)
+
+    with stage("exited_validators"):
+        exited_validators.process(our_exited_u_idx2val, our_withdrawable_idx2val)
+
+    with stage("slashed_validators"):
+        slashed_validators.process(
+            net_exited_s_idx2val,
+            our_exited_s_idx2val,
+            net_withdrawable_idx2val,
+            our_withdrawable_idx2val,
+        )
+
+    export_entry_queue_dur_sec(net_active_vals_count, nb_total_pending_q_vals)
+    coinbase.emit_eth_usd_conversion_rate()
+
+    return EpochSnapshot(net_active_idx2val, our_active_idx2val)
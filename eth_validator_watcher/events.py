@@ -0,0 +1,180 @@
+"""Contains the EventStream class which is used to subscribe to the consensus layer
+node events."""
+
+import functools
+from threading import Condition, Event, Thread
+from typing import Iterable, Iterator
+
+from prometheus_client import Counter
+from pydantic import ValidationError
+from requests import Session
+from requests.exceptions import RequestException
+
+from .models import BlockEvent, ChainReorgEvent, HeadEvent
+
+print = functools.partial(print, flush=True)
+
+TOPICS = ("head", "block", "chain_reorg")
+
+# Connection timeout. There is no read timeout, since the stream may stay idle for
+# several seconds between two events.
+TIMEOUT_CONNECT_SEC = 10
+
+# Delay before reconnecting when the stream is interrupted
+RECONNECT_DELAY_SEC = 1
+
+metric_beacon_events_count = Counter(
+    "beacon_events_count",
+    "Count of events received from the beacon node",
+    ["topic"],
+)
+
+
+def iter_events(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Yield `(event, data)` tuples from the lines of a Server-Sent Events stream.
+
+    Parameters:
+    lines: Lines of the stream, without line terminators
+    """
+    event, data_lines = "message", []
+
+    for line in lines:
+        if line == "":
+            if len(data_lines) > 0:
+                yield event, "\n".join(data_lines)
+
+            event, data_lines = "message", []
+            continue
+
+        if line.startswith(":"):
+            # Comment, used by some beacon nodes as keep alive
+            continue
+
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+
+        if field == "event":
+            event = value
+        elif field == "data":
+            data_lines.append(value)
+
+
+class EventStream:
+    """Beacon node events stream.
+
+    Events are read by a background thread, which reconnects if the stream is
+    interrupted. The slot loop can then wait for the block of a given slot, instead
+    of polling the beacon node after a fixed delay, and evict duties made obsolete
+    by chain reorgs.
+    """
+
+    def __init__(self, url: str, topics: Iterable[str] = TOPICS) -> None:
+        """Event stream
+
+        Parameters:
+        url   : URL where the beacon can be reached
+        topics: Topics to subscribe to
+        """
+        self.__url = url
+        self.__topics = ",".join(topics)
+        self.__http = Session()
+        self.__stopped = Event()
+        self.__condition = Condition()
+        self.__thread = Thread(target=self.__run, name="beacon-events", daemon=True)
+
+        self.last_block_slot: int | None = None
+        self.last_head: HeadEvent | None = None
+        self.__chain_reorgs: list[ChainReorgEvent] = []
+
+    def start(self) -> None:
+        """Start reading events in the background."""
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop reading events.
+
+        A blocking read cannot be interrupted, so the background thread actually
+        exits when the next event is received (or the stream is interrupted).
+        """
+        self.__stopped.set()
+
+    def wait_for_block(self, slot: int, timeout_sec: float) -> bool:
+        """Wait until a block for slot `slot` (or a later one) is received.
+
+        Parameters:
+        slot       : Slot
+        timeout_sec: Maximum duration to wait for, in seconds
+
+        Returns `True` if such a block was received, `False` if `timeout_sec`
+        elapsed first.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: self.last_block_slot is not None
+                and self.last_block_slot >= slot,
+                timeout=max(0, timeout_sec),
+            )
+
+    def pop_chain_reorgs(self) -> list[ChainReorgEvent]:
+        """Return chain reorgs received since the previous call."""
+        with self.__condition:
+            chain_reorgs, self.__chain_reorgs = self.__chain_reorgs, []
+
+        return chain_reorgs
+
+    def __run(self) -> None:
+        while not self.__stopped.is_set():
+            try:
+                with self.__http.get(
+                    f"{self.__url}/eth/v1/events",
+                    params=dict(topics=self.__topics),
+                    headers=dict(Accept="text/event-stream"),
+                    stream=True,
+                    timeout=(TIMEOUT_CONNECT_SEC, None),
+                ) as response:
+                    response.raise_for_status()
+
+                    # Beacon nodes send events as HTTP chunks: without `chunk_size`,
+                    # each event is processed as soon as it is received.
+                    lines = response.iter_lines(chunk_size=None, decode_unicode=True)
+
+                    for event, data in iter_events(lines):
+                        if self.__stopped.is_set():
+                            return
+
+                        self.__process(event, data)
+            except RequestException as e:
+                print(f"⚠️     Beacon events stream interrupted: {e}")
+
+            self.__stopped.wait(RECONNECT_DELAY_SEC)
+
+    def __process(self, event: str, data: str) -> None:
+        metric_beacon_events_count.labels(topic=event).inc()
+
+        try:
+            if event == "head":
+                self.last_head = HeadEvent.model_validate_json(data)
+                self.__notify_block(self.last_head.slot)
+
+            elif event == "block":
+                self.__notify_block(BlockEvent.model_validate_json(data).slot)
+
+            elif event == "chain_reorg":
+                reorg = ChainReorgEvent.model_validate_json(data)
+
+                print(
+                    f"🔀     Chain reorg at slot {reorg.slot} (depth {reorg.depth}): "
+                    f"{reorg.old_head_block} -> {reorg.new_head_block}"
+                )
+
+                with self.__condition:
+                    self.__chain_reorgs.append(reorg)
+        except ValidationError as e:
+            print(f"⚠️     Invalid `{event}` event received: {e}")
+
+    def __notify_block(self, slot: int) -> None:
+        with self.__condition:
+            if self.last_block_slot is None or slot > self.last_block_slot:
+                self.last_block_slot = slot
+
+            self.__condition.notify_all()
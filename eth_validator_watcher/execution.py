@@ -2,28 +2,32 @@
 
 
 from requests import Session, codes
-from requests.adapters import HTTPAdapter, Retry
+from requests.adapters import Retry
 
 from eth_validator_watcher.models import EthGetBlockByHashRequest, ExecutionBlock
 
+from .archive import ResponseArchive, make_adapter
+
 
 class Execution:
     """Beacon node abstraction."""
 
-    def __init__(self, url: str) -> None:
+    def __init__(self, url: str, archive: ResponseArchive | None = None) -> None:
         """Execution node
 
-        url: URL where the execution node can be reached
+        url    : URL where the execution node can be reached
+        archive: Archive responses are recorded to (or served from), if any
         """
         self.__url = url
         self.__http = Session()
 
-        adapter = HTTPAdapter(
-            max_retries=Retry(
+        adapter = make_adapter(
+            archive,
+            Retry(
                 backoff_factor=0.5,
                 total=3,
                 status_forcelist=[codes.not_found],
-            )
+            ),
         )
 
         self.__http.mount("http://", adapter)
@@ -4,8 +4,8 @@ validators."""
 
 from prometheus_client import Gauge
 
-from .models import Validators
 from .messengers import Messenger
+from .registry import IndexToValidator
 
 metric_our_exited_validators_count = Gauge(
     "our_exited_validators_count",
@@ -31,19 +31,30 @@ class ExitedValidators:
         self.__messenger = messenger
         self.__explorer_url = explorer_url
 
+    @property
+    def our_exited_unslashed_indexes(self) -> set[int] | None:
+        """Indexes of our exited unslashed validators, as of the last processing.
+        None if not processed yet."""
+        return self.__our_exited_unslashed_indexes
+
+    @our_exited_unslashed_indexes.setter
+    def our_exited_unslashed_indexes(self, indexes: set[int] | None) -> None:
+        self.__our_exited_unslashed_indexes = indexes
+
     def process(
         self,
-        our_exited_unslashed_index_to_validator: dict[
-            int, Validators.DataItem.Validator
-        ],
-        our_withdrawal_index_to_validator: dict[int, Validators.DataItem.Validator],
+        our_exited_unslashed_index_to_validator: IndexToValidator,
+        our_withdrawal_index_to_validator: IndexToValidator,
     ) -> None:
         """Process exited validators.
 
         Parameters:
-        our_exited_unslashed_index_to_validator: Dictionary with:
+        our_exited_unslashed_index_to_validator: Dictionary (or registry view) with:
             key  : our exited validator index
             value: validator data corresponding to the validator index
+        our_withdrawal_index_to_validator      : Dictionary (or registry view) with:
+            key  : our withdrawal validator index
+            value: validator data corresponding to the validator index
         """
 
         our_exited_unslashed_indexes = set(our_exited_unslashed_index_to_validator)
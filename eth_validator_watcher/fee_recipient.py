@@ -5,7 +5,8 @@ from prometheus_client import Counter
 
 from .execution import Execution
 from .messengers import Messenger
-from .models import Block, Validators
+from .lean_models import Block
+from .registry import IndexToValidator
 from .utils import NB_SLOT_PER_EPOCH
 
 metric_wrong_fee_recipient_proposed_block_count = Counter(
@@ -16,7 +17,7 @@ metric_wrong_fee_recipient_proposed_block_count = Counter(
 
 def process_fee_recipient(
     block: Block,
-    index_to_validator: dict[int, Validators.DataItem.Validator],
+    index_to_validator: IndexToValidator,
     execution: Execution | None,
     expected_fee_recipient: str | None,
     messenger: Messenger | None,
@@ -0,0 +1,218 @@
+"""Contains the EpochInclusions class, which computes the attestation inclusion
+delay of our validators over whole epochs."""
+
+import functools
+
+from prometheus_client import Gauge, Histogram
+
+from .committee_positions import CommitteePositions
+from .lean_models import Block
+from .registry import IndexToValidator
+from .store import ValidatorStore
+from .utils import NB_SLOT_PER_EPOCH, LimitedDict, convert_hex_to_bitlist
+
+print = functools.partial(print, flush=True)
+
+# An attestation is optimally included at distance 1. Beyond one epoch, it cannot be
+# included anymore.
+INCLUSION_DISTANCE_BUCKETS_SLOTS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64)
+
+# (Attestation slot, committee index)
+CommitteeKey = tuple[int, int]
+
+metric_inclusion_distance_slots = Histogram(
+    "attestation_inclusion_distance_slots",
+    "Distance, in slots, between attestations of our validators and the first block "
+    "including them",
+    buckets=INCLUSION_DISTANCE_BUCKETS_SLOTS,
+)
+
+metric_not_included_attestations_rate_gauge = Gauge(
+    "not_included_attestations_rate",
+    "Rate of attestations of our validators not included in any block of their "
+    "epoch or of the next one",
+)
+
+
+class EpochInclusions:
+    """Attestation inclusions of whole epochs.
+
+    Aggregation bits of every attestation of every block are accumulated into one
+    bitset per committee (attestation slot and committee index). For each block, the
+    bits it includes for the first time are kept, with the slot of the block. Blocks
+    are expected in slot order.
+
+    An attestation of epoch `N` can be included until the end of epoch `N + 1`. Once
+    a slot of epoch `N + 2` is processed, inclusions of epoch `N` are complete: the
+    inclusion delay of each of our validators is computed, looking up their bits
+    only, at their positions in committees. Our active validators of epoch `N` and
+    committees from the state of epoch `N` are used, not the head ones.
+    """
+
+    def __init__(
+        self,
+        committee_positions: CommitteePositions,
+        slots_per_epoch: int = NB_SLOT_PER_EPOCH,
+        store: ValidatorStore | None = None,
+    ) -> None:
+        """EpochInclusions
+
+        Parameters:
+        committee_positions: Positions of our validators in committees
+        slots_per_epoch    : Number of slots per epoch
+        store              : Store where inclusion delays of our validators are
+                             added, if any
+        """
+        self.__committee_positions = committee_positions
+        self.__slots_per_epoch = slots_per_epoch
+        self.__store = store
+
+        # Attestation epoch -> committee -> bits included so far
+        self.__epoch_to_included_bits: dict[int, dict[CommitteeKey, int]] = {}
+
+        # Attestation epoch -> committee -> list of (block slot, bits included for
+        # the first time by this block)
+        self.__epoch_to_first_inclusions: dict[
+            int, dict[CommitteeKey, list[tuple[int, int]]]
+        ] = {}
+
+        self.__first_slot: int | None = None
+
+    def process(
+        self,
+        slot: int,
+        block: Block | None,
+        our_epoch_to_index_to_validator: LimitedDict,
+        our_index_to_validator: IndexToValidator,
+    ) -> dict[int, dict[int, int | None]]:
+        """Add attestations of the block of `slot`, if any, then compute inclusion
+        delays of our validators for complete epochs.
+
+        Parameters:
+        slot                           : Slot
+        block                          : Block of `slot`, None if missed
+        our_epoch_to_index_to_validator: Our active validators, per epoch
+        our_index_to_validator         : Our active validators, used for epochs not
+                                         in `our_epoch_to_index_to_validator`
+
+        Returns a dictionary where key is a complete epoch, and value is the
+        inclusion delay (in slots) of each of our validators which had to attest
+        during this epoch, None if its attestation was not included.
+        Epochs started before the first processed slot are ignored, since their
+        first inclusions may have been missed.
+        """
+        if self.__first_slot is None:
+            self.__first_slot = slot
+
+        # Even if none of its attestations is ever included, the epoch is processed
+        current_epoch = slot // self.__slots_per_epoch
+        self.__epoch_to_included_bits.setdefault(current_epoch, {})
+        self.__epoch_to_first_inclusions.setdefault(current_epoch, {})
+
+        if block is not None:
+            self.__add_block(block)
+
+        complete_epochs = sorted(
+            epoch
+            for epoch in self.__epoch_to_first_inclusions
+            if epoch < current_epoch - 1
+        )
+
+        epoch_to_index_to_inclusion_delay: dict[int, dict[int, int | None]] = {}
+
+        for epoch in complete_epochs:
+            first_inclusions = self.__epoch_to_first_inclusions.pop(epoch)
+            del self.__epoch_to_included_bits[epoch]
+
+            if epoch * self.__slots_per_epoch < self.__first_slot:
+                continue
+
+            epoch_to_index_to_inclusion_delay[epoch] = self.__process_epoch(
+                epoch,
+                first_inclusions,
+                (
+                    our_epoch_to_index_to_validator[epoch]
+                    if epoch in our_epoch_to_index_to_validator
+                    else our_index_to_validator
+                ),
+            )
+
+        return epoch_to_index_to_inclusion_delay
+
+    def __add_block(self, block: Block) -> None:
+        block_slot = block.data.message.slot
+        first_epoch = block_slot // self.__slots_per_epoch - 1
+
+        for attestation in block.data.message.body.attestations:
+            attestation_slot = attestation.data.slot
+            epoch = attestation_slot // self.__slots_per_epoch
+
+            if epoch < first_epoch:
+                # Cannot be included anymore
+                continue
+
+            key = attestation_slot, attestation.data.index
+            bits, _ = convert_hex_to_bitlist(attestation.aggregation_bits)
+
+            included_bits = self.__epoch_to_included_bits.setdefault(epoch, {})
+            already_included_bits = included_bits.get(key, 0)
+            new_bits = bits & ~already_included_bits
+
+            if new_bits == 0:
+                continue
+
+            included_bits[key] = already_included_bits | new_bits
+
+            self.__epoch_to_first_inclusions.setdefault(epoch, {}).setdefault(
+                key, []
+            ).append((block_slot, new_bits))
+
+    def __process_epoch(
+        self,
+        epoch: int,
+        first_inclusions: dict[CommitteeKey, list[tuple[int, int]]],
+        our_active_validators_index_to_validator: IndexToValidator,
+    ) -> dict[int, int | None]:
+        """Compute inclusion delays of our validators for a complete epoch.
+
+        The head state is already two epochs ahead, so committees are retrieved from
+        the state at the first slot of `epoch`.
+        """
+        positions = self.__committee_positions.get(
+            epoch,
+            our_active_validators_index_to_validator,
+            state_slot=epoch * self.__slots_per_epoch,
+        )
+
+        index_to_inclusion_delay: dict[int, int | None] = {}
+
+        # Only bits of our validators are looked up
+        for slot, committee_index, position, validator_index in positions:
+            inclusion_delay: int | None = None
+
+            for block_slot, new_bits in first_inclusions.get(
+                (slot, committee_index), []
+            ):
+                if new_bits >> position & 1:
+                    inclusion_delay = block_slot - slot
+                    break
+
+            index_to_inclusion_delay[validator_index] = inclusion_delay
+
+        nb_not_included = 0
+
+        for inclusion_delay in index_to_inclusion_delay.values():
+            if inclusion_delay is None:
+                nb_not_included += 1
+            else:
+                metric_inclusion_distance_slots.observe(inclusion_delay)
+
+        if len(index_to_inclusion_delay) > 0:
+            metric_not_included_attestations_rate_gauge.set(
+                100 * nb_not_included / len(index_to_inclusion_delay)
+            )
+
+        if self.__store is not None:
+            self.__store.add_inclusion_delays(epoch, index_to_inclusion_delay)
+
+        return index_to_inclusion_delay
@@ -0,0 +1,124 @@
+"""Contains the latency instrumentation of the slot loop: per stage and per beacon
+endpoint latency histograms, and slot budget metrics."""
+
+import re
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Iterator
+from urllib.parse import urlsplit
+
+from prometheus_client import Counter, Gauge, Histogram
+from requests import Response
+
+# Block, epoch or validator identifiers in URL paths
+IDENTIFIER_PATTERN = re.compile(r"^(\d+|0x[0-9a-fA-F]+)$")
+
+# From 5 ms to 1 minute, the slot budget being 12 seconds
+LATENCY_BUCKETS_SEC = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+metric_stage_duration_sec = Histogram(
+    "stage_duration_sec",
+    "Duration of a processing stage, in seconds",
+    ["stage"],
+    buckets=LATENCY_BUCKETS_SEC,
+)
+
+metric_beacon_request_duration_sec = Histogram(
+    "beacon_request_duration_sec",
+    "Duration of a beacon node request, in seconds",
+    ["method", "path", "status"],
+    buckets=LATENCY_BUCKETS_SEC,
+)
+
+metric_slot_processing_overrun_count = Counter(
+    "slot_processing_overrun_count",
+    "Number of slots whose processing ended after the start of the next slot",
+)
+
+metric_slot_processing_margin_sec = Gauge(
+    "slot_processing_margin_sec",
+    "Time left before the next slot when the slot processing ended, in seconds",
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Record the duration of the enclosed block as stage `name`."""
+    start = perf_counter()
+
+    try:
+        yield
+    finally:
+        metric_stage_duration_sec.labels(stage=name).observe(perf_counter() - start)
+
+
+def path_template(url: str) -> str:
+    """Return the path of `url`, with identifiers replaced by `{id}`.
+
+    Keeps the cardinality of the `path` label bounded.
+
+    Example: "http://localhost:5052/eth/v2/beacon/blocks/42"
+             --> "/eth/v2/beacon/blocks/{id}"
+    """
+    return "/".join(
+        "{id}" if IDENTIFIER_PATTERN.match(segment) else segment
+        for segment in urlsplit(url).path.split("/")
+    )
+
+
+def timed_request(
+    method: str, send: Callable[..., Response], url: str, *args: Any, **kwargs: Any
+) -> Response:
+    """Call `send(url, *args, **kwargs)` and record its duration.
+
+    Parameters:
+    method: HTTP method, used as metrics label
+    send  : Function sending the request, for instance `Session.get`
+    url   : URL of the request
+
+    If `send` raises, the request is recorded with the `error` status.
+    For streamed responses, only the time to receive headers is recorded.
+    """
+    start = perf_counter()
+    status = "error"
+
+    try:
+        response = send(url, *args, **kwargs)
+        status = str(response.status_code)
+        return response
+    finally:
+        metric_beacon_request_duration_sec.labels(
+            method=method, path=path_template(url), status=status
+        ).observe(perf_counter() - start)
+
+
+def observe_slot_end(
+    slot_start_time_sec: float, seconds_per_slot: int, now: float
+) -> None:
+    """Record how much time was left in the slot budget when the slot processing
+    ended, and count an overrun if the next slot already started.
+
+    Parameters:
+    slot_start_time_sec: Start time of the slot, in seconds since epoch
+    seconds_per_slot   : Duration of a slot, in seconds
+    now                : Current time, in seconds since epoch
+    """
+    margin_sec = slot_start_time_sec + seconds_per_slot - now
+    metric_slot_processing_margin_sec.set(margin_sec)
+
+    if margin_sec < 0:
+        metric_slot_processing_overrun_count.inc()
@@ -0,0 +1,254 @@
+"""Contains an incremental JSON reader used to decode huge beacon responses without
+materializing the whole JSON tree in memory."""
+
+import codecs
+import json
+import re
+from typing import Any, Collection, Iterable, Iterator, Sequence
+
+WHITESPACES = " \t\n\r"
+NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+# Separator following an array item
+ITEM_SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+
+# Text a truncated value may end with: the beginning of a number or of a literal
+TRUNCATED_VALUE = re.compile(r"[\w.+-]*\Z")
+
+# Text a truncated number may end with, after its first digits
+TRUNCATED_NUMBER_TAIL = re.compile(r"[\d.eE+-]*\Z")
+
+# Longest escape sequence of a string: a surrogate pair, as `\ud83d\ude00`
+MAX_ESCAPE_LENGTH = 12
+
+# Consumed characters are dropped from the buffer once they exceed this size
+COMPACT_THRESHOLD = 1 << 20
+
+# Scanner of `json.JSONDecoder.raw_decode`, called directly to save a Python call
+# per value. It raises `StopIteration` if no value starts at the given position.
+_scan_once = json.JSONDecoder().scan_once
+
+
+class _Reader:
+    """Character buffer fed on demand by an iterable of bytes chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self.__chunks = iter(chunks)
+        self.__utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def feed(self) -> bool:
+        """Read one more chunk. Returns `False` if the stream is exhausted."""
+        if self.eof:
+            return False
+
+        try:
+            chunk = next(self.__chunks)
+        except StopIteration:
+            self.eof = True
+            self.buffer += self.__utf8_decoder.decode(b"", final=True)
+            return False
+
+        if self.position > COMPACT_THRESHOLD:
+            self.buffer = self.buffer[self.position :]
+            self.position = 0
+
+        self.buffer += self.__utf8_decoder.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, without consuming it.
+        Returns an empty string at the end of the stream."""
+        while True:
+            match = NON_WHITESPACE.search(self.buffer, self.position)
+
+            if match is not None:
+                self.position = match.start()
+                return self.buffer[self.position]
+
+            self.position = len(self.buffer)
+
+            if not self.feed():
+                return ""
+
+    def expect(self, character: str) -> None:
+        """Consume `character`, which has to be the next non-whitespace one."""
+        actual = self.peek()
+
+        if actual != character:
+            raise ValueError(
+                f"Expected `{character}` at position {self.position}, got `{actual}`"
+            )
+
+        self.position += 1
+
+    def value(self) -> Any:
+        """Decode and consume the next JSON value."""
+        if (
+            self.position == len(self.buffer)
+            or self.buffer[self.position] in WHITESPACES
+        ):
+            self.peek()
+
+        while True:
+            try:
+                value, end = _scan_once(self.buffer, self.position)
+            except json.JSONDecodeError as e:
+                if self.__may_be_truncated(e.msg, e.pos) and self.feed():
+                    continue
+
+                raise
+            except StopIteration as e:
+                if self.__may_be_truncated("Expecting value", e.value) and self.feed():
+                    continue
+
+                raise json.JSONDecodeError(
+                    "Expecting value", self.buffer, e.value
+                ) from None
+
+            # A value ending exactly at the end of the buffer, or a number followed by
+            # what may be its continuation, may be truncated, so we need to read
+            # further before accepting it.
+            if (
+                end == len(self.buffer)
+                or (
+                    isinstance(value, (int, float))
+                    and TRUNCATED_NUMBER_TAIL.match(self.buffer, end) is not None
+                )
+            ) and self.feed():
+                continue
+
+            self.position = end
+            return value
+
+    def __may_be_truncated(self, message: str, position: int) -> bool:
+        """Return `True` if a decoding error at `position` may come from a value
+        truncated by the end of the buffer, so reading further may fix it.
+
+        Any other error is raised without reading the rest of the stream.
+        """
+        if position == len(self.buffer) or message.startswith("Unterminated string"):
+            return True
+
+        if message.startswith("Invalid \\uXXXX escape"):
+            return len(self.buffer) - position < MAX_ESCAPE_LENGTH
+
+        if message == "Expecting value":
+            return TRUNCATED_VALUE.match(self.buffer, position) is not None
+
+        # A number is followed by a delimiter, which may not be read yet
+        if message == "Expecting ',' delimiter":
+            return (
+                self.buffer[position - 1].isdigit()
+                and TRUNCATED_NUMBER_TAIL.match(self.buffer, position) is not None
+            )
+
+        return False
+
+    def array(self) -> Iterator[Any]:
+        """Decode and consume the next JSON array, yielding its items one by one."""
+        self.expect("[")
+
+        if self.peek() == "]":
+            self.position += 1
+            return
+
+        while True:
+            yield self.value()
+
+            # Most of the time, the separator is already in the buffer
+            match = ITEM_SEPARATOR.match(self.buffer, self.position)
+
+            if match is not None:
+                self.position = match.end()
+
+                if match.group(1) == "]":
+                    return
+
+                continue
+
+            if self.peek() == "]":
+                self.position += 1
+                return
+
+            self.expect(",")
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """Yield, one by one, the items of the array stored under `key` in the top level
+    JSON object contained in `chunks`.
+
+    Parameters:
+    chunks: Iterable of bytes representing a JSON object, for instance
+            `response.iter_content(chunk_size)`
+    key   : Top level key of the array to iterate on
+
+    Only one item of the array is decoded at a time. Other top level values are
+    decoded and dropped. If `key` is not found, nothing is yielded.
+
+    Example:
+    --------
+    list(iter_json_array([b'{"a": 1, "data": [{"b"', b': 2}, 3]}'], "data")) == \
+        [{"b": 2}, 3]
+    """
+    for _, item in iter_json_arrays(chunks, {key}):
+        yield item
+
+
+def iter_json_arrays(
+    chunks: Iterable[bytes], keys: Collection[str], path: Sequence[str] = ()
+) -> Iterator[tuple[str, Any]]:
+    """Yield, one by one, the items of the arrays stored under `keys` in the JSON
+    object found along `path` in the top level JSON object contained in `chunks`.
+
+    Parameters:
+    chunks: Iterable of bytes representing a JSON object
+    keys  : Keys of the arrays to iterate on
+    path  : Keys of the nested objects leading to the arrays, from the top level
+            object
+
+    Yields `(key, item)` tuples, in the order of the JSON document. Only one item is
+    decoded at a time. Other values are decoded and dropped.
+
+    Example:
+    --------
+    list(
+        iter_json_arrays(
+            [b'{"data": {"a": [1], "b": 2, "c": [3, 4]}}'], {"a", "c"}, ["data"]
+        )
+    ) == [("a", 1), ("c", 3), ("c", 4)]
+    """
+    reader = _Reader(chunks)
+    yield from _iter_object_arrays(reader, keys, path)
+
+
+def _iter_object_arrays(
+    reader: _Reader, keys: Collection[str], path: Sequence[str]
+) -> Iterator[tuple[str, Any]]:
+    """Consume the JSON object at the reader position, yielding items of the arrays
+    stored under `keys` in the object found along `path`."""
+    reader.expect("{")
+
+    if reader.peek() == "}":
+        reader.position += 1
+        return
+
+    while True:
+        current_key = reader.value()
+        reader.expect(":")
+
+        if len(path) > 0 and current_key == path[0]:
+            yield from _iter_object_arrays(reader, keys, path[1:])
+        elif len(path) == 0 and current_key in keys:
+            for item in reader.array():
+                yield current_key, item
+        else:
+            reader.value()
+
+        if reader.peek() == "}":
+            reader.position += 1
+            return
+
+        reader.expect(",")
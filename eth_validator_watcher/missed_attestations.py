@@ -8,7 +8,8 @@ from eth_validator_watcher.models import BeaconType
 
 from .beacon import Beacon
 from .messengers import Messenger
-from .models import Validators
+from .registry import IndexToValidator
+from .store import ValidatorStore
 from .utils import LimitedDict
 
 print = functools.partial(print, flush=True)
@@ -29,6 +30,7 @@ def process_missed_attestations(
     beacon_type: BeaconType,
     epoch_to_index_to_validator_index: LimitedDict,
     epoch: int,
+    store: ValidatorStore | None = None,
 ) -> set[int]:
     """Process missed attestations.
 
@@ -40,27 +42,66 @@ def process_missed_attestations(
         outer value, inner key: validator indexes
         inner value           : validators
     epoch                        : Epoch where the missed attestations are checked
+    store                        : Store where liveness of validators is added, if
+                                   any
     """
     if epoch < 1:
         return set()
 
-    index_to_validator: dict[int, Validators.DataItem.Validator] = (
+    index_to_validator: IndexToValidator = (
         epoch_to_index_to_validator_index[epoch - 1]
         if epoch - 1 in epoch_to_index_to_validator_index
         else epoch_to_index_to_validator_index[epoch]
     )
 
+    dead_indexes = process_past_missed_attestations(
+        beacon, beacon_type, epoch - 1, index_to_validator, store=store
+    )
+
+    metric_missed_attestations_count.set(len(dead_indexes))
+
+    return dead_indexes
+
+
+def process_past_missed_attestations(
+    beacon: Beacon,
+    beacon_type: BeaconType,
+    epoch: int,
+    index_to_validator: IndexToValidator,
+    store: ValidatorStore | None = None,
+    warn_epoch_too_old: bool = True,
+) -> set[int]:
+    """Process missed attestations of a given epoch, without updating metrics.
+
+    Parameters:
+    beacon            : Beacon instance
+    beacon_type       : Beacon type
+    epoch             : Epoch of the attestations
+    index_to_validator: Validators which had to attest, per index
+    store             : Store where liveness of validators is added, if any
+    warn_epoch_too_old: See `Beacon.get_validators_liveness`
+
+    Returns indexes of validators which missed their attestation.
+    """
     validators_index = set(index_to_validator)
+
+    # Validators whose liveness cannot be retrieved are considered as live, but are
+    # not added to the store
     validators_liveness = beacon.get_validators_liveness(
-        beacon_type, epoch - 1, validators_index
+        beacon_type,
+        epoch,
+        validators_index,
+        assume_live=False,
+        warn_epoch_too_old=warn_epoch_too_old,
     )
 
+    if store is not None:
+        store.add_liveness(epoch, validators_liveness)
+
     dead_indexes = {
         index for index, liveness in validators_liveness.items() if not liveness
     }
 
-    metric_missed_attestations_count.set(len(dead_indexes))
-
     if len(dead_indexes) == 0:
         return set()
 
@@ -76,7 +117,7 @@ def process_missed_attestations(
     print(
         f"🙁 Our validator {short_first_pubkeys_str} and "
         f"{len(dead_indexes) - len(short_first_pubkeys)} more "
-        f"missed attestation at epoch {epoch - 1}"
+        f"missed attestation at epoch {epoch}"
     )
 
     return dead_indexes
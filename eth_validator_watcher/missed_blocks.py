@@ -1,12 +1,14 @@
 """Contains functions to handle missed block proposals detection on head"""
 
 import functools
+from itertools import groupby
 
 from prometheus_client import Counter
 
 from .beacon import Beacon, NoBlockError
 from .messengers import Messenger
-from .models import Block, BlockIdentierType
+from .lean_models import Block
+from .models import BlockIdentierType, Header
 from .utils import NB_SLOT_PER_EPOCH
 
 print = functools.partial(print, flush=True)
@@ -46,21 +48,9 @@ def process_missed_blocks_head(
     """
     missed = potential_block is None
     epoch = slot // slots_per_epoch
-    proposer_duties = beacon.get_proposer_duties(epoch)
 
     # Get proposer public key for this slot
-    proposer_duties_data = proposer_duties.data
-
-    # In `data` list, items seem to be ordered by slot.
-    # However, there is no specification for that, so it is wiser to
-    # iterate on the list
-    proposer_pubkey = next(
-        (
-            proposer_duty_data.pubkey
-            for proposer_duty_data in proposer_duties_data
-            if proposer_duty_data.slot == slot
-        )
-    )
+    proposer_pubkey, _ = beacon.get_proposer_schedule(epoch).proposer(slot)
 
     # Check if the validator that has to propose is ours
     is_our_validator = proposer_pubkey in our_pubkeys
@@ -115,82 +105,106 @@ def process_missed_blocks_finalized(
     messenger: Messenger | None,
     slots_per_epoch: int = NB_SLOT_PER_EPOCH,
     explorer_url: str | None = None,
+    last_finalized_header: Header | None = None,
 ) -> int:
     """Process missed block proposals detection at finalized
 
     Parameters:
-    beacon         : Beacon
-    potential_block: Potential block
-    slot           : Slot
-    our_pubkeys    : Set of our validators public keys
-    messenger      : Messenger instance
-    slots_per_epoch: Slots per epoch
-    explorer_url   : Beacon Explorer URL
+    beacon               : Beacon
+    potential_block      : Potential block
+    slot                 : Slot
+    our_pubkeys          : Set of our validators public keys
+    messenger            : Messenger instance
+    slots_per_epoch      : Slots per epoch
+    explorer_url         : Beacon Explorer URL
+    last_finalized_header: Header of the last finalized block, if already
+                           retrieved. If None, it is retrieved from the beacon.
 
     Returns the last finalized slot
     """
     assert last_processed_finalized_slot <= slot, "Last processed finalized slot > slot"
 
-    last_finalized_header = beacon.get_header(BlockIdentierType.FINALIZED)
+    if last_finalized_header is None:
+        last_finalized_header = beacon.get_header(BlockIdentierType.FINALIZED)
+
     last_finalized_slot = last_finalized_header.data.header.message.slot
     epoch_of_last_finalized_slot = last_finalized_slot // slots_per_epoch
 
     # Only to memoize it, in case of the BN does not serve this request for too old
     # epochs
-    beacon.get_proposer_duties(epoch_of_last_finalized_slot)
-
-    for slot_ in range(last_processed_finalized_slot + 1, last_finalized_slot + 1):
-        epoch = slot_ // slots_per_epoch
-        proposer_duties = beacon.get_proposer_duties(epoch)
-
-        # Get proposer public key for this slot
-        proposer_duties_data = proposer_duties.data
-
-        # In `data` list, items seem to be ordered by slot.
-        # However, there is no specification for that, so it is wiser to
-        # iterate on the list
-        proposer_pubkey = next(
-            (
-                proposer_duty_data.pubkey
-                for proposer_duty_data in proposer_duties_data
-                if proposer_duty_data.slot == slot_
-            )
-        )
-
-        # Check if the validator that has to propose is ours
-        is_our_validator = proposer_pubkey in our_pubkeys
+    beacon.get_proposer_schedule(epoch_of_last_finalized_slot)
+
+    process_missed_blocks_finalized_slots(
+        beacon,
+        range(last_processed_finalized_slot + 1, last_finalized_slot + 1),
+        our_pubkeys,
+        messenger,
+        slots_per_epoch=slots_per_epoch,
+        explorer_url=explorer_url,
+    )
 
-        if not is_our_validator:
-            continue
+    return last_finalized_slot
 
-        # Check if the block has been proposed
-        try:
-            beacon.get_header(slot_)
-        except NoBlockError:
-            short_proposer_pubkey = proposer_pubkey[:10]
 
-            message_console = (
-                f"❌ Our validator {short_proposer_pubkey} missed block at finalized "
-                f"at epoch {epoch} - slot {slot_} ❌"
-            )
+def process_missed_blocks_finalized_slots(
+    beacon: Beacon,
+    slots: range,
+    our_pubkeys: set[str],
+    messenger: Messenger | None,
+    slots_per_epoch: int = NB_SLOT_PER_EPOCH,
+    explorer_url: str | None = None,
+) -> None:
+    """Process missed block proposals detection for given finalized slots
 
-            print(message_console)
-
-            if messenger is not None:
-                proposer_pubkey_link = f"`{short_proposer_pubkey}`"
-                epoch_link = f"`{epoch}`"
-                slot_link = f"`{slot_}`"
-                if explorer_url:
-                    proposer_pubkey_link = f"[{short_proposer_pubkey}]({explorer_url}/validator/{proposer_pubkey})"
-                    epoch_link = f"[{epoch}]({explorer_url}/epoch/{epoch})"
-                    slot_link = f"[{slot_}]({explorer_url}/slot/{slot_})"
-                formatted_message = (
-                    f"❌ Our validator {proposer_pubkey_link} missed block at "
-                    f"finalized at epoch {epoch_link} - slot {slot_link} ❌"
+    Parameters:
+    beacon         : Beacon
+    slots          : Finalized slots
+    our_pubkeys    : Set of our validators public keys
+    messenger      : Messenger instance
+    slots_per_epoch: Slots per epoch
+    explorer_url   : Beacon Explorer URL
+    """
+    # Proposer schedules of old epochs may not stay cached, so they are retrieved
+    # once per epoch
+    for epoch, epoch_slots in groupby(slots, lambda slot_: slot_ // slots_per_epoch):
+        proposer_schedule = beacon.get_proposer_schedule(epoch)
+
+        for slot_ in epoch_slots:
+            # Get proposer public key for this slot
+            proposer_pubkey, _ = proposer_schedule.proposer(slot_)
+
+            # Check if the validator that has to propose is ours
+            is_our_validator = proposer_pubkey in our_pubkeys
+
+            if not is_our_validator:
+                continue
+
+            # Check if the block has been proposed
+            try:
+                beacon.get_header(slot_)
+            except NoBlockError:
+                short_proposer_pubkey = proposer_pubkey[:10]
+
+                message_console = (
+                    f"❌ Our validator {short_proposer_pubkey} missed block at "
+                    f"finalized at epoch {epoch} - slot {slot_} ❌"
                 )
 
-                messenger.send_message(formatted_message)
+                print(message_console)
 
-            metric_missed_block_proposals_finalized_count.inc()
+                if messenger is not None:
+                    proposer_pubkey_link = f"`{short_proposer_pubkey}`"
+                    epoch_link = f"`{epoch}`"
+                    slot_link = f"`{slot_}`"
+                    if explorer_url:
+                        proposer_pubkey_link = f"[{short_proposer_pubkey}]({explorer_url}/validator/{proposer_pubkey})"
+                        epoch_link = f"[{epoch}]({explorer_url}/epoch/{epoch})"
+                        slot_link = f"[{slot_}]({explorer_url}/slot/{slot_})"
+                    formatted_message = (
+                        f"❌ Our validator {proposer_pubkey_link} missed block at "
+                        f"finalized at epoch {epoch_link} - slot {slot_link} ❌"
+                    )
 
-    return last_finalized_slot
+                    messenger.send_message(formatted_message)
+
+                metric_missed_block_proposals_finalized_count.inc()
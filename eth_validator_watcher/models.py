@@ -106,6 +106,28 @@ class ProposerDuties(BaseModel):
     data: list[Data]
 
 
+class HeadEvent(BaseModel):
+    slot: int
+    block: str
+    state: str
+    epoch_transition: bool
+    previous_duty_dependent_root: str
+    current_duty_dependent_root: str
+
+
+class BlockEvent(BaseModel):
+    slot: int
+    block: str
+
+
+class ChainReorgEvent(BaseModel):
+    slot: int
+    depth: int
+    old_head_block: str
+    new_head_block: str
+    epoch: int
+
+
 class ValidatorsLivenessRequestLighthouse(BaseModel):
     indices: list[int]
     epoch: int
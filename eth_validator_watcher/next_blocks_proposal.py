@@ -31,17 +31,18 @@ def process_future_blocks_proposal(
     is_new_epoch: Is new epoch
     """
     epoch = slot // slots_per_epoch
-    proposers_duties_current_epoch = beacon.get_proposer_duties(epoch)
-    proposers_duties_next_epoch = beacon.get_proposer_duties(epoch + 1)
+    our_duties_current_epoch = beacon.get_proposer_schedule(epoch).our_duties(
+        our_pubkeys
+    )
 
-    concatenated_data = (
-        proposers_duties_current_epoch.data + proposers_duties_next_epoch.data
+    our_duties_next_epoch = beacon.get_proposer_schedule(epoch + 1).our_duties(
+        our_pubkeys
     )
 
     filtered = [
         item
-        for item in concatenated_data
-        if item.pubkey in our_pubkeys and item.slot >= slot
+        for item in our_duties_current_epoch + our_duties_next_epoch
+        if item.slot >= slot
     ]
 
     metric_future_block_proposals_count.set(len(filtered))
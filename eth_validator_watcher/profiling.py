@@ -0,0 +1,240 @@
+"""Contains the debug endpoints, served alongside Prometheus metrics: a sampling
+profiler and memory allocation snapshots."""
+
+import json
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from time import perf_counter, sleep
+from types import CodeType
+from typing import Any, Callable, Iterable
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from prometheus_client import make_wsgi_app
+from prometheus_client.exposition import ThreadingWSGIServer
+
+# Sampling interval of the profiler. At 100 Hz, a sample of a few threads costs a few
+# dozens of microseconds, so the profiled process is barely slowed down.
+SAMPLING_INTERVAL_SEC = 0.01
+
+DEFAULT_PROFILE_SEC = 10
+MAX_PROFILE_SEC = 300
+
+DEFAULT_MEMORY_TOP = 25
+
+# A stack is a tuple of frame names, from the thread (root) to the innermost frame
+Stack = tuple[str, ...]
+
+StartResponse = Callable[[str, list[tuple[str, str]]], Any]
+WSGIApp = Callable[[dict[str, Any], StartResponse], Iterable[bytes]]
+
+
+class _SilentHandler(WSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        """Do not log requests."""
+
+
+def sample_stacks(
+    duration_sec: float, interval_sec: float = SAMPLING_INTERVAL_SEC
+) -> Counter[Stack]:
+    """Sample stacks of all threads (except the calling one) during `duration_sec`.
+
+    Parameters:
+    duration_sec: Duration of the sampling, in seconds
+    interval_sec: Interval between two samples, in seconds
+
+    Returns the number of samples per stack.
+    """
+    own_thread_id = threading.get_ident()
+    thread_id_to_name: dict[int, str] = {}
+    code_to_name: dict[CodeType, str] = {}
+    stack_to_count: Counter[Stack] = Counter()
+
+    end = perf_counter() + duration_sec
+
+    while perf_counter() < end:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread_id:
+                continue
+
+            if thread_id not in thread_id_to_name:
+                thread_id_to_name = {
+                    thread.ident: thread.name
+                    for thread in threading.enumerate()
+                    if thread.ident is not None
+                }
+
+            names: list[str] = []
+            current = frame
+
+            while current is not None:
+                code = current.f_code
+
+                if (name := code_to_name.get(code)) is None:
+                    name = (
+                        f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})"
+                    )
+                    code_to_name[code] = name
+
+                names.append(name)
+                current = current.f_back
+
+            names.append(thread_id_to_name.get(thread_id, str(thread_id)))
+            stack_to_count[tuple(reversed(names))] += 1
+
+        sleep(interval_sec)
+
+    return stack_to_count
+
+
+def to_collapsed(stack_to_count: Counter[Stack]) -> str:
+    """Return stacks in the collapsed format, understood by `flamegraph.pl`,
+    speedscope and most flame graph tools."""
+    return "".join(
+        f"{';'.join(stack)} {count}\n" for stack, count in stack_to_count.items()
+    )
+
+
+def to_speedscope(
+    stack_to_count: Counter[Stack], interval_sec: float = SAMPLING_INTERVAL_SEC
+) -> dict[str, Any]:
+    """Return stacks in the speedscope file format (https://www.speedscope.app)."""
+    frame_to_index: dict[str, int] = {}
+
+    samples = [
+        [frame_to_index.setdefault(frame, len(frame_to_index)) for frame in stack]
+        for stack in stack_to_count
+    ]
+
+    weights = [count * interval_sec for count in stack_to_count.values()]
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "exporter": "eth-validator-watcher",
+        "shared": {"frames": [{"name": frame} for frame in frame_to_index]},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": "eth-validator-watcher",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+def memory_snapshot(top: int, group_by: str = "lineno") -> str:
+    """Return the `top` biggest memory allocations sources.
+
+    Parameters:
+    top     : Number of allocations sources to return
+    group_by: `lineno` or `filename`
+
+    Memory allocations are traced only once this function has been called for the
+    first time, so the first call only starts tracing. Set the `PYTHONTRACEMALLOC`
+    environment variable to trace allocations from the start of the watcher.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        return "Memory allocations tracing started, query again to get a snapshot.\n"
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+
+    statistics = snapshot.statistics(group_by)
+    traced_bytes, peak_bytes = tracemalloc.get_traced_memory()
+
+    lines = [
+        f"Traced: {traced_bytes / 2**20:.1f} MiB, peak: {peak_bytes / 2**20:.1f} MiB",
+        *(str(statistic) for statistic in statistics[:top]),
+    ]
+
+    return "\n".join(lines) + "\n"
+
+
+def make_debug_app(metrics_app: WSGIApp) -> WSGIApp:
+    """Return a WSGI application serving debug endpoints, and delegating other
+    requests to `metrics_app`.
+
+    Endpoints:
+    /debug/profile?seconds=N&format=collapsed|speedscope
+        Profile all threads during N seconds
+    /debug/memory?top=N&group_by=lineno|filename
+        Top N memory allocations sources
+    /debug/memory?stop=true
+        Stop tracing memory allocations
+    """
+
+    def app(environ: dict[str, Any], start_response: StartResponse) -> Iterable[bytes]:
+        path = environ.get("PATH_INFO", "")
+        params = {
+            key: values[-1]
+            for key, values in parse_qs(environ.get("QUERY_STRING", "")).items()
+        }
+
+        def respond(status: str, body: str, content_type: str) -> list[bytes]:
+            start_response(status, [("Content-Type", content_type)])
+            return [body.encode()]
+
+        try:
+            if path == "/debug/profile":
+                seconds = float(params.get("seconds", DEFAULT_PROFILE_SEC))
+                output_format = params.get("format", "collapsed")
+
+                if not 0 < seconds <= MAX_PROFILE_SEC:
+                    raise ValueError(f"seconds must be in ]0, {MAX_PROFILE_SEC}]")
+
+                if output_format not in {"collapsed", "speedscope"}:
+                    raise ValueError("format must be `collapsed` or `speedscope`")
+
+                stack_to_count = sample_stacks(seconds)
+
+                if output_format == "speedscope":
+                    body = json.dumps(to_speedscope(stack_to_count))
+                    return respond("200 OK", body, "application/json")
+
+                return respond("200 OK", to_collapsed(stack_to_count), "text/plain")
+
+            if path == "/debug/memory":
+                if params.get("stop") == "true":
+                    tracemalloc.stop()
+                    return respond("200 OK", "Memory tracing stopped.\n", "text/plain")
+
+                top = int(params.get("top", DEFAULT_MEMORY_TOP))
+                group_by = params.get("group_by", "lineno")
+
+                if group_by not in {"lineno", "filename"}:
+                    raise ValueError("group_by must be `lineno` or `filename`")
+
+                body = memory_snapshot(top, group_by)
+                return respond("200 OK", body, "text/plain")
+        except ValueError as error:
+            return respond("400 Bad Request", f"{error}\n", "text/plain")
+
+        return metrics_app(environ, start_response)
+
+    return app
+
+
+def start_debug_http_server(port: int, addr: str = "0.0.0.0") -> None:
+    """Start, as a daemon thread, an HTTP server serving Prometheus metrics and
+    debug endpoints.
+
+    Parameters:
+    port: Port to listen on
+    addr: Address to listen on
+    """
+    app = make_debug_app(make_wsgi_app())
+
+    server = make_server(
+        addr, port, app, ThreadingWSGIServer, handler_class=_SilentHandler
+    )
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
@@ -0,0 +1,58 @@
+"""Contains the ProposerSchedule class, proposer duties of an epoch indexed by slot."""
+
+from .models import ProposerDuties
+
+Duty = ProposerDuties.Data
+
+
+class ProposerSchedule:
+    """Proposer duties of an epoch, indexed by slot.
+
+    Built once per epoch (and dependent root) when proposer duties are retrieved, so
+    looking up the proposer of a slot is a dictionary hit instead of a scan of the
+    duties list.
+    """
+
+    def __init__(self, proposer_duties: ProposerDuties) -> None:
+        """Proposer schedule
+
+        Parameters:
+        proposer_duties: Proposer duties of the epoch
+        """
+        self.dependent_root = proposer_duties.dependent_root
+
+        # In `data` list, items seem to be ordered by slot.
+        # However, there is no specification for that, so we sort them.
+        self.duties = sorted(proposer_duties.data, key=lambda duty: duty.slot)
+        self.__slot_to_duty = {duty.slot: duty for duty in self.duties}
+
+        self.__our_pubkeys: set[str] | None = None
+        self.__our_duties: list[Duty] = []
+
+    def __contains__(self, slot: object) -> bool:
+        return slot in self.__slot_to_duty
+
+    def proposer(self, slot: int) -> tuple[str, int]:
+        """Return the `(pubkey, validator_index)` of the proposer of slot `slot`.
+
+        Raises `KeyError` if `slot` is not part of this schedule.
+        """
+        duty = self.__slot_to_duty[slot]
+        return duty.pubkey, duty.validator_index
+
+    def our_duties(self, our_pubkeys: set[str]) -> list[Duty]:
+        """Return duties of our validators, sorted by slot.
+
+        Parameters:
+        our_pubkeys: Set of our validators public keys
+
+        The result is memoized as long as the same `our_pubkeys` set is given.
+        """
+        if our_pubkeys is not self.__our_pubkeys:
+            self.__our_duties = [
+                duty for duty in self.duties if duty.pubkey in our_pubkeys
+            ]
+
+            self.__our_pubkeys = our_pubkeys
+
+        return self.__our_duties
@@ -0,0 +1,82 @@
+"""Contains the RegistryRefresher class, which keeps the network and our validators
+registries up to date."""
+
+from typing import Tuple
+
+from .beacon import Beacon
+from .registry import ValidatorRegistry
+
+
+class RegistryRefresher:
+    """Incremental validators registry refresher.
+
+    The full network registry is only retrieved every `full_refresh_epochs` epochs.
+    In between, only our validators are retrieved, by index when the index of the
+    public key is already known, and by public key otherwise.
+    """
+
+    def __init__(self, beacon: Beacon, full_refresh_epochs: int = 1) -> None:
+        """Registry refresher
+
+        Parameters:
+        beacon             : Beacon instance
+        full_refresh_epochs: Number of epochs between two full network registry
+                             retrievals. With `1`, the full registry is retrieved at
+                             every epoch.
+        """
+        assert full_refresh_epochs >= 1, "full_refresh_epochs must be positive"
+
+        self.__beacon = beacon
+        self.__full_refresh_epochs = full_refresh_epochs
+        self.__net_registry: ValidatorRegistry | None = None
+        self.__last_full_refresh_epoch: int | None = None
+        self.__pubkey_to_index: dict[str, int] = {}
+
+    def refresh(
+        self, epoch: int, our_pubkeys: set[str]
+    ) -> Tuple[ValidatorRegistry, ValidatorRegistry]:
+        """Refresh registries.
+
+        Parameters:
+        epoch      : Current epoch
+        our_pubkeys: Set of our validators public keys
+
+        Returns the network registry (which may be up to `full_refresh_epochs - 1`
+        epochs old) and our (always up to date) registry.
+        """
+        should_refresh_network = (
+            self.__net_registry is None
+            or self.__last_full_refresh_epoch is None
+            or epoch - self.__last_full_refresh_epoch >= self.__full_refresh_epochs
+        )
+
+        if should_refresh_network:
+            net_registry = self.__beacon.get_validator_registry(epoch=epoch)
+            our_registry = net_registry.select_pubkeys(our_pubkeys)
+
+            self.__net_registry = net_registry
+            self.__last_full_refresh_epoch = epoch
+        else:
+            assert self.__net_registry is not None
+            net_registry = self.__net_registry
+
+            known_indexes = sorted(
+                self.__pubkey_to_index[pubkey]
+                for pubkey in our_pubkeys
+                if pubkey in self.__pubkey_to_index
+            )
+
+            unknown_pubkeys = sorted(
+                pubkey for pubkey in our_pubkeys if pubkey not in self.__pubkey_to_index
+            )
+
+            our_registry = self.__beacon.get_validator_registry(
+                [*known_indexes, *unknown_pubkeys], epoch
+            )
+
+        self.__pubkey_to_index = {
+            our_registry.pubkey(row): our_registry.indexes[row]
+            for row in range(len(our_registry))
+        }
+
+        return net_registry, our_registry
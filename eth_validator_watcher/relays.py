@@ -4,9 +4,11 @@ from time import sleep
 
 from prometheus_client import Counter
 from requests import Session, codes
-from requests.adapters import HTTPAdapter, Retry
+from requests.adapters import Retry
 from requests.exceptions import ConnectionError
 
+from .archive import ResponseArchive, make_adapter
+
 MAX_TRIALS = 5
 WAIT_SEC = 0.5
 
@@ -19,21 +21,23 @@ metric_bad_relay_count = Counter(
 class Relays:
     """Relays abstraction."""
 
-    def __init__(self, urls: list[str]) -> None:
+    def __init__(self, urls: list[str], archive: ResponseArchive | None = None) -> None:
         """Relays
 
         Parameters:
-        urls: URLs where the relays can be reached
+        urls   : URLs where the relays can be reached
+        archive: Archive responses are recorded to (or served from), if any
         """
         self.__urls = urls
         self.__http = Session()
 
-        adapter = HTTPAdapter(
-            max_retries=Retry(
+        adapter = make_adapter(
+            archive,
+            Retry(
                 backoff_factor=0.5,
                 total=3,
                 status_forcelist=[codes.not_found],
-            )
+            ),
         )
 
         self.__http.mount("http://", adapter)
@@ -1,18 +1,27 @@
 """Contains functions to handle rewards calculation"""
 
-from typing import Tuple
+from array import array
+from itertools import compress
+from operator import eq
+from typing import Iterator, Sequence, Tuple
 
 from prometheus_client import Counter, Gauge
 
 from eth_validator_watcher.utils import LimitedDict
 
 from .beacon import Beacon
-from .models import BeaconType, Validators
+from .lean_models import Rewards, TotalRewards
+from .models import BeaconType
+from .registry import IndexToValidator, ValidatorsView
+from .store import ValidatorStore
 
-Validator = Validators.DataItem.Validator
+IdealReward = Rewards.Data.IdealReward
 
-Reward = Tuple[int, int, int]  # source, target, head
-AreIdeal = Tuple[bool, bool, bool]  # source, target, head
+# Ideal rewards, actual rewards, and whether actual rewards are ideal (one byte per
+# validator), of a duty
+DutyColumns = Tuple[array, array, bytes]
+
+DUTIES = ("source", "target", "head")
 
 # Network validators
 # ------------------
@@ -88,16 +97,16 @@ AreIdeal = Tuple[bool, bool, bool]  # source, target, head
 
 
 def _log(
-    pubkeys: Tuple[str],
-    are_ideal: Tuple[bool],
+    pubkeys: Sequence[str],
+    are_ideal: bytes,
     suboptimal_rate: float,
     epoch: int,
     picto: str,
     label: str,
 ) -> None:
-    not_perfect_pubkeys = {
-        pubkey for (pubkey, perfect) in zip(pubkeys, are_ideal) if not perfect
-    }
+    not_perfect_pubkeys = set(
+        compress(pubkeys, (not is_ideal for is_ideal in are_ideal))
+    )
 
     if len(not_perfect_pubkeys) > 0:
         first_not_perfect_pubkeys = sorted(not_perfect_pubkeys)[:5]
@@ -123,6 +132,7 @@ def process_rewards(
     epoch: int,
     net_epoch_to_index_to_validator: LimitedDict,
     our_epoch_to_index_to_validator: LimitedDict,
+    store: ValidatorStore | None = None,
 ) -> None:
     """Process rewards for given epoch and validators
 
@@ -133,13 +143,21 @@ def process_rewards(
 
         net_epoch_to_index_to_validator : Limited dictionary with:
             outer key             : epoch
-            outer value, inner key: validator indexes
-            inner value           : validators
+            outer value           : dictionary or registry view with:
+                inner key         : validator indexes
+                inner value       : validators
 
         our_epoch_to_index_to_validator : Limited dictionary with:
             outer key             : epoch
-            outer value, inner key: validator indexes
-            inner value           : validators
+            outer value           : dictionary or registry view with:
+                inner key         : validator indexes
+                inner value       : validators
+
+        store (ValidatorStore | None): Store where rewards of our validators are
+                                       added, if any
+
+    Rewards of the whole network are retrieved once, as columns. Rewards of our
+    validators are selected from them.
     """
 
     if epoch < 2:
@@ -161,50 +179,33 @@ def process_rewards(
         return
 
     data = beacon.get_rewards(beacon_type, epoch - 2).data
+    total_rewards = TotalRewards.from_items(data.total_rewards)
 
-    effective_balance_to_ideal_reward: dict[int, Reward] = {
-        reward.effective_balance: (reward.source, reward.target, reward.head)
-        for reward in data.ideal_rewards
-    }
-
-    index_to_actual_reward: dict[int, Reward] = {
-        reward.validator_index: (reward.source, reward.target, reward.head)
-        for reward in data.total_rewards
-    }
-
-    items = [
-        _process_validator(
-            validator.pubkey,
-            effective_balance_to_ideal_reward[validator.effective_balance],
-            index_to_actual_reward[index],
-        )
-        for index, validator in net_index_to_validator.items()
-        if index in index_to_actual_reward
-    ]
-
-    unzipped: Tuple[
-        Tuple[str], Tuple[Reward], Tuple[Reward], Tuple[AreIdeal]
-    ] = zip(  # type:ignore
-        *items
-    )
-
-    _, ideal_rewards, actual_rewards, ideals = unzipped
+    index_to_row = _index_to_row(total_rewards)
 
-    ideal_sources, ideal_targets, ideal_heads = zip(*ideal_rewards)
-    actual_sources, actual_targets, actual_heads = zip(*actual_rewards)
-    are_sources_ideal, are_targets_ideal, are_heads_ideal = zip(*ideals)
+    _, net_duties = _join(
+        net_index_to_validator, index_to_row, total_rewards, data.ideal_rewards
+    )
 
-    total_ideal_sources = sum(ideal_sources)
-    total_ideal_targets = sum(ideal_targets)
-    total_ideal_heads = sum(ideal_heads)
+    (
+        (ideal_sources, actual_sources, are_sources_ideal),
+        (
+            ideal_targets,
+            actual_targets,
+            are_targets_ideal,
+        ),
+        (ideal_heads, actual_heads, are_heads_ideal),
+    ) = net_duties
+
+    if len(are_sources_ideal) == 0:
+        return
 
-    metric_net_ideal_sources_count.inc(total_ideal_sources)
-    metric_net_ideal_targets_count.inc(total_ideal_targets)
-    metric_net_ideal_heads_count.inc(total_ideal_heads)
+    metric_net_ideal_sources_count.inc(sum(ideal_sources))
+    metric_net_ideal_targets_count.inc(sum(ideal_targets))
+    metric_net_ideal_heads_count.inc(sum(ideal_heads))
 
     total_actual_sources = sum(actual_sources)
     total_actual_targets = sum(actual_targets)
-    total_actual_heads = sum(actual_heads)
 
     (
         metric_net_actual_pos_sources_count
@@ -218,15 +219,11 @@ def process_rewards(
         else metric_net_actual_neg_targets_count
     ).inc(abs(total_actual_targets))
 
-    metric_net_actual_heads_count.inc(total_actual_heads)
+    metric_net_actual_heads_count.inc(sum(actual_heads))
 
-    suboptimal_sources_rate = 1 - sum(are_sources_ideal) / len(are_sources_ideal)
-    suboptimal_targets_rate = 1 - sum(are_targets_ideal) / len(are_targets_ideal)
-    suboptimal_heads_rate = 1 - sum(are_heads_ideal) / len(are_heads_ideal)
-
-    metric_net_suboptimal_sources_rate_gauge.set(suboptimal_sources_rate)
-    metric_net_suboptimal_targets_rate_gauge.set(suboptimal_targets_rate)
-    metric_net_suboptimal_heads_rate_gauge.set(suboptimal_heads_rate)
+    metric_net_suboptimal_sources_rate_gauge.set(_suboptimal_rate(are_sources_ideal))
+    metric_net_suboptimal_targets_rate_gauge.set(_suboptimal_rate(are_targets_ideal))
+    metric_net_suboptimal_heads_rate_gauge.set(_suboptimal_rate(are_heads_ideal))
 
     # Our validators
     # --------------
@@ -240,51 +237,32 @@ def process_rewards(
         )
     )
 
-    our_indexes = set(our_index_to_validator)
-
-    if len(our_indexes) == 0:
+    if len(our_index_to_validator) == 0:
         return
 
-    data = beacon.get_rewards(beacon_type, epoch - 2, our_indexes).data
-
-    effective_balance_to_ideal_reward = {
-        reward.effective_balance: (reward.source, reward.target, reward.head)
-        for reward in data.ideal_rewards
-    }
-
-    index_to_actual_reward = {
-        reward.validator_index: (reward.source, reward.target, reward.head)
-        for reward in data.total_rewards
-    }
-
-    items = [
-        _process_validator(
-            validator.pubkey,
-            effective_balance_to_ideal_reward[validator.effective_balance],
-            index_to_actual_reward[index],
-        )
-        for index, validator in our_index_to_validator.items()
-    ]
-
-    unzipped = zip(*items)  # type: ignore
-
-    pubkeys, ideal_rewards, actual_rewards, ideals = unzipped
+    our_indexes, our_duties = _join(
+        our_index_to_validator, index_to_row, total_rewards, data.ideal_rewards
+    )
 
-    ideal_sources, ideal_targets, ideal_heads = zip(*ideal_rewards)
-    actual_sources, actual_targets, actual_heads = zip(*actual_rewards)
-    are_sources_ideal, are_targets_ideal, are_heads_ideal = zip(*ideals)
+    (
+        (ideal_sources, actual_sources, are_sources_ideal),
+        (
+            ideal_targets,
+            actual_targets,
+            are_targets_ideal,
+        ),
+        (ideal_heads, actual_heads, are_heads_ideal),
+    ) = our_duties
 
-    total_ideal_sources = sum(ideal_sources)
-    total_ideal_targets = sum(ideal_targets)
-    total_ideal_heads = sum(ideal_heads)
+    if len(our_indexes) == 0:
+        return
 
-    metric_our_ideal_sources_count.inc(total_ideal_sources)
-    metric_our_ideal_targets_count.inc(total_ideal_targets)
-    metric_our_ideal_heads_count.inc(total_ideal_heads)
+    metric_our_ideal_sources_count.inc(sum(ideal_sources))
+    metric_our_ideal_targets_count.inc(sum(ideal_targets))
+    metric_our_ideal_heads_count.inc(sum(ideal_heads))
 
     total_actual_sources = sum(actual_sources)
     total_actual_targets = sum(actual_targets)
-    total_actual_heads = sum(actual_heads)
 
     (
         metric_our_actual_pos_sources_count
@@ -298,33 +276,165 @@ def process_rewards(
         else metric_our_actual_neg_targets_count
     ).inc(abs(total_actual_targets))
 
-    metric_our_actual_heads_count.inc(total_actual_heads)
+    metric_our_actual_heads_count.inc(sum(actual_heads))
 
-    suboptimal_sources_rate = 1 - sum(are_sources_ideal) / len(are_sources_ideal)
-    suboptimal_targets_rate = 1 - sum(are_targets_ideal) / len(are_targets_ideal)
-    suboptimal_heads_rate = 1 - sum(are_heads_ideal) / len(are_heads_ideal)
+    suboptimal_sources_rate = _suboptimal_rate(are_sources_ideal)
+    suboptimal_targets_rate = _suboptimal_rate(are_targets_ideal)
+    suboptimal_heads_rate = _suboptimal_rate(are_heads_ideal)
 
     metric_our_suboptimal_sources_rate_gauge.set(suboptimal_sources_rate)
     metric_our_suboptimal_targets_rate_gauge.set(suboptimal_targets_rate)
     metric_our_suboptimal_heads_rate_gauge.set(suboptimal_heads_rate)
 
+    if store is not None:
+        store.add_rewards(
+            epoch - 2,
+            our_indexes,
+            (ideal_sources, ideal_targets, ideal_heads),
+            (actual_sources, actual_targets, actual_heads),
+        )
+
+    pubkeys = [our_index_to_validator[index].pubkey for index in our_indexes]
+
     _log(pubkeys, are_sources_ideal, suboptimal_sources_rate, epoch, "🚰", "source")
     _log(pubkeys, are_targets_ideal, suboptimal_targets_rate, epoch, "🎯", "target")
     _log(pubkeys, are_heads_ideal, suboptimal_heads_rate, epoch, "👤", "head ")
 
 
-def _process_validator(
-    pubkey: str,
-    ideal_reward: Reward,
-    actual_reward: Reward,
-) -> Tuple[str, Reward, Reward, AreIdeal]:
-    (ideal_source_reward, ideal_target_reward, ideal_head_reward) = ideal_reward
-    (actual_source_reward, actual_target_reward, actual_head_reward) = actual_reward
+def _effective_balances(index_to_validator: IndexToValidator) -> Iterator[int]:
+    """Iterate over effective balances of validators, in the iteration order of
+    `index_to_validator`. Registry views are read column-wise."""
+    if isinstance(index_to_validator, ValidatorsView):
+        effective_balances = index_to_validator.registry.effective_balances
+        return map(effective_balances.__getitem__, index_to_validator.rows())
+
+    return (validator.effective_balance for validator in index_to_validator.values())
+
+
+def _index_to_row(total_rewards: TotalRewards) -> range | dict[int, int]:
+    """Return the row of each validator in `total_rewards`.
+
+    Rewards of the whole network are usually sorted by validator index, without any
+    gap: rows are then indexes, and no dictionary is built.
+    """
+    rows = range(len(total_rewards))
+
+    if total_rewards.validator_indexes == array("Q", rows):
+        return rows
+
+    return dict(zip(total_rewards.validator_indexes, rows))
+
+
+def _join(
+    index_to_validator: IndexToValidator,
+    index_to_row: range | dict[int, int],
+    total_rewards: TotalRewards,
+    ideal_rewards: list[IdealReward],
+) -> Tuple[list[int], list[DutyColumns]]:
+    """Join actual rewards of validators with ideal rewards of their effective
+    balance. Validators without actual rewards are ignored.
+
+    Parameters:
+    index_to_validator: Validators
+    index_to_row      : Row of each validator in `total_rewards`
+    total_rewards     : Actual rewards
+    ideal_rewards     : Ideal rewards, per effective balance
 
-    are_ideal = (
-        actual_source_reward == ideal_source_reward,
-        actual_target_reward == ideal_target_reward,
-        actual_head_reward == ideal_head_reward,
+    Return indexes of validators having actual rewards, and for each duty of
+    `DUTIES` their ideal rewards, actual rewards and whether they are ideal.
+    """
+    indexes = list(index_to_validator)
+    have_rewards = bytes(map(index_to_row.__contains__, indexes))
+    indexes_with_rewards = list(compress(indexes, have_rewards))
+    rows = list(map(index_to_row.__getitem__, indexes_with_rewards))
+
+    effective_balances = list(
+        compress(_effective_balances(index_to_validator), have_rewards)
+    )
+
+    # If all validators have rewards, in the same order, columns are used as is
+    are_all_rows = len(rows) == len(total_rewards) and rows == list(
+        range(len(total_rewards))
+    )
+
+    duties: list[DutyColumns] = []
+
+    for duty in DUTIES:
+        effective_balance_to_ideal_reward = {
+            reward.effective_balance: getattr(reward, duty) for reward in ideal_rewards
+        }
+
+        ideal = array(
+            "q", map(effective_balance_to_ideal_reward.__getitem__, effective_balances)
+        )
+
+        column: array = getattr(total_rewards, f"{duty}s")
+        actual = column if are_all_rows else array("q", map(column.__getitem__, rows))
+
+        duties.append((ideal, actual, bytes(map(eq, actual, ideal))))
+
+    return indexes_with_rewards, duties
+
+
+def _suboptimal_rate(are_ideal: bytes) -> float:
+    return 1 - are_ideal.count(1) / len(are_ideal)
+
+
+def process_past_rewards(
+    beacon: Beacon,
+    beacon_type: BeaconType,
+    epoch: int,
+    our_index_to_validator: IndexToValidator,
+    store: ValidatorStore | None = None,
+) -> None:
+    """Process rewards of our validators for a given epoch, without updating metrics
+
+    Parameters:
+        beacon (Beacon): Beacon object
+        beacon_type (BeaconType): Beacon type
+        epoch (int): Epoch of the rewards
+        our_index_to_validator (IndexToValidator): Our validators, per index
+        store (ValidatorStore | None): Store where rewards of our validators are
+                                       added, if any
+
+    Unlike `process_rewards`, only rewards of our validators are retrieved.
+    """
+    if len(our_index_to_validator) == 0:
+        return
+
+    data = beacon.get_rewards(beacon_type, epoch, set(our_index_to_validator)).data
+    total_rewards = TotalRewards.from_items(data.total_rewards)
+
+    our_indexes, our_duties = _join(
+        our_index_to_validator,
+        _index_to_row(total_rewards),
+        total_rewards,
+        data.ideal_rewards,
     )
 
-    return pubkey, ideal_reward, actual_reward, are_ideal
+    if len(our_indexes) == 0:
+        return
+
+    (
+        (ideal_sources, actual_sources, are_sources_ideal),
+        (ideal_targets, actual_targets, are_targets_ideal),
+        (ideal_heads, actual_heads, are_heads_ideal),
+    ) = our_duties
+
+    if store is not None:
+        store.add_rewards(
+            epoch,
+            our_indexes,
+            (ideal_sources, ideal_targets, ideal_heads),
+            (actual_sources, actual_targets, actual_heads),
+        )
+
+    pubkeys = [our_index_to_validator[index].pubkey for index in our_indexes]
+
+    # Rewards of epoch `epoch` are processed at epoch `epoch + 2`
+    for are_ideal, picto, label in (
+        (are_sources_ideal, "🚰", "source"),
+        (are_targets_ideal, "🎯", "target"),
+        (are_heads_ideal, "👤", "head "),
+    ):
+        _log(pubkeys, are_ideal, _suboptimal_rate(are_ideal), epoch + 2, picto, label)
@@ -0,0 +1,66 @@
+"""Contains the EpochPipeline class, which runs epoch level stages in the background
+of the slot loop."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+# Number of epoch stages results kept
+MAX_EPOCHS = 3
+
+
+class EpochPipeline(Generic[T]):
+    """Epoch level stages pipeline.
+
+    Heavy epoch level stages (registry retrieval, exited and slashed validators
+    detection, ...) are submitted by the slot loop at the beginning of each epoch, and
+    run one after the other on a single background worker. Meanwhile, the slot loop
+    keeps processing slots with the last published result, and only waits for the
+    result of a given epoch when it really needs it.
+
+    A stage result is published atomically: it is either not available at all, or
+    fully computed.
+    """
+
+    def __init__(self) -> None:
+        self.__executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="epoch-pipeline"
+        )
+
+        self.__epoch_to_future: dict[int, Future[T]] = {}
+
+    def submit(
+        self, epoch: int, function: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> None:
+        """Submit the stage of epoch `epoch`.
+
+        Parameters:
+        epoch   : Epoch the stage corresponds to
+        function: Function to run in the background
+        args    : Positional arguments of `function`
+        kwargs  : Keyword arguments of `function`
+        """
+        self.__epoch_to_future[epoch] = self.__executor.submit(
+            function, *args, **kwargs
+        )
+
+        for old_epoch in sorted(self.__epoch_to_future)[:-MAX_EPOCHS]:
+            self.__epoch_to_future.pop(old_epoch)
+
+    def is_ready(self, epoch: int) -> bool:
+        """Return `True` if the stage of epoch `epoch` is done (or failed)."""
+        future = self.__epoch_to_future.get(epoch)
+        return future is not None and future.done()
+
+    def get(self, epoch: int, timeout: float | None = None) -> T:
+        """Return the result of the stage of epoch `epoch`, waiting for it if needed.
+
+        If the stage raised an exception, this exception is raised.
+        If no stage was submitted for this epoch, `KeyError` is raised.
+        """
+        return self.__epoch_to_future[epoch].result(timeout=timeout)
+
+    def shutdown(self) -> None:
+        """Wait for all submitted stages, and stop the background worker."""
+        self.__executor.shutdown(wait=True)
@@ -3,7 +3,7 @@ validators."""
 from prometheus_client import Gauge
 
 from .messengers import Messenger
-from .models import Validators
+from .registry import IndexToValidator
 
 metric_our_slashed_validators_count = Gauge(
     "our_slashed_validators_count",
@@ -35,18 +35,36 @@ class SlashedValidators:
         self.__messenger = messenger
         self.__explorer_url = explorer_url
 
+    @property
+    def total_exited_slashed_indexes(self) -> set[int] | None:
+        """Indexes of the network exited slashed validators, as of the last
+        processing. None if not processed yet."""
+        return self.__total_exited_slashed_indexes
+
+    @total_exited_slashed_indexes.setter
+    def total_exited_slashed_indexes(self, indexes: set[int] | None) -> None:
+        self.__total_exited_slashed_indexes = indexes
+
+    @property
+    def our_exited_slashed_indexes(self) -> set[int] | None:
+        """Indexes of our exited slashed validators, as of the last processing.
+        None if not processed yet."""
+        return self.__our_exited_slashed_indexes
+
+    @our_exited_slashed_indexes.setter
+    def our_exited_slashed_indexes(self, indexes: set[int] | None) -> None:
+        self.__our_exited_slashed_indexes = indexes
+
     def process(
         self,
-        total_exited_slashed_index_to_validator: dict[
-            int, Validators.DataItem.Validator
-        ],
-        our_exited_slashed_index_to_validator: dict[int, Validators.DataItem.Validator],
-        total_withdrawal_index_to_validator: dict[int, Validators.DataItem.Validator],
-        our_withdrawal_index_to_validator: dict[int, Validators.DataItem.Validator],
+        total_exited_slashed_index_to_validator: IndexToValidator,
+        our_exited_slashed_index_to_validator: IndexToValidator,
+        total_withdrawal_index_to_validator: IndexToValidator,
+        our_withdrawal_index_to_validator: IndexToValidator,
     ) -> None:
         """Process slashed validators.
 
-        Parameters:
+        Parameters (dictionaries or registry views):
         total_exited_slashed_index_to_validator: Dictionary with:
             key  : total exited validator index
             value: validator data corresponding to the validator index
@@ -0,0 +1,137 @@
+"""Contains a decoder of SSZ encoded signed beacon blocks, reading only the fields
+used by the watcher (see `lean_models.Block`).
+
+See https://github.com/ethereum/consensus-specs/blob/dev/ssz/simple-serialize.md
+"""
+
+from struct import Struct, error
+
+from .lean_models import Attestation, Block, Body
+
+# Media type of SSZ encoded responses
+SSZ_MEDIA_TYPE = "application/octet-stream"
+
+# Forks whose block layout is known by the decoder. Blocks of previous forks do not
+# have any execution payload.
+SSZ_BLOCK_VERSIONS = {"bellatrix", "capella", "deneb", "electra", "fulu"}
+
+UINT32 = Struct("<I")
+UINT64 = Struct("<Q")
+
+# Offsets of fields in the fixed size part of containers:
+# SignedBeaconBlock: message (offset), signature
+# BeaconBlock      : slot, proposer_index, parent_root, state_root, body (offset)
+# BeaconBlockBody  : randao_reveal, eth1_data, graffiti, proposer_slashings,
+#                    attester_slashings, attestations, deposits, voluntary_exits,
+#                    sync_aggregate, execution_payload...
+# Attestation      : aggregation_bits (offset), data (slot, index...), ...
+# ExecutionPayload : parent_hash, fee_recipient, state_root, receipts_root,
+#                    logs_bloom, prev_randao, block_number, gas_limit, gas_used,
+#                    timestamp, extra_data (offset), base_fee_per_gas, block_hash...
+BLOCK_SLOT_OFFSET = 0
+BLOCK_PROPOSER_INDEX_OFFSET = 8
+BLOCK_BODY_OFFSET = 80
+BODY_ATTESTATIONS_OFFSET = 208
+BODY_DEPOSITS_OFFSET = 212
+BODY_EXECUTION_PAYLOAD_OFFSET = 380
+ATTESTATION_SLOT_OFFSET = 4
+ATTESTATION_INDEX_OFFSET = 12
+PAYLOAD_FEE_RECIPIENT_OFFSET = 32
+PAYLOAD_BLOCK_HASH_OFFSET = 472
+
+ADDRESS_SIZE = 20
+HASH_SIZE = 32
+
+
+def _hex(data: memoryview) -> str:
+    return "0x" + data.hex()
+
+
+def _attestations(data: memoryview) -> list[Attestation]:
+    """Decode a list of attestations, only reading aggregation bits, slot and
+    committee index."""
+    if len(data) == 0:
+        return []
+
+    # Attestations have a variable size: the list starts with their offsets
+    nb_attestations = UINT32.unpack_from(data, 0)[0] // 4
+
+    offsets = [
+        UINT32.unpack_from(data, 4 * position)[0] for position in range(nb_attestations)
+    ]
+
+    result: list[Attestation] = []
+
+    for start, end in zip(offsets, offsets[1:] + [len(data)]):
+        attestation = data[start:end]
+        bits_offset = UINT32.unpack_from(attestation, 0)[0]
+
+        result.append(
+            Attestation(
+                aggregation_bits=_hex(attestation[bits_offset:]),
+                data=Attestation.Data(
+                    slot=UINT64.unpack_from(attestation, ATTESTATION_SLOT_OFFSET)[0],
+                    index=UINT64.unpack_from(attestation, ATTESTATION_INDEX_OFFSET)[0],
+                ),
+            )
+        )
+
+    return result
+
+
+def decode_block(content: bytes, version: str) -> Block:
+    """Decode a SSZ encoded signed beacon block.
+
+    Parameters:
+    content: SSZ encoded signed beacon block
+    version: Fork of the block (`Eth-Consensus-Version` response header), in
+             `SSZ_BLOCK_VERSIONS`
+
+    Only fields of `Block` are decoded, without copying the other ones. Raises
+    `ValueError` if the block is malformed.
+    """
+    if version not in SSZ_BLOCK_VERSIONS:
+        raise ValueError(f"Unsupported block version: {version}")
+
+    data = memoryview(content)
+
+    try:
+        message = data[UINT32.unpack_from(data, 0)[0] :]
+        body = message[UINT32.unpack_from(message, BLOCK_BODY_OFFSET)[0] :]
+
+        attestations_start = UINT32.unpack_from(body, BODY_ATTESTATIONS_OFFSET)[0]
+        attestations_end = UINT32.unpack_from(body, BODY_DEPOSITS_OFFSET)[0]
+
+        payload = body[UINT32.unpack_from(body, BODY_EXECUTION_PAYLOAD_OFFSET)[0] :]
+        fee_recipient = payload[
+            PAYLOAD_FEE_RECIPIENT_OFFSET : PAYLOAD_FEE_RECIPIENT_OFFSET + ADDRESS_SIZE
+        ]
+
+        block_hash = payload[
+            PAYLOAD_BLOCK_HASH_OFFSET : PAYLOAD_BLOCK_HASH_OFFSET + HASH_SIZE
+        ]
+
+        if len(block_hash) != HASH_SIZE:
+            raise ValueError("Truncated execution payload")
+
+        return Block(
+            data=Block.Data(
+                message=Block.Data.Message(
+                    slot=UINT64.unpack_from(message, BLOCK_SLOT_OFFSET)[0],
+                    proposer_index=UINT64.unpack_from(
+                        message, BLOCK_PROPOSER_INDEX_OFFSET
+                    )[0],
+                    body=Body(
+                        attestations=_attestations(
+                            body[attestations_start:attestations_end]
+                        ),
+                        execution_payload=Body.ExecutionPayload(
+                            fee_recipient=_hex(fee_recipient),
+                            block_hash=_hex(block_hash),
+                        ),
+                    ),
+                )
+            )
+        )
+    except error as e:
+        raise ValueError(f"Malformed SSZ block: {e}") from e
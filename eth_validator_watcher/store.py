@@ -0,0 +1,359 @@
+"""Contains the ValidatorStore class, an embedded time series store of the per epoch
+performance of our validators."""
+
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, NamedTuple, Sequence
+
+# Number of epochs kept by default (around one day)
+DEFAULT_RETENTION_EPOCHS = 225
+
+# One row per validator and epoch. Rows are stored in epoch order, so writes are
+# appends and old epochs are pruned from the start of the table. The validator
+# index is the compact index used to read the history of a validator.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validator_epochs (
+    validator_index INTEGER NOT NULL,
+    epoch INTEGER NOT NULL,
+    ideal_source INTEGER,
+    ideal_target INTEGER,
+    ideal_head INTEGER,
+    actual_source INTEGER,
+    actual_target INTEGER,
+    actual_head INTEGER,
+    is_live INTEGER,
+    is_optimal_inclusion INTEGER,
+    inclusion_delay INTEGER,
+    PRIMARY KEY (epoch, validator_index)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS validator_epochs_validator_index
+ON validator_epochs (validator_index, epoch);
+
+CREATE TABLE IF NOT EXISTS validator_totals (
+    validator_index INTEGER PRIMARY KEY,
+    missed_reward INTEGER NOT NULL,
+    missed_attestations INTEGER NOT NULL,
+    suboptimal_inclusions INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS validator_totals_missed_reward
+ON validator_totals (missed_reward, missed_attestations);
+
+CREATE TEMP TABLE IF NOT EXISTS written (validator_index INTEGER PRIMARY KEY);
+"""
+
+# Per validator aggregates of rows. `NULL` values (not known yet) are ignored.
+AGGREGATES = """
+    validator_index,
+    COALESCE(
+        SUM(
+            ideal_source + ideal_target + ideal_head
+            - actual_source - actual_target - actual_head
+        ),
+        0
+    ) AS missed_reward,
+    COALESCE(SUM(1 - is_live), 0) AS missed_attestations,
+    COALESCE(SUM(1 - is_optimal_inclusion), 0) AS suboptimal_inclusions
+"""
+
+# Add (sign = 1) or remove (sign = -1) rows of an epoch to or from totals
+UPDATE_TOTALS = f"""
+INSERT INTO validator_totals
+SELECT
+    validator_index,
+    :sign * missed_reward,
+    :sign * missed_attestations,
+    :sign * suboptimal_inclusions
+FROM (
+    SELECT {AGGREGATES} FROM validator_epochs
+    WHERE epoch = :epoch {{condition}}
+    GROUP BY validator_index
+)
+WHERE true
+ON CONFLICT (validator_index) DO UPDATE SET
+    missed_reward = missed_reward + excluded.missed_reward,
+    missed_attestations = missed_attestations + excluded.missed_attestations,
+    suboptimal_inclusions = suboptimal_inclusions + excluded.suboptimal_inclusions
+"""
+
+ONLY_WRITTEN = "AND validator_index IN (SELECT validator_index FROM written)"
+
+REWARDS_COLUMNS = (
+    "ideal_source",
+    "ideal_target",
+    "ideal_head",
+    "actual_source",
+    "actual_target",
+    "actual_head",
+)
+
+
+class ValidatorTotals(NamedTuple):
+    validator_index: int
+    missed_reward: int  # Ideal minus actual rewards, in Gwei
+    missed_attestations: int
+    suboptimal_inclusions: int
+
+
+class ValidatorEpoch(NamedTuple):
+    epoch: int
+    ideal_source: int | None
+    ideal_target: int | None
+    ideal_head: int | None
+    actual_source: int | None
+    actual_target: int | None
+    actual_head: int | None
+    is_live: bool | None
+    is_optimal_inclusion: bool | None
+    inclusion_delay: int | None  # In slots, None if not included
+
+
+class ValidatorStore:
+    """Append-only store of the per epoch performance of our validators: source,
+    target and head actual versus ideal rewards, liveness and inclusion results.
+
+    Data are stored in a SQLite database, one row per validator and epoch, and
+    kept for `retention_epochs` epochs. Per validator totals over this retention
+    window are maintained on write, so ranking validators does not scan the rows.
+
+    The store can be used from several threads, accesses being serialized.
+    """
+
+    def __init__(
+        self, path: Path, retention_epochs: int = DEFAULT_RETENTION_EPOCHS
+    ) -> None:
+        """ValidatorStore
+
+        Parameters:
+        path            : Path of the SQLite database, created if needed
+        retention_epochs: Number of epochs kept, the last written one included
+        """
+        self.__retention_epochs = retention_epochs
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode = WAL")
+        self.__connection.execute("PRAGMA synchronous = NORMAL")
+        self.__connection.executescript(SCHEMA)
+
+        (last_epoch,) = self.__connection.execute(
+            "SELECT MAX(epoch) FROM validator_epochs"
+        ).fetchone()
+
+        self.__last_epoch: int | None = last_epoch
+
+    def add_rewards(
+        self,
+        epoch: int,
+        validators_index: Sequence[int],
+        ideal_rewards: tuple[Sequence[int], Sequence[int], Sequence[int]],
+        actual_rewards: tuple[Sequence[int], Sequence[int], Sequence[int]],
+    ) -> None:
+        """Add rewards of validators.
+
+        Parameters:
+        epoch           : Epoch of the rewards
+        validators_index: Indexes of validators
+        ideal_rewards   : Source, target and head ideal rewards, one item per
+                          validator
+        actual_rewards  : Source, target and head actual rewards, one item per
+                          validator
+        """
+        self.__write(
+            epoch,
+            REWARDS_COLUMNS,
+            zip(validators_index, *ideal_rewards, *actual_rewards),
+        )
+
+    def add_liveness(self, epoch: int, index_to_liveness: dict[int, bool]) -> None:
+        """Add liveness of validators.
+
+        Parameters:
+        epoch            : Epoch of the liveness
+        index_to_liveness: Liveness, per validator index
+        """
+        self.__write(epoch, ("is_live",), index_to_liveness.items())
+
+    def add_inclusions(
+        self, epoch: int, validators_index: Iterable[int], suboptimal_indexes: set[int]
+    ) -> None:
+        """Add attestation inclusion results of validators.
+
+        Parameters:
+        epoch             : Epoch of the attestations
+        validators_index  : Indexes of validators which had to attest
+        suboptimal_indexes: Indexes of validators whose attestation was not
+                            optimally included
+        """
+        self.__write(
+            epoch,
+            ("is_optimal_inclusion",),
+            ((index, index not in suboptimal_indexes) for index in validators_index),
+        )
+
+    def add_inclusion_delays(
+        self, epoch: int, index_to_inclusion_delay: dict[int, int | None]
+    ) -> None:
+        """Add attestation inclusion delays of validators.
+
+        Parameters:
+        epoch                   : Epoch of the attestations
+        index_to_inclusion_delay: Inclusion delay (in slots) per validator index,
+                                  None if the attestation was not included
+        """
+        self.__write(epoch, ("inclusion_delay",), index_to_inclusion_delay.items())
+
+    def worst_validators(
+        self, count: int = 100, nb_epochs: int | None = None
+    ) -> list[ValidatorTotals]:
+        """Return validators having missed the most rewards, then the most
+        attestations.
+
+        Parameters:
+        count    : Maximum number of validators returned
+        nb_epochs: Number of last epochs taken into account. If None (or not
+                   lower than the retention), totals over the retention window are
+                   used, without scanning rows.
+        """
+        with self.__lock:
+            if nb_epochs is None or nb_epochs >= self.__retention_epochs:
+                rows = self.__connection.execute(
+                    """
+                    SELECT * FROM validator_totals
+                    ORDER BY missed_reward DESC, missed_attestations DESC
+                    LIMIT ?
+                    """,
+                    (count,),
+                )
+
+                return [ValidatorTotals(*row) for row in rows]
+
+            if self.__last_epoch is None:
+                return []
+
+            # `+` prevents grouping along the validator index (the whole table),
+            # instead of scanning the last epochs only
+            rows = self.__connection.execute(
+                f"""
+                SELECT {AGGREGATES} FROM validator_epochs
+                WHERE epoch > ?
+                GROUP BY +validator_index
+                ORDER BY missed_reward DESC, missed_attestations DESC
+                LIMIT ?
+                """,
+                (self.__last_epoch - nb_epochs, count),
+            )
+
+            return [ValidatorTotals(*row) for row in rows]
+
+    def history(self, validator_index: int) -> list[ValidatorEpoch]:
+        """Return the stored epochs of a validator, oldest first.
+
+        Parameters:
+        validator_index: Index of the validator
+        """
+        with self.__lock:
+            rows = self.__connection.execute(
+                """
+                SELECT * FROM validator_epochs WHERE validator_index = ? ORDER BY epoch
+                """,
+                (validator_index,),
+            ).fetchall()
+
+        return [
+            ValidatorEpoch(
+                *rewards,
+                is_live=None if is_live is None else bool(is_live),
+                is_optimal_inclusion=(
+                    None if is_optimal_inclusion is None else bool(is_optimal_inclusion)
+                ),
+                inclusion_delay=inclusion_delay,
+            )
+            for _, *rewards, is_live, is_optimal_inclusion, inclusion_delay in rows
+        ]
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__connection.close()
+
+    def __write(
+        self, epoch: int, columns: tuple[str, ...], rows: Iterable[Iterable]
+    ) -> None:
+        """Write `columns` of rows of `epoch` (rows start with the validator index),
+        in a single transaction. Totals are kept up to date: written rows are
+        removed from them, updated, then added back."""
+        rows = list(rows)
+
+        if len(rows) == 0:
+            return
+
+        names = ", ".join(columns)
+        placeholders = ", ".join("?" * (len(columns) + 2))
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+        update_written_totals = UPDATE_TOTALS.format(condition=ONLY_WRITTEN)
+
+        with self.__lock:
+            if (
+                self.__last_epoch is not None
+                and epoch <= self.__last_epoch - self.__retention_epochs
+            ):
+                return
+
+            with self.__connection:
+                self.__connection.execute("DELETE FROM written")
+
+                self.__connection.executemany(
+                    "INSERT OR IGNORE INTO written VALUES (?)",
+                    ((row[0],) for row in rows),
+                )
+
+                self.__connection.execute(
+                    update_written_totals, dict(sign=-1, epoch=epoch)
+                )
+
+                self.__connection.executemany(
+                    f"""
+                    INSERT INTO validator_epochs (validator_index, epoch, {names})
+                    VALUES ({placeholders})
+                    ON CONFLICT (epoch, validator_index) DO UPDATE SET {updates}
+                    """,
+                    ((row[0], epoch, *row[1:]) for row in rows),
+                )
+
+                self.__connection.execute(
+                    update_written_totals, dict(sign=1, epoch=epoch)
+                )
+
+                if self.__last_epoch is None or epoch > self.__last_epoch:
+                    self.__last_epoch = epoch
+                    self.__prune()
+
+    def __prune(self) -> None:
+        """Remove epochs out of the retention window, and their totals."""
+        assert self.__last_epoch is not None
+        first_epoch = self.__last_epoch - self.__retention_epochs + 1
+
+        old_epochs = self.__connection.execute(
+            "SELECT DISTINCT epoch FROM validator_epochs WHERE epoch < ?",
+            (first_epoch,),
+        ).fetchall()
+
+        update_totals = UPDATE_TOTALS.format(condition="")
+
+        for (old_epoch,) in old_epochs:
+            self.__connection.execute(update_totals, dict(sign=-1, epoch=old_epoch))
+
+        self.__connection.execute(
+            "DELETE FROM validator_epochs WHERE epoch < ?", (first_epoch,)
+        )
+
+        self.__connection.execute(
+            """
+            DELETE FROM validator_totals
+            WHERE NOT EXISTS (
+                SELECT 1 FROM validator_epochs
+                WHERE validator_epochs.validator_index = validator_totals.validator_index
+            )
+            """
+        )
@@ -1,20 +1,15 @@
 """Contains functions to process sub-optimal attestations"""
 
 import functools
-from collections import defaultdict
 
 from prometheus_client import Gauge
 
 from .beacon import Beacon
-from .models import Block, Validators
-from .utils import (
-    NB_SLOT_PER_EPOCH,
-    aggregate_bools,
-    apply_mask,
-    convert_hex_to_bools,
-    remove_all_items_from_last_true,
-    switch_endianness,
-)
+from .committee_positions import CommitteePositions
+from .lean_models import Block
+from .registry import IndexToValidator
+from .store import ValidatorStore
+from .utils import NB_SLOT_PER_EPOCH, convert_hex_to_bitlist
 
 print = functools.partial(print, flush=True)
 
@@ -28,8 +23,10 @@ def process_suboptimal_attestations(
     beacon: Beacon,
     block: Block,
     slot: int,
-    our_active_validators_index_to_validator: dict[int, Validators.DataItem.Validator],
+    our_active_validators_index_to_validator: IndexToValidator,
     slots_per_epoch: int = NB_SLOT_PER_EPOCH,
+    store: ValidatorStore | None = None,
+    committee_positions: CommitteePositions | None = None,
 ) -> set[int]:
     """Process sub-optimal attestations
 
@@ -41,6 +38,12 @@ def process_suboptimal_attestations(
     our_active_validators_index_to_pubkey: dictionnary with:
       - key  : index of our active validator
       - value: public key of our active validator
+    slots_per_epoch                      : Number of slots per epoch
+    store                                : Store where inclusion results of our
+                                           validators are added, if any
+    committee_positions                  : Positions of our validators in committees,
+                                           shared between calls. If None, positions
+                                           are computed for this call only.
     """
     if slot < 1:
         return set()
@@ -51,80 +54,51 @@ def process_suboptimal_attestations(
     # corresponding to the previous slot.
     epoch_of_previous_slot = previous_slot // slots_per_epoch
 
-    # All our active validators index
-    our_active_validators_index = set(our_active_validators_index_to_validator)
-
-    # Nested dictionary
-    # - Key of the outer dict is the slot
-    # - Value of the outer dict (which is key of the inner dict) is the committee index
-    # - Value of the inner dict is the list of validators index that have to attest
-    #   during the given slot and for the given committee index
-    duty_slot_to_committee_index_to_validators_index: dict[
-        int, dict[int, list[int]]
-    ] = beacon.get_duty_slot_to_committee_index_to_validators_index(
-        epoch_of_previous_slot
-    )
-
-    # Dictionary where key is committee index and value is the list of validators
-    # index that had to attest during the previous slot
-    duty_committee_index_to_validators_index_during_previous_slot = (
-        duty_slot_to_committee_index_to_validators_index[previous_slot]
-    )
-
-    # Index of validators that had to attest during the previous slot
-    validators_index_that_had_to_attest_during_previous_slot = set(
-        (
-            item
-            for sublist in duty_committee_index_to_validators_index_during_previous_slot.values()
-            for item in sublist
-        )
-    )
+    if committee_positions is None:
+        committee_positions = CommitteePositions(beacon)
 
-    # Index ouf our validators that had to attest during the previous slot
-    our_validators_index_that_had_to_attest_during_previous_slot = (
-        validators_index_that_had_to_attest_during_previous_slot
-        & our_active_validators_index
+    # Positions of our validators in committees of the epoch of the previous slot
+    positions = committee_positions.get(
+        epoch_of_previous_slot, our_active_validators_index_to_validator
     )
 
     # Dictionary
     # - Key is the committee index
-    # - Value is a list of boolean where each boolean indicates if the validator
-    #   attested optimally
-    committee_index_to_validator_attestation_success = aggregate_attestations(
+    # - Value is an integer where each bit indicates if the validator attested
+    #   optimally
+    committee_index_to_validator_attestation_success = aggregate_attestation_bits(
         block, previous_slot
     )
 
-    list_of_validators_index_that_attested_optimally_during_previous_slot = (
-        apply_mask(
-            duty_committee_index_to_validators_index_during_previous_slot[
-                actual_committee_index
-            ],
-            validator_attestation_success,
+    # Index ouf our validators that had to attest during the previous slot
+    our_validators_index_that_had_to_attest_during_previous_slot: set[int] = set()
+
+    # Index of our validators which failed to attest optimally during the previous slot
+    our_validators_index_that_did_not_attest_optimally_during_previous_slot: set[
+        int
+    ] = set()
+
+    # Only bits of our validators are looked up
+    for committee_index, position, validator_index in positions.of_slot(previous_slot):
+        our_validators_index_that_had_to_attest_during_previous_slot.add(
+            validator_index
         )
-        for (
-            actual_committee_index,
-            validator_attestation_success,
-        ) in committee_index_to_validator_attestation_success.items()
-    )
 
-    # Index of validators which actually attested for the previous slot
-    validators_index_that_attested_optimally_during_previous_slot: set[int] = set(
-        item
-        for sublist in list_of_validators_index_that_attested_optimally_during_previous_slot
-        for item in sublist
-    )
+        validator_attestation_success = (
+            committee_index_to_validator_attestation_success.get(committee_index, 0)
+        )
 
-    # Index of our validators that attested optimally during the previous slot
-    our_validators_index_that_attested_optimally_during_previous_slot = (
-        validators_index_that_attested_optimally_during_previous_slot
-        & our_validators_index_that_had_to_attest_during_previous_slot
-    )
+        if not validator_attestation_success >> position & 1:
+            our_validators_index_that_did_not_attest_optimally_during_previous_slot.add(
+                validator_index
+            )
 
-    # Index of our validators which failed to attest optimally during the previous slot
-    our_validators_index_that_did_not_attest_optimally_during_previous_slot = (
-        our_validators_index_that_had_to_attest_during_previous_slot
-        - our_validators_index_that_attested_optimally_during_previous_slot
-    )
+    if store is not None:
+        store.add_inclusions(
+            epoch_of_previous_slot,
+            our_validators_index_that_had_to_attest_during_previous_slot,
+            our_validators_index_that_did_not_attest_optimally_during_previous_slot,
+        )
 
     suboptimal_attestations_rate = (
         len(our_validators_index_that_did_not_attest_optimally_during_previous_slot)
@@ -165,64 +139,42 @@ def process_suboptimal_attestations(
     return our_validators_index_that_did_not_attest_optimally_during_previous_slot
 
 
-def aggregate_attestations(block: Block, slot: int) -> dict[int, list[bool]]:
-    """Aggregates all attestations for the slot `slot` that are presient
-    in block `block`.
+def aggregate_attestation_bits(block: Block, slot: int) -> dict[int, int]:
+    """Aggregates all attestations for the slot `slot` that are present in block
+    `block`.
+
+    Aggregation bits are handled as integers, without any per bit Python object.
 
     Parameters:
     block: Block
     slot: Slot
 
     Returns:
-    Each boolean of the list corresponds to a validator in the given committee.
-    If the validator attestation from the previous slot is included in the current
-    slot, the boolean is True. Else, it is False.
-    """
-    filtered_attestations = (
-        attestation
-        for attestation in block.data.message.body.attestations
-        if attestation.data.slot == slot
-    )
+    A dictionary where key is the committee index, and value is an integer. Bit `i`
+    of this integer corresponds to the validator `i` of the given committee: if the
+    validator attestation from the previous slot is included in the current slot,
+    the bit is set.
 
-    # TODO: Write this code with dict comprehension
-    committee_index_to_list_of_aggregation_bools: dict[
-        int, list[list[bool]]
-    ] = defaultdict(list)
-
-    for attestation in filtered_attestations:
-        aggregated_bits_little_endian_with_last_bit = attestation.aggregation_bits
+    If aggregation bits of a given committee have not the same length, `ValueError`
+    is raised.
+    """
+    committee_index_to_bits: dict[int, int] = {}
+    committee_index_to_length: dict[int, int] = {}
 
-        # Aggregations bits are given under binary (hexadecimal) shape.
-        # We convert bytes to booleans.
-        aggregated_bools_little_endian_with_last_bit = convert_hex_to_bools(
-            aggregated_bits_little_endian_with_last_bit
-        )
+    for attestation in block.data.message.body.attestations:
+        if attestation.data.slot != slot:
+            continue
 
-        # Aggregations bits are represented in little endian shape.
-        # However, validators in committees are listed in big endian shape.
-        # We switch endianness
-        aggregated_bools_with_last_bit = switch_endianness(
-            aggregated_bools_little_endian_with_last_bit
-        )
+        committee_index = attestation.data.index
+        bits, length = convert_hex_to_bitlist(attestation.aggregation_bits)
 
-        # Aggregations bits in a given committee are represented with one bit for
-        # one validator. The number of validators bit is always a multiple of 8,
-        # even if the number of validators is not a multiple of 8.
-        # The last `1` (or last `True` in our boolean list) represents the boundary.
-        # All following `0`s can be ignored, as they do not represent validators
-        # As a consequence, we remove the last `1` and all following `0`s
-        aggregated_bools = remove_all_items_from_last_true(
-            aggregated_bools_with_last_bit
-        )
+        if committee_index_to_length.setdefault(committee_index, length) != length:
+            raise ValueError(
+                "At least one aggregation bits has not the same length than others"
+            )
 
-        committee_index_to_list_of_aggregation_bools[attestation.data.index].append(
-            aggregated_bools
+        committee_index_to_bits[committee_index] = (
+            committee_index_to_bits.get(committee_index, 0) | bits
         )
 
-    # Finally, we aggregate all attestations
-    items = committee_index_to_list_of_aggregation_bools.items()
-
-    return {
-        committee_index: aggregate_bools(list_of_aggregation_bools)
-        for committee_index, list_of_aggregation_bools in items
-    }
+    return committee_index_to_bits
@@ -3,9 +3,9 @@ from pathlib import Path
 from time import sleep, time
 from typing import Any, Iterator, Optional, Tuple
 
-from more_itertools import chunked
 from prometheus_client import Gauge
 
+from .clock import Clock
 from .web3signer import Web3Signer
 
 NB_SLOT_PER_EPOCH = 32
@@ -45,127 +45,32 @@ metric_keys_count = Gauge(
 )
 
 
-def convert_hex_to_bools(hex: str) -> list[bool]:
-    """Convert an hexadecimal number into list of booleans
+def convert_hex_to_bitlist(hex: str) -> tuple[int, int]:
+    """Convert a bitlist, given under hexadecimal shape, into an integer
 
     Parameters:
     hex: can contain `0x` prefix
 
-    Example:
-    --------
-    convert_hex_to_bools("0x0F0A") == convert_hex_to_bools("0F0A") == \
-    [
-        False, False, False, False,
-        True, True, True, True,
-        False, False, False, False,
-        True, False, True, False
-    ]
-    """
-    hex_without_0x_prefix = hex[2:] if hex[:2] == "0x" else hex
-
-    hex_without_0x_prefix_size = len(hex_without_0x_prefix) * 4
-    binary = (bin(int(hex_without_0x_prefix, 16))[2:]).zfill(hex_without_0x_prefix_size)
-
-    return [bit == "1" for bit in binary]
+    Bitlists are serialized in little endian shape, with a last `1` bit representing
+    the boundary. Bit `i` of the returned integer corresponds to item `i` of the
+    bitlist, and the boundary bit is removed.
 
-
-def switch_endianness(bits: list[bool]) -> list[bool]:
-    """Revert bits by 8 groups
-
-    Paremeters:
-    bits: list of booleans representing bits
-
-    Example:
-    -------
-    switch_endianness(
-        [
-            False, False, True, False, True, True, True, False,
-            True, False, True, False, False, True, True, True
-        ]
-    ==
-        [
-            False, True, True, True, False, True, False, False,
-            True, True, True, False, False, True, False, True
-        ]
-    )
-    """
-    list_of_bits = chunked(bits, 8)
-    reversed_list_of_bits = [reversed(bits) for bits in list_of_bits]
-    return [item for sublist in reversed_list_of_bits for item in sublist]
-
-
-def remove_all_items_from_last_true(bits: list[bool]) -> list[bool]:
-    """Remove all items after last True
-
-    Paremeters:
-    bits: list of booleans representing bits
-
-    If no True is found in the list, StopIteration is raised
+    Returns `(bits, length)`, `length` being the number of items of the bitlist.
+    If no boundary bit is found, `ValueError` is raised.
 
     Example:
     --------
-
-    remove_all_items_from_last_true([False, True, False, True, True, False]) == \
-        [False, True, False, True]
-    """
-    try:
-        index = next((index for index, bit in enumerate(reversed(bits)) if bit))
-    except StopIteration:
-        raise StopIteration(f"No `True` detected in {bits}")
-
-    return bits[: -index - 1]
-
-
-def aggregate_bools(list_of_bools: list[list[bool]]) -> list[bool]:
-    """Aggregate bools
-
-    Parameters:
-    list_of_bools: A list of list of booleans
-
-    If the length of each list is not the same, `ValueError` is raised.
-
-    examples:
-    ---------
-    aggregate_bools(
-        [
-            [False, False, True],
-            [False, True, False]
-        ]
-    ) == [False, True, True]
-
-    aggregate_bools(
-    [
-        [False, False],
-        [False, True, False]
-    ]
-    ) ==> ValueError
+    convert_hex_to_bitlist("0x0d") == (0b101, 3)
+    convert_hex_to_bitlist("0x0102") == (0b000000001, 9)
     """
+    hex_without_0x_prefix = hex[2:] if hex[:2] == "0x" else hex
+    bits = int.from_bytes(bytes.fromhex(hex_without_0x_prefix), "little")
 
-    _, *trash = {len(bits) for bits in list_of_bools}
-
-    if trash != []:
-        raise ValueError("At least one bools has not the same length than others")
-
-    return [any(bools) for bools in zip(*list_of_bools)]  # type:ignore
-
-
-def apply_mask(items: list[Any], mask: list[bool]) -> set[Any]:
-    """Apply mask
-
-    Parameters:
-    items: A list of items
-    mask: A list of booleans representing a mask
-
-    Example:
-    --------
+    if bits == 0:
+        raise ValueError(f"No boundary bit detected in {hex}")
 
-    apply_mask(
-        ["a", "b", "c", "d", "e"],
-        [True, False, False, True, False]
-    ) == {"a", "d"}
-    """
-
-    return set(item for item, bit in zip(items, mask) if bit)
+    length = bits.bit_length() - 1
+    return bits ^ (1 << length), length
 
 
 def load_pubkeys_from_file(path: Path) -> set[str]:
@@ -224,14 +129,18 @@ def write_liveness_file(liveness_file: Path):
 def slots(
     genesis_time_sec: int,
     seconds_per_slot: int = NB_SECOND_PER_SLOT,
+    clock: Clock | None = None,
 ) -> Iterator[Tuple[int, int]]:
-    next_slot = int((time() - genesis_time_sec) / seconds_per_slot) + 1
+    # Wall clock by default
+    now, wait = (time, sleep) if clock is None else (clock.time, clock.sleep)
+
+    next_slot = int((now() - genesis_time_sec) / seconds_per_slot) + 1
 
     try:
         while True:
             next_slot_time_sec = genesis_time_sec + next_slot * seconds_per_slot
-            time_to_wait = next_slot_time_sec - time()
-            sleep(max(0, time_to_wait))
+            time_to_wait = next_slot_time_sec - now()
+            wait(max(0, time_to_wait))
 
             yield next_slot, next_slot_time_sec
 
@@ -240,6 +149,21 @@ def slots(
         pass  # pragma: no cover
 
 
+def replay_slots(
+    genesis_time_sec: int,
+    from_slot: int,
+    to_slot: int,
+    seconds_per_slot: int = NB_SECOND_PER_SLOT,
+) -> Iterator[Tuple[int, int]]:
+    """Like `slots`, but for past slots `from_slot` to `to_slot` (included), with a
+    virtual clock: slots are yielded without waiting."""
+    try:
+        for slot in range(from_slot, to_slot + 1):
+            yield slot, genesis_time_sec + slot * seconds_per_slot
+    except KeyboardInterrupt:
+        pass  # pragma: no cover
+
+
 def convert_seconds_to_dhms(seconds: int) -> tuple[int, int, int, int]:
     # Calculate days, hours, minutes, and seconds
     days, seconds = divmod(seconds, 86400)  # 1 day = 24 hours * 60 minutes * 60 seconds
@@ -295,3 +219,6 @@ class LimitedDict:
 
     def __len__(self) -> int:
         return len(self.__dict)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__dict)
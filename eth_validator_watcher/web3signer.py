@@ -1,23 +1,32 @@
 """"Contains the Web3Signer class, which is used to interact with Web3Signer."""
 
-import requests
+from requests import Session
+
+from .archive import ResponseArchive, make_adapter
 
 
 class Web3Signer:
     """Web3Signer abstraction."""
 
-    def __init__(self, url: str) -> None:
+    def __init__(self, url: str, archive: ResponseArchive | None = None) -> None:
         """Web3Signer
 
         Parameters:
-        url: URL where Web3Signer can be reached
+        url    : URL where Web3Signer can be reached
+        archive: Archive responses are recorded to (or served from), if any
         """
         self.__url = url
+        self.__http = Session()
+
+        if archive is not None:
+            adapter = make_adapter(archive)
+            self.__http.mount("http://", adapter)
+            self.__http.mount("https://", adapter)
 
     def load_pubkeys(self) -> set[str]:
         """Load public keys from Web3Signer.
 
         Returns the corresponding set of public keys.
         """
-        resp = requests.get(f"{self.__url}/api/v1/eth2/publicKeys")
+        resp = self.__http.get(f"{self.__url}/api/v1/eth2/publicKeys")
         return set(resp.json())
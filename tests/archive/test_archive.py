@@ -0,0 +1,186 @@
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any, Iterator
+
+from pytest import fixture, raises
+from requests import ConnectionError, Session
+
+from eth_validator_watcher.archive import (
+    ArchiveMode,
+    BodyReader,
+    ResponseArchive,
+    make_adapter,
+)
+from eth_validator_watcher.clock import Clock
+
+
+class FakeClock(Clock):
+    def __init__(self, now: float) -> None:
+        self.now = now
+        self.slept: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+
+
+@fixture
+def server() -> Iterator[tuple[str, list[str]]]:
+    """Serve `<path> <number of previous requests to path>` as body, a 404 for
+    `/missing`, a 503 for `/error` and 3 MB for `/big`.
+    Yield the server URL and the list of requested paths."""
+    paths: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            status = {"/missing": 404, "/error": 503}.get(self.path, 200)
+
+            body = (
+                bytes(range(256)) * 12_288
+                if self.path == "/big"
+                else f"{self.path} {paths.count(self.path)}".encode()
+            )
+
+            paths.append(self.path)
+
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=http_server.serve_forever, daemon=True).start()
+
+    yield f"http://127.0.0.1:{http_server.server_port}", paths
+
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def session(archive: ResponseArchive) -> Session:
+    http = Session()
+    http.mount("http://", make_adapter(archive))
+    return http
+
+
+def test_body_reader() -> None:
+    data = bytes(range(256)) * 1_000
+    reader = BodyReader(memoryview(zlib.compress(data)))
+
+    chunks = iter(lambda: reader.read(1_000), b"")
+    assert b"".join(chunks) == data
+
+
+def test_read_through(server: tuple[str, list[str]], tmp_path: Path) -> None:
+    url, paths = server
+    archive = ResponseArchive(tmp_path)
+    http = session(archive)
+
+    archive.epoch = 10
+
+    assert http.get(f"{url}/a?epoch=10").text == "/a?epoch=10 0"
+    assert http.get(f"{url}/a?epoch=10").text == "/a?epoch=10 0"
+    assert http.get(f"{url}/missing").status_code == 404
+    assert http.get(f"{url}/error").status_code == 503
+
+    archive.epoch = 11
+
+    response = http.get(f"{url}/big", stream=True)
+    big = b"".join(response.iter_content(chunk_size=1 << 16))
+    assert len(big) == 3 << 20
+
+    # Bodies partially read are archived once the response is closed
+    with http.get(f"{url}/partial", stream=True) as response:
+        assert response.raw.read(3) == b"/pa"
+
+    # Bodies fully read by the first chunk of a stream which is not exhausted too
+    with http.get(f"{url}/small", stream=True) as response:
+        assert next(response.iter_content(chunk_size=1 << 16)) == b"/small 0"
+
+    archive.close()
+
+    # Server errors are not archived
+    assert paths == [
+        "/a?epoch=10",
+        "/missing",
+        "/error",
+        "/big",
+        "/partial",
+        "/small",
+    ]
+
+    assert len(archive) == 5
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "epoch-10.bin.z",
+        "epoch-11.bin.z",
+        "index.jsonl",
+    ]
+
+    # Archived responses are served again, whatever the host
+    reopened_archive = ResponseArchive(tmp_path)
+    http = session(reopened_archive)
+
+    response = http.get("http://unreachable.invalid/a?epoch=10")
+    assert response.status_code == 200
+    assert response.text == "/a?epoch=10 0"
+    assert response.headers["Content-Type"] == "text/plain"
+
+    assert http.get("http://unreachable.invalid/missing").status_code == 404
+    assert http.get("http://unreachable.invalid/big").content == big
+    assert http.get("http://unreachable.invalid/partial").text == "/partial 0"
+    assert http.get("http://unreachable.invalid/small").text == "/small 0"
+    assert len(paths) == 6
+
+    reopened_archive.close()
+
+
+def test_record_and_playback(server: tuple[str, list[str]], tmp_path: Path) -> None:
+    url, paths = server
+    clock = FakeClock(1000)
+    archive = ResponseArchive(tmp_path, ArchiveMode.RECORD, clock)
+    http = session(archive)
+
+    # Every request is sent, and archived
+    assert http.get(f"{url}/head").text == "/head 0"
+    clock.now = 1012
+    assert http.get(f"{url}/head").text == "/head 1"
+    assert paths == ["/head", "/head"]
+
+    archive.close()
+
+    clock = FakeClock(0)
+    archive = ResponseArchive(tmp_path, ArchiveMode.PLAYBACK, clock)
+    http = session(archive)
+
+    assert archive.start_time == 1000
+    assert archive.end_time is not None and 1012 < archive.end_time < 1013
+
+    # The last response archived before the clock time is served
+    clock.now = 1011
+    assert http.get("http://unreachable.invalid/head").text == "/head 0"
+    clock.now = 1013
+    assert http.get("http://unreachable.invalid/head").text == "/head 1"
+
+    # Recorded latencies are simulated
+    assert len(clock.slept) == 2
+
+    # Requests are never sent
+    with raises(ConnectionError):
+        http.get("http://unreachable.invalid/other")
+
+    assert len(paths) == 2
+    archive.close()
+
+
+def test_interrupted_recording(tmp_path: Path) -> None:
+    (tmp_path / "index.jsonl").write_text('{"key": "a", "epoch": 0, "offs')
+    assert len(ResponseArchive(tmp_path)) == 0
@@ -0,0 +1,158 @@
+import re
+from pathlib import Path
+from time import sleep
+
+from pytest import CaptureFixture, MonkeyPatch
+from requests_mock import Mocker
+
+from eth_validator_watcher import backfill as backfill_module
+from eth_validator_watcher.backfill import Backfill, metric_backfill_lag_epochs_gauge
+from eth_validator_watcher.beacon import Beacon as RealBeacon
+from eth_validator_watcher.beacon import NoBlockError
+from eth_validator_watcher.models import BeaconType, Validators
+from eth_validator_watcher.store import ValidatorStore
+from eth_validator_watcher.utils import LimitedDict
+
+Validator = Validators.DataItem.Validator
+
+PUBKEY_A = "0x" + "a" * 96
+PUBKEY_B = "0x" + "b" * 96
+
+
+class ProposerSchedule:
+    def proposer(self, slot: int) -> tuple[str, int]:
+        return (PUBKEY_A, 1) if slot % 4 == 0 else (PUBKEY_B, 2)
+
+
+class Beacon:
+    def __init__(self) -> None:
+        self.liveness_epochs: list[int] = []
+        self.header_slots: list[int] = []
+
+    def get_proposer_schedule(self, epoch: int) -> ProposerSchedule:
+        return ProposerSchedule()
+
+    def get_header(self, slot: int) -> None:
+        self.header_slots.append(slot)
+
+        if slot == 8:
+            raise NoBlockError
+
+        if slot == 12:
+            raise ValueError("Header not available")
+
+    def get_validators_liveness(
+        self,
+        beacon_type: BeaconType,
+        epoch: int,
+        validators_index: set[int],
+        assume_live: bool = True,
+        warn_epoch_too_old: bool = True,
+    ) -> dict[int, bool]:
+        assert warn_epoch_too_old is False
+        self.liveness_epochs.append(epoch)
+        return {index: True for index in validators_index}
+
+
+def test_backfill() -> None:
+    beacon = Beacon()
+    backfill = Backfill(
+        beacon,  # type: ignore
+        BeaconType.OTHER,
+        None,
+        workers=2,
+        min_interval_sec=0,
+        slots_per_epoch=4,
+    )
+
+    our_epoch_to_index_to_validator = LimitedDict(3)
+    our_epoch_to_index_to_validator[1] = {
+        1: Validator(pubkey=PUBKEY_A, effective_balance=32, slashed=False)
+    }
+
+    # Tasks do not start while the slot loop is busy
+    backfill.pause()
+
+    backfill.submit_liveness(range(1, 5), our_epoch_to_index_to_validator, {})
+    backfill.submit_blocks(range(6, 13), {PUBKEY_A})
+
+    sleep(0.1)
+    assert beacon.liveness_epochs == []
+    assert backfill.lag_epochs == 4
+    assert metric_backfill_lag_epochs_gauge._value.get() == 4
+
+    backfill.resume()
+
+    while backfill.lag_epochs > 0:
+        sleep(0.01)
+
+    backfill.shutdown()
+
+    # Only liveness of the last epoch is backfilled, and epoch 3 failed
+    assert beacon.liveness_epochs == [4]
+    assert sorted(beacon.header_slots) == [8, 12]
+    assert backfill.lag_epochs == 0
+    assert metric_backfill_lag_epochs_gauge._value.get() == 0
+
+
+def test_backfill_bounded(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(backfill_module, "MAX_BACKFILL_EPOCHS", 2)
+
+    beacon = Beacon()
+    backfill = Backfill(
+        beacon, BeaconType.OTHER, None, min_interval_sec=0, slots_per_epoch=4  # type: ignore
+    )
+
+    backfill.submit_blocks(range(0, 24), {PUBKEY_A})
+
+    while backfill.lag_epochs > 0:
+        sleep(0.01)
+
+    backfill.shutdown()
+
+    assert sorted(beacon.header_slots) == [16, 20]
+
+
+def test_backfill_liveness_old_epochs(
+    tmp_path: Path, capsys: CaptureFixture[str]
+) -> None:
+    store = ValidatorStore(tmp_path / "store.db")
+    beacon = RealBeacon("http://beacon-node:5052")
+    backfill = Backfill(beacon, BeaconType.OTHER, None, store, min_interval_sec=0)
+
+    our_index_to_validator = {
+        1: Validator(pubkey=PUBKEY_A, effective_balance=32, slashed=False)
+    }
+
+    def callback(request, context) -> dict:
+        # The beacon node does not answer for epochs older than 9
+        if int(request.path.rsplit("/", 1)[-1]) < 9:
+            context.status_code = 400
+            return dict(code=400, message="Epoch too old")
+
+        return dict(data=[dict(index="1", is_live=False)])
+
+    with Mocker() as mock:
+        mock.post(
+            re.compile("http://beacon-node:5052/eth/v1/validator/liveness/"),
+            json=callback,
+        )
+
+        for epochs in (range(0, 10), range(0, 9)):
+            backfill.submit_liveness(epochs, LimitedDict(3), our_index_to_validator)
+
+            while backfill.lag_epochs > 0:
+                sleep(0.01)
+
+        backfill.shutdown()
+
+        assert [request.path for request in mock.request_history] == [
+            "/eth/v1/validator/liveness/9",
+            "/eth/v1/validator/liveness/8",
+        ]
+
+    # Validators of the epoch the beacon node did not answer for are not considered
+    # as live
+    assert [(item.epoch, item.is_live) for item in store.history(1)] == [(9, False)]
+    # Not a misconfiguration: no hint is printed
+    assert "Missed attestations detection is disabled" not in capsys.readouterr().out
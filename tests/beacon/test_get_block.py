@@ -5,7 +5,9 @@ from pytest import raises
 from requests import HTTPError, Response, codes, exceptions
 from requests_mock import Mocker
 
+from benchmarks.simulator import ssz_block
 from eth_validator_watcher.beacon import Beacon, NoBlockError
+from eth_validator_watcher.lean_models import decode_block
 from tests.beacon import assets
 
 
@@ -25,6 +27,67 @@ def test_get_block_exists() -> None:
         assert block.data.message.proposer_index == 365100
 
 
+def test_get_block_ssz() -> None:
+    block_path = Path(assets.__file__).parent / "block.json"
+
+    with block_path.open() as file_descriptor:
+        block_dict = json.load(file_descriptor)
+
+    beacon = Beacon("http://beacon-node:5052", ssz=True)
+
+    with Mocker() as mock:
+        mock.get(
+            f"http://beacon-node:5052/eth/v2/beacon/blocks/4839775",
+            content=ssz_block(block_dict),
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Eth-Consensus-Version": "capella",
+            },
+        )
+
+        block = beacon.get_block(4839775)
+
+        assert mock.last_request.headers["Accept"].startswith(
+            "application/octet-stream"
+        )
+
+    assert block == decode_block(block_dict)
+
+
+def test_get_block_ssz_fallback() -> None:
+    block_path = Path(assets.__file__).parent / "block.json"
+
+    with block_path.open() as file_descriptor:
+        block_dict = json.load(file_descriptor)
+
+    beacon = Beacon("http://beacon-node:5052", ssz=True)
+    url = "http://beacon-node:5052/eth/v2/beacon/blocks/4839775"
+
+    with Mocker() as mock:
+        # Beacon node not supporting SSZ
+        mock.get(url, json=block_dict)
+        assert beacon.get_block(4839775).data.message.proposer_index == 365100
+
+        # Fork unknown by the SSZ decoder
+        mock.get(
+            url,
+            content=b"",
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Eth-Consensus-Version": "altair",
+            },
+        )
+
+        mock.get(
+            url,
+            request_headers={"Accept": "application/json"},
+            json=block_dict,
+        )
+
+        assert beacon.get_block(4839775).data.message.proposer_index == 365100
+        assert mock.last_request.headers["Accept"] == "application/json"
+
+
 def test_get_block_does_not_exist() -> None:
     def get(url: str, **_) -> Response:
         assert url == "http://beacon-node:5052/eth/v2/beacon/blocks/42"
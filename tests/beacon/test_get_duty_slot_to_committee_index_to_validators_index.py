@@ -26,6 +26,13 @@ def test_get_duty_slot_to_committee_index_to_validators_index():
             json=committees,
         )
 
+        # Committees depend on the same block as proposer duties of the previous
+        # epoch
+        mock.get(
+            f"{beacon_url}/eth/v1/validator/duties/proposer/{epoch - 1}",
+            json=dict(dependent_root="0x" + "a" * 64, data=[]),
+        )
+
         beacon = Beacon(beacon_url)
 
         assert (
@@ -1,11 +1,16 @@
 import json
+from io import BytesIO
 from pathlib import Path
 
+from pytest import MonkeyPatch, raises
 from requests_mock import Mocker
 
+from eth_validator_watcher import beacon as beacon_module
 from eth_validator_watcher.beacon import Beacon
-from eth_validator_watcher.models import BeaconType, Rewards
+from eth_validator_watcher.lean_models import Rewards
+from eth_validator_watcher.models import BeaconType
 from tests.beacon import assets
+from tests.beacon.test_get_validator_registry import BrokenBody
 
 
 def test_get_rewards_not_supported() -> None:
@@ -60,3 +65,118 @@ def test_get_rewards() -> None:
         )
 
         assert beacon.get_rewards(BeaconType.LIGHTHOUSE, 42, {8499, 8500}) == expected
+
+
+def test_get_rewards_broken_stream(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(beacon_module, "STREAM_RETRY_WAIT_SEC", 0)
+    monkeypatch.setattr(beacon_module, "STREAM_CHUNK_SIZE_BYTES", 64)
+
+    rewards_path = Path(assets.__file__).parent / "rewards.json"
+    content = rewards_path.read_bytes()
+
+    beacon = Beacon("http://beacon-node:5052")
+
+    with Mocker() as mock:
+        mock.post(
+            f"http://beacon-node:5052/eth/v1/beacon/rewards/attestations/42",
+            [
+                # Broken in the middle of the rewards
+                dict(body=BrokenBody(content, len(content) // 2)),
+                dict(body=BytesIO(content)),
+            ],
+        )
+
+        rewards = beacon.get_rewards(BeaconType.LIGHTHOUSE, 42, {8499, 8500})
+
+        # The whole chunk is retrieved again
+        assert mock.call_count == 2
+
+    assert [reward.validator_index for reward in rewards.data.total_rewards] == [
+        8499,
+        8500,
+    ]
+    assert len(rewards.data.ideal_rewards) == 2
+
+
+def test_get_rewards_chunks(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(beacon_module, "REWARDS_CHUNK_SIZE", 2)
+    beacon = Beacon("http://beacon-node:5052")
+
+    def callback(request, context) -> dict:
+        # Validator 48 has no rewards, and rewards are not sorted
+        indexes = [int(index) for index in request.json() if index != "48"]
+
+        return {
+            "data": {
+                "ideal_rewards": [
+                    {
+                        "effective_balance": str(index % 3),
+                        "source": "1",
+                        "target": "2",
+                        "head": "3",
+                    }
+                    for index in indexes
+                ],
+                "total_rewards": [
+                    {
+                        "validator_index": str(index),
+                        "source": str(index),
+                        "target": str(-index),
+                        "head": "0",
+                    }
+                    for index in reversed(indexes)
+                ],
+            }
+        }
+
+    with Mocker() as mock:
+        mock.post(
+            f"http://beacon-node:5052/eth/v1/beacon/rewards/attestations/42",
+            json=callback,
+        )
+
+        rewards = beacon.get_rewards(BeaconType.LIGHTHOUSE, 42, {42, 44, 46, 48, 50})
+
+        assert sorted(request.json() for request in mock.request_history) == [
+            ["42", "44"],
+            ["46", "48"],
+            ["50"],
+        ]
+
+    IdealReward = Rewards.Data.IdealReward
+    TotalReward = Rewards.Data.TotalReward
+
+    assert rewards.data.ideal_rewards == [
+        IdealReward(effective_balance=effective_balance, source=1, target=2, head=3)
+        for effective_balance in (0, 1, 2)
+    ]
+
+    assert rewards.data.total_rewards == [
+        TotalReward(validator_index=index, source=index, target=-index, head=0)
+        for index in (42, 44, 46, 50)
+    ]
+
+
+def test_get_rewards_unexpected_validator() -> None:
+    beacon = Beacon("http://beacon-node:5052")
+
+    with Mocker() as mock:
+        mock.post(
+            f"http://beacon-node:5052/eth/v1/beacon/rewards/attestations/42",
+            json={
+                "data": {
+                    "ideal_rewards": [],
+                    "total_rewards": [
+                        {
+                            "validator_index": "1",
+                            "source": "0",
+                            "target": "0",
+                            "head": "0",
+                        }
+                    ],
+                }
+            },
+        )
+
+        with raises(ValueError):
+            beacon.get_rewards(BeaconType.LIGHTHOUSE, 42, {2})
@@ -0,0 +1,119 @@
+import json
+from io import BytesIO
+from pathlib import Path
+
+from pytest import MonkeyPatch
+from requests_mock import Mocker
+from urllib3.exceptions import ProtocolError
+
+from eth_validator_watcher import beacon as beacon_module
+from eth_validator_watcher.beacon import Beacon
+from eth_validator_watcher.models import Validators
+from eth_validator_watcher.registry import ACTIVE_STATUSES
+from tests.beacon import assets
+
+StatusEnum = Validators.DataItem.StatusEnum
+
+
+def test_get_validator_registry() -> None:
+    asset_path = Path(assets.__file__).parent / "validators.json"
+
+    with asset_path.open() as file_descriptor:
+        validators = json.load(file_descriptor)
+
+    beacon = Beacon("http://localhost:5052")
+
+    with Mocker() as mock:
+        mock.get(
+            "http://localhost:5052/eth/v1/beacon/states/head/validators",
+            json=validators,
+        )
+
+        registry = beacon.get_validator_registry()
+
+    assert list(registry.indexes) == [0, 1, 2, 3, 4]
+    assert list(registry.view(ACTIVE_STATUSES)) == [0, 2, 4]
+    assert registry.count({StatusEnum.pendingQueued}) == 1
+    assert registry.count({StatusEnum.exitedSlashed}) == 1
+
+    assert registry.pubkey(3) == (
+        "0x8e323fd501233cd4d1b9d63d74076a38de50f2f584b001a5ac2412e4e46adb26"
+        "d2fb2a6041e7e8c57cd4df0916729219"
+    )
+
+
+def test_get_validator_registry_by_ids() -> None:
+    asset_path = Path(assets.__file__).parent / "validators.json"
+
+    with asset_path.open() as file_descriptor:
+        validators = json.load(file_descriptor)
+
+    beacon = Beacon("http://localhost:5052")
+
+    def callback(request, _) -> dict:
+        ids = request.qs["id"][0].split(",")
+
+        return dict(
+            data=[
+                item
+                for item in validators["data"]
+                if item["index"] in ids or item["validator"]["pubkey"] in ids
+            ]
+        )
+
+    with Mocker() as mock:
+        mock.get(
+            "http://localhost:5052/eth/v1/beacon/states/head/validators",
+            json=callback,
+        )
+
+        pubkey = validators["data"][3]["validator"]["pubkey"]
+        ids = [*range(70), pubkey]
+        registry = beacon.get_validator_registry(ids)
+
+        assert mock.call_count == 2
+        assert list(registry.indexes) == [0, 1, 2, 3, 4]
+
+        assert len(beacon.get_validator_registry([])) == 0
+        assert mock.call_count == 2
+
+
+class BrokenBody(BytesIO):
+    """Body whose connection breaks after `size` bytes."""
+
+    def __init__(self, content: bytes, size: int) -> None:
+        super().__init__(content)
+        self.__size = size
+
+    def read(self, size: int | None = -1) -> bytes:
+        if self.tell() >= self.__size:
+            raise ProtocolError("Connection broken")
+
+        return super().read(min(size or self.__size, self.__size - self.tell()))
+
+
+def test_get_validator_registry_broken_stream(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(beacon_module, "STREAM_RETRY_WAIT_SEC", 0)
+    monkeypatch.setattr(beacon_module, "STREAM_CHUNK_SIZE_BYTES", 64)
+
+    asset_path = Path(assets.__file__).parent / "validators.json"
+    content = asset_path.read_bytes()
+
+    beacon = Beacon("http://localhost:5052")
+
+    with Mocker() as mock:
+        mock.get(
+            "http://localhost:5052/eth/v1/beacon/states/head/validators",
+            [
+                # Broken after the first validators
+                dict(body=BrokenBody(content, len(content) // 2)),
+                dict(body=BytesIO(content)),
+            ],
+        )
+
+        registry = beacon.get_validator_registry()
+
+        assert mock.call_count == 2
+
+    # Validators yielded before the connection broke are not duplicated
+    assert list(registry.indexes) == [0, 1, 2, 3, 4]
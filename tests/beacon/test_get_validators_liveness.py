@@ -54,6 +54,16 @@ def test_get_validators_liveness_nimbus():
         beacon_type=BeaconType.NIMBUS, epoch=1664, validators_index={42, 44, 46}
     ) == {42: True, 44: True, 46: True}
 
+    assert (
+        beacon.get_validators_liveness(
+            beacon_type=BeaconType.NIMBUS,
+            epoch=1664,
+            validators_index={42, 44, 46},
+            assume_live=False,
+        )
+        == {}
+    )
+
 
 def test_get_validators_liveness_teku():
     beacon_url = "http://beacon:5052"
@@ -143,6 +153,13 @@ def test_get_validators_liveness_beacon_api_bad_request():
         beacon_type=BeaconType.OTHER, epoch=1664, validators_index={42, 44, 46}
     )
 
+    assert {} == beacon.get_validators_liveness(
+        beacon_type=BeaconType.OTHER,
+        epoch=1664,
+        validators_index={42, 44, 46},
+        assume_live=False,
+    )
+
 
 def test_get_validators_liveness_beacon_api_no_extended():
     beacon_url = "http://beacon:5052"
@@ -161,3 +178,68 @@ def test_get_validators_liveness_beacon_api_no_extended():
         beacon.get_validators_liveness(
             beacon_type=BeaconType.OTHER, epoch=1664, validators_index={42, 44, 46}
         )
+
+
+def test_get_validators_liveness_chunks():
+    beacon_url = "http://beacon:5052"
+
+    def callback(request, context) -> dict:
+        indexes = [int(index) for index in request.json()]
+
+        if 46 in indexes:
+            context.status_code = codes.internal_server_error
+            return {}
+
+        return {
+            "data": [
+                {"index": str(index), "is_live": index % 4 == 0} for index in indexes
+            ]
+        }
+
+    with Mocker() as mock:
+        mock.post(f"{beacon_url}/eth/v1/validator/liveness/1664", json=callback)
+        beacon = Beacon(beacon_url, liveness_chunk_size=2)
+
+        actual = beacon.get_validators_liveness(
+            beacon_type=BeaconType.OTHER,
+            epoch=1664,
+            validators_index={42, 44, 46, 48, 50},
+        )
+
+        assert sorted(request.json() for request in mock.request_history) == [
+            ["42", "44"],
+            ["46", "48"],
+            ["50"],
+        ]
+
+        actual_retrieved = beacon.get_validators_liveness(
+            beacon_type=BeaconType.OTHER,
+            epoch=1664,
+            validators_index={42, 44, 46, 48, 50},
+            assume_live=False,
+        )
+
+    # The failed chunk is considered as live, the other ones are still checked
+    assert actual == {42: False, 44: True, 46: True, 48: True, 50: False}
+
+    # Unless only retrieved liveness is requested
+    assert actual_retrieved == {42: False, 44: True, 50: False}
+
+
+def test_get_validators_liveness_all_chunks_fail():
+    beacon_url = "http://beacon:5052"
+
+    with Mocker() as mock:
+        mock.post(
+            f"{beacon_url}/eth/v1/validator/liveness/1664",
+            status_code=codes.internal_server_error,
+        )
+
+        beacon = Beacon(beacon_url, liveness_chunk_size=2)
+
+        with raises(HTTPError):
+            beacon.get_validators_liveness(
+                beacon_type=BeaconType.OTHER,
+                epoch=1664,
+                validators_index={42, 44, 46},
+            )
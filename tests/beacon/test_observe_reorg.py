@@ -0,0 +1,108 @@
+import json
+import re
+from pathlib import Path
+
+from requests_mock import Mocker
+
+from eth_validator_watcher.beacon import Beacon
+from eth_validator_watcher.models import ChainReorgEvent
+from tests.beacon import assets
+
+ROOT = "0x" + "a" * 64
+OTHER_ROOT = "0x" + "b" * 64
+
+
+def test_observe_reorg() -> None:
+    beacon_url = "http://beacon:5052"
+
+    proposer_duties_path = Path(assets.__file__).parent / "proposer_duties.json"
+    proposer_duties = json.loads(proposer_duties_path.read_text())
+
+    beacon = Beacon(beacon_url)
+
+    with Mocker() as mock:
+        mock.get(
+            re.compile(f"{beacon_url}/eth/v1/validator/duties/proposer/"),
+            json=proposer_duties,
+        )
+
+        mock.get(
+            re.compile(f"{beacon_url}/eth/v1/beacon/states/head/committees"),
+            json=dict(data=[]),
+        )
+
+        def get_duties() -> None:
+            for epoch in (2, 3, 4):
+                beacon.get_proposer_schedule(epoch)
+                beacon.get_duty_slot_to_committee_index_to_validators_index(epoch)
+
+        get_duties()
+
+        # Committees of epoch 2 depend on the same block as proposer duties of epoch 1
+        assert mock.call_count == 7
+
+        # Blocks of slots 95 and 96 are replaced: proposer duties of epochs 3 and 4,
+        # and attester duties of epoch 4 changed
+        beacon.observe_reorg(
+            ChainReorgEvent(
+                slot=96,
+                depth=2,
+                old_head_block=ROOT,
+                new_head_block=ROOT,
+                epoch=3,
+            ),
+            slots_per_epoch=32,
+        )
+
+        get_duties()
+
+        assert [request.path for request in mock.request_history[7:]] == [
+            "/eth/v1/validator/duties/proposer/3",
+            "/eth/v1/validator/duties/proposer/4",
+            "/eth/v1/beacon/states/head/committees",
+        ]
+
+        assert mock.request_history[-1].qs == dict(epoch=["4"])
+
+
+def test_refresh_proposer_schedule() -> None:
+    beacon_url = "http://beacon:5052"
+    beacon = Beacon(beacon_url)
+
+    def proposer_duties(dependent_root: str) -> dict:
+        return dict(dependent_root=dependent_root, data=[])
+
+    with Mocker() as mock:
+        mock.get(
+            f"{beacon_url}/eth/v1/validator/duties/proposer/2",
+            [dict(json=proposer_duties(ROOT))] * 2
+            + [dict(json=proposer_duties(OTHER_ROOT))],
+        )
+
+        mock.get(
+            re.compile(f"{beacon_url}/eth/v1/beacon/states/head/committees"),
+            json=dict(data=[]),
+        )
+
+        beacon.get_proposer_schedule(2)
+        beacon.get_duty_slot_to_committee_index_to_validators_index(3)
+        assert mock.call_count == 2
+
+        # Same dependent root: nothing is evicted
+        assert beacon.refresh_proposer_schedule(2).dependent_root == ROOT
+
+        beacon.get_proposer_schedule(2)
+        beacon.get_duty_slot_to_committee_index_to_validators_index(3)
+        assert mock.call_count == 3
+
+        # Reorg: proposer duties of epoch 2 and committees of epoch 3 are evicted,
+        # and the retrieved proposer duties are cached
+        assert beacon.refresh_proposer_schedule(2).dependent_root == OTHER_ROOT
+        assert mock.call_count == 4
+
+        assert beacon.get_proposer_schedule(2).dependent_root == OTHER_ROOT
+        beacon.get_duty_slot_to_committee_index_to_validators_index(3)
+
+        assert [request.path for request in mock.request_history[4:]] == [
+            "/eth/v1/beacon/states/head/committees"
+        ]
@@ -0,0 +1,70 @@
+import json
+import zlib
+from pathlib import Path
+
+from eth_validator_watcher.checkpoint import Checkpoint
+from eth_validator_watcher.models import Validators
+from eth_validator_watcher.registry import ValidatorRecord
+
+Validator = Validators.DataItem.Validator
+
+PUBKEY_A = "0x" + "a" * 96
+PUBKEY_B = "0x" + "b" * 96
+
+
+def test_checkpoint(tmp_path: Path) -> None:
+    path = tmp_path / "checkpoint"
+
+    assert Checkpoint.read(path) is None
+
+    checkpoint = Checkpoint(
+        genesis_time=1606824023,
+        last_processed_finalized_slot=640,
+        last_missed_attestations_process_epoch=21,
+        last_rewards_process_epoch=None,
+        our_missed_attestation_indexes={4, 2},
+        our_exited_unslashed_indexes={7},
+        total_exited_slashed_indexes={8, 9},
+        our_exited_slashed_indexes=None,
+        our_epoch_to_active_index_to_validator={
+            20: {},
+            21: {
+                5: Validator(pubkey=PUBKEY_B, effective_balance=31, slashed=True),
+                2: Validator(pubkey=PUBKEY_A, effective_balance=32, slashed=False),
+            },
+        },
+    )
+
+    checkpoint.write(path)
+    read_checkpoint = Checkpoint.read(path)
+
+    assert read_checkpoint is not None
+    assert read_checkpoint._replace(our_epoch_to_active_index_to_validator={}) == (
+        checkpoint._replace(our_epoch_to_active_index_to_validator={})
+    )
+
+    epoch_to_index_to_validator = read_checkpoint.our_epoch_to_active_index_to_validator
+    assert len(epoch_to_index_to_validator[20]) == 0
+    assert list(epoch_to_index_to_validator[21]) == [2, 5]
+    assert epoch_to_index_to_validator[21][2] == ValidatorRecord(
+        pubkey=PUBKEY_A, effective_balance=32, slashed=False
+    )
+    assert epoch_to_index_to_validator[21][5] == ValidatorRecord(
+        pubkey=PUBKEY_B, effective_balance=31, slashed=True
+    )
+
+    # Written atomically
+    assert [child.name for child in tmp_path.iterdir()] == ["checkpoint"]
+
+
+def test_checkpoint_invalid(tmp_path: Path) -> None:
+    path = tmp_path / "checkpoint"
+
+    path.write_bytes(b"not compressed")
+    assert Checkpoint.read(path) is None
+
+    path.write_bytes(zlib.compress(json.dumps(dict(version=0)).encode()))
+    assert Checkpoint.read(path) is None
+
+    path.write_bytes(zlib.compress(json.dumps(dict(version=1)).encode()))
+    assert Checkpoint.read(path) is None
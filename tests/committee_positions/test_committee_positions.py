@@ -0,0 +1,61 @@
+from eth_validator_watcher.committee_positions import CommitteePositions
+from eth_validator_watcher.models import Validators
+
+Validator = Validators.DataItem.Validator
+
+
+class Beacon:
+    def __init__(self) -> None:
+        self.committees = {
+            8: {1: [20, 21], 0: [10, 11, 12]},
+            9: {0: [13, 14]},
+        }
+
+    def get_duty_slot_to_committee_index_to_validators_index(
+        self, epoch: int, state_slot: int | None
+    ) -> dict[int, dict[int, list[int]]]:
+        assert epoch == 2
+        assert state_slot is None
+        return self.committees
+
+
+def index_to_validator(*indexes: int) -> dict[int, Validator]:
+    return {
+        index: Validator(pubkey=f"0x{index}", effective_balance=32, slashed=False)
+        for index in indexes
+    }
+
+
+def test_committee_positions() -> None:
+    beacon = Beacon()
+    committee_positions = CommitteePositions(beacon)  # type: ignore
+    our_active_validators_index_to_validator = index_to_validator(10, 12, 14, 21)
+
+    positions = committee_positions.get(2, our_active_validators_index_to_validator)
+
+    assert len(positions) == 4
+
+    assert list(positions) == [
+        (8, 0, 0, 10),
+        (8, 0, 2, 12),
+        (8, 1, 1, 21),
+        (9, 0, 1, 14),
+    ]
+
+    assert list(positions.of_slot(8)) == [(0, 0, 10), (0, 2, 12), (1, 1, 21)]
+    assert list(positions.of_slot(9)) == [(0, 1, 14)]
+    assert list(positions.of_slot(10)) == []
+
+    # Computed once per epoch
+    assert (
+        committee_positions.get(2, our_active_validators_index_to_validator)
+        is positions
+    )
+
+    # Our validators changed
+    other_positions = committee_positions.get(2, index_to_validator(11))
+    assert list(other_positions) == [(8, 0, 1, 11)]
+
+    # Committees changed (reorg)
+    beacon.committees = {8: {0: [11]}}
+    assert list(committee_positions.get(2, index_to_validator(11))) == [(8, 0, 0, 11)]
@@ -0,0 +1,73 @@
+from time import perf_counter, sleep
+
+from pytest import raises
+
+from eth_validator_watcher.beacon import NoBlockError
+from eth_validator_watcher.concurrent_beacon import ConcurrentBeacon, run_concurrently
+from eth_validator_watcher.models import BlockIdentierType
+
+DELAY_SEC = 0.2
+
+
+class Beacon:
+    @staticmethod
+    def get_header(block_identifier: BlockIdentierType | int) -> str:
+        sleep(DELAY_SEC)
+        return f"header {block_identifier}"
+
+    @staticmethod
+    def get_proposer_schedule(epoch: int) -> str:
+        sleep(DELAY_SEC)
+        return f"schedule {epoch}"
+
+    @staticmethod
+    def get_potential_block(slot: int) -> str:
+        sleep(DELAY_SEC)
+        return f"block {slot}"
+
+    @staticmethod
+    def get_duty_slot_to_committee_index_to_validators_index(epoch: int) -> str:
+        raise NoBlockError
+
+
+def test_run_concurrently() -> None:
+    concurrent_beacon = ConcurrentBeacon(Beacon())  # type: ignore
+
+    start = perf_counter()
+
+    actual = run_concurrently(
+        concurrent_beacon.get_header(BlockIdentierType.FINALIZED),
+        concurrent_beacon.get_proposer_schedule(42),
+        concurrent_beacon.get_proposer_schedule(43),
+        concurrent_beacon.get_potential_block(41),
+    )
+
+    duration_sec = perf_counter() - start
+
+    assert actual == [
+        "header finalized",
+        "schedule 42",
+        "schedule 43",
+        "block 41",
+    ]
+
+    # Requests overlap: wall time is roughly the one of a single request
+    assert duration_sec < 3 * DELAY_SEC
+
+    # The same instance runs the next batches
+    assert run_concurrently(concurrent_beacon.get_proposer_schedule(44)) == [
+        "schedule 44"
+    ]
+
+    concurrent_beacon.shutdown()
+
+
+def test_run_concurrently_error() -> None:
+    concurrent_beacon = ConcurrentBeacon(Beacon())  # type: ignore
+
+    with raises(NoBlockError):
+        run_concurrently(
+            concurrent_beacon.get_duty_slot_to_committee_index_to_validators_index(42)
+        )
+
+    concurrent_beacon.shutdown()
@@ -0,0 +1,118 @@
+from eth_validator_watcher.duty_cache import (
+    DutyCache,
+    metric_duty_cache_evictions_count,
+    metric_duty_cache_hits_count,
+    metric_duty_cache_misses_count,
+)
+
+
+def value(metric, **labels) -> float:
+    return metric.labels(**labels)._value.get()
+
+
+def test_duty_cache_get() -> None:
+    fetched: list[int] = []
+
+    def fetch(epoch: int) -> str:
+        fetched.append(epoch)
+        return f"duties {epoch}"
+
+    cache: DutyCache[str] = DutyCache("test_get", max_epochs=2)
+
+    assert cache.get(1, fetch) == "duties 1"
+    assert cache.get(1, fetch) == "duties 1"
+    assert cache.get(2, fetch) == "duties 2"
+    assert fetched == [1, 2]
+
+    assert value(metric_duty_cache_hits_count, cache="test_get") == 1
+    assert value(metric_duty_cache_misses_count, cache="test_get") == 2
+
+    # The oldest epoch is evicted
+    assert cache.get(3, fetch) == "duties 3"
+    assert 1 not in cache
+    assert len(cache) == 2
+
+    assert (
+        value(metric_duty_cache_evictions_count, cache="test_get", reason="size") == 1
+    )
+
+
+def test_duty_cache_evict_finalized() -> None:
+    cache: DutyCache[int] = DutyCache("test_finalized", max_epochs=10)
+
+    for epoch in range(5):
+        cache.get(epoch, lambda epoch: epoch)
+
+    cache.evict_finalized(3)
+
+    assert [epoch in cache for epoch in range(5)] == [False, False, False, True, True]
+
+    assert (
+        value(
+            metric_duty_cache_evictions_count,
+            cache="test_finalized",
+            reason="finalized",
+        )
+        == 3
+    )
+
+
+def test_duty_cache_evict_since() -> None:
+    cache: DutyCache[int] = DutyCache("test_evict_since", max_epochs=10)
+
+    for epoch in range(5):
+        cache.get(epoch, lambda epoch: epoch)
+
+    cache.evict_since(3)
+
+    assert [epoch for epoch in range(5) if epoch in cache] == [0, 1, 2]
+    assert (
+        value(
+            metric_duty_cache_evictions_count, cache="test_evict_since", reason="reorg"
+        )
+        == 2
+    )
+
+
+def test_duty_cache_observe_dependent_root() -> None:
+    # Dependent root known from the value
+    cache: DutyCache[tuple[str, int]] = DutyCache(
+        "test_reorg", max_epochs=10, dependent_root_of=lambda _, value: value[0]
+    )
+
+    cache.get(1, lambda epoch: ("0xaaa", epoch))
+
+    cache.observe_dependent_root(1, "0xaaa")
+    cache.observe_dependent_root(2, "0xbbb")
+    assert 1 in cache
+
+    cache.observe_dependent_root(1, "0xbbb")
+    assert 1 not in cache
+
+    assert (
+        value(metric_duty_cache_evictions_count, cache="test_reorg", reason="reorg")
+        == 1
+    )
+
+    # Dependent root known from the epoch
+    cache_epoch: DutyCache[int] = DutyCache(
+        "test_reorg_epoch",
+        max_epochs=10,
+        dependent_root_of=lambda epoch, _: f"0x{epoch}",
+    )
+
+    cache_epoch.get(1, lambda epoch: epoch)
+
+    cache_epoch.observe_dependent_root(1, "0x1")
+    assert 1 in cache_epoch
+
+    cache_epoch.observe_dependent_root(1, "0x2")
+    assert 1 not in cache_epoch
+
+    # No dependent root: never evicted this way
+    cache_: DutyCache[int] = DutyCache("test_reorg_unknown", max_epochs=10)
+    cache_.get(1, lambda epoch: epoch)
+
+    cache_.observe_dependent_root(1, "0xaaa")
+    cache_.observe_dependent_root(1, "0xbbb")
+    assert 1 in cache_
@@ -3,9 +3,24 @@ from pathlib import Path
 from typing import Iterator, Optional, Tuple
 
 from eth_validator_watcher import entrypoint
+from eth_validator_watcher.beacon import LIVENESS_CHUNK_SIZE
+from eth_validator_watcher.committee_positions import CommitteePositions
 from eth_validator_watcher.entrypoint import _handler
 from eth_validator_watcher.messengers import Messenger
-from eth_validator_watcher.models import BeaconType, Genesis, Validators, Spec
+from eth_validator_watcher.models import (
+    BeaconType,
+    BlockIdentierType,
+    Genesis,
+    Header,
+    Validators,
+    Spec,
+)
+from eth_validator_watcher.registry import (
+    IndexToValidator,
+    ValidatorRecord,
+    ValidatorRegistry,
+)
+from eth_validator_watcher.store import ValidatorStore
 from eth_validator_watcher.utils import LimitedDict
 from eth_validator_watcher.web3signer import Web3Signer
 from freezegun import freeze_time
@@ -13,13 +28,26 @@ from pytest import raises
 from typer import BadParameter
 
 StatusEnum = Validators.DataItem.StatusEnum
-Validator = Validators.DataItem.Validator
+
+PUBKEY_A = "0x" + "a" * 96
+PUBKEY_B = "0x" + "b" * 96
+PUBKEY_C = "0x" + "c" * 96
+PUBKEY_D = "0x" + "d" * 96
+PUBKEY_E = "0x" + "e" * 96
+PUBKEY_F = "0x" + "f" * 96
+PUBKEY_G = "0x" + "1" * 96
+
+FINALIZED_HEADER = Header(
+    data=Header.Data(
+        header=Header.Data.Header(message=Header.Data.Header.Message(slot=63))
+    )
+)
 
 
 def test_fee_recipient_set_while_execution_url_not_set() -> None:
     with raises(BadParameter):
         _handler(
-            beacon_url="",
+            beacon_url=[""],
             execution_url=None,
             pubkeys_file_path=None,
             web3signer_url=None,
@@ -36,7 +64,7 @@ def test_fee_recipient_set_while_execution_url_not_set() -> None:
 def test_fee_recipient_not_valid() -> None:
     with raises(BadParameter):
         _handler(
-            beacon_url="",
+            beacon_url=[""],
             execution_url="http://localhost:8545",
             pubkeys_file_path=None,
             web3signer_url=None,
@@ -53,7 +81,7 @@ def test_fee_recipient_not_valid() -> None:
 def test_slack_token_not_defined() -> None:
     with raises(BadParameter):
         _handler(
-            beacon_url="",
+            beacon_url=[""],
             execution_url=None,
             pubkeys_file_path=None,
             web3signer_url=None,
@@ -67,10 +95,35 @@ def test_slack_token_not_defined() -> None:
         )
 
 
+def test_checkpoint_while_replaying(tmp_path: Path) -> None:
+    with raises(BadParameter):
+        _handler(
+            beacon_url=[""],
+            execution_url=None,
+            pubkeys_file_path=None,
+            web3signer_url=None,
+            fee_recipient=None,
+            slack_channel=None,
+            telegram_channel=None,
+            beacon_type=BeaconType.OTHER,
+            relays_url=[],
+            liveness_file=None,
+            explorer_url=None,
+            replay_from_epoch=1,
+            replay_to_epoch=2,
+            checkpoint_path=tmp_path / "checkpoint",
+        )
+
+
 def test_invalid_pubkeys() -> None:
     class Beacon:
-        def __init__(self, url: str) -> None:
-            assert url == "http://localhost:5052"
+        def __init__(
+            self, url: list[str], archive: None, ssz: bool, liveness_chunk_size: int
+        ) -> None:
+            assert url == ["http://localhost:5052"]
+            assert archive is None
+            assert not ssz
+            assert liveness_chunk_size == LIVENESS_CHUNK_SIZE
 
         def get_genesis(self) -> Genesis:
             return Genesis(
@@ -91,7 +144,9 @@ def test_invalid_pubkeys() -> None:
         assert pubkeys_file_path == Path("/path/to/pubkeys")
         raise ValueError("Invalid pubkeys")
 
-    def slots(genesis_time: int, seconds_per_slot=12) -> Iterator[Tuple[(int, int)]]:
+    def slots(
+        genesis_time: int, seconds_per_slot=12, clock=None
+    ) -> Iterator[Tuple[(int, int)]]:
         assert genesis_time == 0
         yield 63, 1664
         yield 64, 1676
@@ -106,7 +161,7 @@ def test_invalid_pubkeys() -> None:
 
     with raises(BadParameter):
         _handler(
-            beacon_url="http://localhost:5052",
+            beacon_url=["http://localhost:5052"],
             execution_url=None,
             pubkeys_file_path=Path("/path/to/pubkeys"),
             web3signer_url=None,
@@ -122,8 +177,13 @@ def test_invalid_pubkeys() -> None:
 
 def test_chain_not_ready() -> None:
     class Beacon:
-        def __init__(self, url: str) -> None:
-            assert url == "http://localhost:5052"
+        def __init__(
+            self, url: list[str], archive: None, ssz: bool, liveness_chunk_size: int
+        ) -> None:
+            assert url == ["http://localhost:5052"]
+            assert archive is None
+            assert not ssz
+            assert liveness_chunk_size == LIVENESS_CHUNK_SIZE
 
         def get_genesis(self) -> Genesis:
             return Genesis(
@@ -143,7 +203,9 @@ def test_chain_not_ready() -> None:
     def get_our_pubkeys(pubkeys_file_path: Path, web3signer: None) -> set[str]:
         return {"0x12345", "0x67890"}
 
-    def slots(genesis_time: int, seconds_per_slot=12) -> Iterator[Tuple[(int, int)]]:
+    def slots(
+        genesis_time: int, seconds_per_slot=12, clock=None
+    ) -> Iterator[Tuple[(int, int)]]:
         assert genesis_time == 0
         yield -32, 1664
 
@@ -165,7 +227,7 @@ def test_chain_not_ready() -> None:
     entrypoint.start_http_server = start_http_server
 
     _handler(
-        beacon_url="http://localhost:5052",
+        beacon_url=["http://localhost:5052"],
         execution_url=None,
         pubkeys_file_path=Path("/path/to/pubkeys"),
         web3signer_url=None,
@@ -182,8 +244,13 @@ def test_chain_not_ready() -> None:
 @freeze_time("2023-01-01 00:00:00", auto_tick_seconds=15)
 def test_nominal() -> None:
     class Beacon:
-        def __init__(self, url: str) -> None:
-            assert url == "http://localhost:5052"
+        def __init__(
+            self, url: list[str], archive: None, ssz: bool, liveness_chunk_size: int
+        ) -> None:
+            assert url == ["http://localhost:5052"]
+            assert archive is None
+            assert not ssz
+            assert liveness_chunk_size == LIVENESS_CHUNK_SIZE
 
         def get_genesis(self) -> Genesis:
             return Genesis(
@@ -200,58 +267,92 @@ def test_nominal() -> None:
                 )
             )
 
-        def get_status_to_index_to_validator(
-            self,
-        ) -> dict[StatusEnum, dict[int, Validator]]:
-            return {
-                StatusEnum.activeOngoing: {
-                    0: Validator(
-                        pubkey="0xaaa", effective_balance=32000000000, slashed=False
-                    ),
-                    2: Validator(
-                        pubkey="0xccc", effective_balance=32000000000, slashed=False
-                    ),
-                    4: Validator(
-                        pubkey="0xeee", effective_balance=32000000000, slashed=False
-                    ),
-                },
-                StatusEnum.pendingQueued: {
-                    1: Validator(
-                        pubkey="0xbbb", effective_balance=32000000000, slashed=False
-                    ),
-                    3: Validator(
-                        pubkey="0xddd", effective_balance=32000000000, slashed=False
-                    ),
-                },
-                StatusEnum.exitedSlashed: {
-                    5: Validator(
-                        pubkey="0xfff", effective_balance=32000000000, slashed=True
-                    ),
-                    6: Validator(
-                        pubkey="0xggg", effective_balance=32000000000, slashed=True
-                    ),
-                },
-            }
+        def get_validator_registry(
+            self, ids: None = None, epoch: int | None = None
+        ) -> ValidatorRegistry:
+            assert ids is None
+            assert epoch is not None
+            return ValidatorRegistry.from_items(
+                [
+                    (0, StatusEnum.activeOngoing, PUBKEY_A, 32000000000, False),
+                    (1, StatusEnum.pendingQueued, PUBKEY_B, 32000000000, False),
+                    (2, StatusEnum.activeOngoing, PUBKEY_C, 32000000000, False),
+                    (3, StatusEnum.pendingQueued, PUBKEY_D, 32000000000, False),
+                    (4, StatusEnum.activeOngoing, PUBKEY_E, 32000000000, False),
+                    (5, StatusEnum.exitedSlashed, PUBKEY_F, 32000000000, True),
+                    (6, StatusEnum.exitedSlashed, PUBKEY_G, 32000000000, True),
+                ]
+            )
 
         def get_potential_block(self, slot: int) -> str | None:
             assert slot in {63, 64}
             return "A BLOCK"
 
+        def get_proposer_schedule(self, epoch: int) -> str:
+            assert epoch in {1, 2, 3}
+            return "PROPOSER SCHEDULE"
+
+        def refresh_proposer_schedule(self, epoch: int) -> str:
+            assert epoch in {1, 2}
+            return "PROPOSER SCHEDULE"
+
+        def evict_finalized(self, finalized_epoch: int) -> None:
+            assert finalized_epoch == 1
+
+        def get_header(self, block_identifier: BlockIdentierType) -> Header:
+            assert block_identifier is BlockIdentierType.FINALIZED
+            return FINALIZED_HEADER
+
+        def get_duty_slot_to_committee_index_to_validators_index(
+            self, epoch: int
+        ) -> dict[int, dict[int, list[int]]]:
+            assert epoch in {1, 2}
+            return {}
+
     class Coinbase:
         nb_calls = 0
 
+        def __init__(self, archive: None) -> None:
+            assert archive is None
+
         @classmethod
         def emit_eth_usd_conversion_rate(cls) -> None:
             cls.nb_calls += 1
 
     class Relays:
-        def __init__(self, urls: list[str]) -> None:
+        def __init__(self, urls: list[str], archive: None) -> None:
             assert urls == ["http://my-awesome-relay.com"]
+            assert archive is None
 
         def process(self, slot: int) -> None:
             assert slot in {63, 64}
 
-    def slots(genesis_time: int, seconds_per_slot=12) -> Iterator[Tuple[(int, int)]]:
+    class EpochInclusions:
+        def __init__(
+            self,
+            committee_positions: CommitteePositions,
+            slots_per_epoch: int,
+            store: ValidatorStore | None,
+        ) -> None:
+            assert isinstance(committee_positions, CommitteePositions)
+            assert slots_per_epoch == 32
+            assert store is None
+
+        def process(
+            self,
+            slot: int,
+            block: str | None,
+            epoch_to_index_to_validator: LimitedDict,
+            index_to_validator: IndexToValidator,
+        ) -> dict[int, dict[int, int | None]]:
+            assert slot in {63, 64}
+            assert block == "A BLOCK"
+            assert isinstance(epoch_to_index_to_validator, LimitedDict)
+            return {}
+
+    def slots(
+        genesis_time: int, seconds_per_slot=12, clock=None
+    ) -> Iterator[Tuple[(int, int)]]:
         assert genesis_time == 0
         yield 63, 1664
         yield 64, 1676
@@ -260,20 +361,28 @@ def test_nominal() -> None:
         assert pubkeys_file_path == Path("/path/to/pubkeys")
         assert isinstance(web3signer, Web3Signer)
 
-        return {"0xaaa", "0xbbb", "0xccc", "0xddd", "0xeee", "0xfff"}
+        return {PUBKEY_A, PUBKEY_B, PUBKEY_C, PUBKEY_D, PUBKEY_E, PUBKEY_F}
 
     def process_missed_attestations(
         beacon: Beacon,
         beacon_type: BeaconType,
         epoch_to_index_to_validator_index: LimitedDict,
         epoch: int,
+        store: ValidatorStore | None = None,
     ) -> set[int]:
         assert isinstance(beacon, Beacon)
+        assert store is None
         assert beacon_type is BeaconType.OLD_TEKU
         assert epoch_to_index_to_validator_index[1] == {
-            0: Validator(pubkey="0xaaa", effective_balance=32000000000, slashed=False),
-            2: Validator(pubkey="0xccc", effective_balance=32000000000, slashed=False),
-            4: Validator(pubkey="0xeee", effective_balance=32000000000, slashed=False),
+            0: ValidatorRecord(
+                pubkey=PUBKEY_A, effective_balance=32000000000, slashed=False
+            ),
+            2: ValidatorRecord(
+                pubkey=PUBKEY_C, effective_balance=32000000000, slashed=False
+            ),
+            4: ValidatorRecord(
+                pubkey=PUBKEY_E, effective_balance=32000000000, slashed=False
+            ),
         }
         assert epoch == 1
 
@@ -290,9 +399,15 @@ def test_nominal() -> None:
         assert indexes_that_missed_attestation == {0, 4}
         assert indexes_that_previously_missed_attestation == set()
         assert epoch_to_index_to_validator_index[1] == {
-            0: Validator(pubkey="0xaaa", effective_balance=32000000000, slashed=False),
-            2: Validator(pubkey="0xccc", effective_balance=32000000000, slashed=False),
-            4: Validator(pubkey="0xeee", effective_balance=32000000000, slashed=False),
+            0: ValidatorRecord(
+                pubkey=PUBKEY_A, effective_balance=32000000000, slashed=False
+            ),
+            2: ValidatorRecord(
+                pubkey=PUBKEY_C, effective_balance=32000000000, slashed=False
+            ),
+            4: ValidatorRecord(
+                pubkey=PUBKEY_E, effective_balance=32000000000, slashed=False
+            ),
         }
         assert epoch == 1
         assert isinstance(messenger, Messenger)
@@ -307,7 +422,7 @@ def test_nominal() -> None:
         slots_per_epoch: int = 32,
     ) -> int:
         assert isinstance(beacon, Beacon)
-        assert pubkeys == {"0xaaa", "0xbbb", "0xccc", "0xddd", "0xeee", "0xfff"}
+        assert pubkeys == {PUBKEY_A, PUBKEY_B, PUBKEY_C, PUBKEY_D, PUBKEY_E, PUBKEY_F}
         assert slot in {63, 64}
         assert is_new_epoch is True
 
@@ -321,11 +436,13 @@ def test_nominal() -> None:
         messenger: Messenger,
         slots_per_epoch: int = 32,
         explorer_url: str | None = None,
+        last_finalized_header: Header | None = None,
     ) -> int:
         assert isinstance(beacon, Beacon)
+        assert last_finalized_header == FINALIZED_HEADER
         assert last_processed_finalized_slot == 63
         assert slot in {63, 64}
-        assert pubkeys == {"0xaaa", "0xbbb", "0xccc", "0xddd", "0xeee", "0xfff"}
+        assert pubkeys == {PUBKEY_A, PUBKEY_B, PUBKEY_C, PUBKEY_D, PUBKEY_E, PUBKEY_F}
         assert isinstance(messenger, Messenger)
 
         return 63
@@ -334,16 +451,26 @@ def test_nominal() -> None:
         beacon: Beacon,
         potential_block: str | None,
         slot: int,
-        index_to_validator: dict[int, Validator],
+        index_to_validator: IndexToValidator,
         slots_per_epoch: int = 32,
+        store: ValidatorStore | None = None,
+        committee_positions: CommitteePositions | None = None,
     ) -> set[int]:
         assert isinstance(beacon, Beacon)
+        assert store is None
+        assert isinstance(committee_positions, CommitteePositions)
         assert potential_block == "A BLOCK"
         assert slot in {63, 64}
         assert index_to_validator == {
-            0: Validator(pubkey="0xaaa", effective_balance=32000000000, slashed=False),
-            2: Validator(pubkey="0xccc", effective_balance=32000000000, slashed=False),
-            4: Validator(pubkey="0xeee", effective_balance=32000000000, slashed=False),
+            0: ValidatorRecord(
+                pubkey=PUBKEY_A, effective_balance=32000000000, slashed=False
+            ),
+            2: ValidatorRecord(
+                pubkey=PUBKEY_C, effective_balance=32000000000, slashed=False
+            ),
+            4: ValidatorRecord(
+                pubkey=PUBKEY_E, effective_balance=32000000000, slashed=False
+            ),
         }
 
         return {0}
@@ -360,7 +487,7 @@ def test_nominal() -> None:
         assert isinstance(beacon, Beacon)
         assert potential_block == "A BLOCK"
         assert slot in {63, 64}
-        assert pubkeys == {"0xaaa", "0xbbb", "0xccc", "0xddd", "0xeee", "0xfff"}
+        assert pubkeys == {PUBKEY_A, PUBKEY_B, PUBKEY_C, PUBKEY_D, PUBKEY_E, PUBKEY_F}
         assert isinstance(messenger, Messenger)
 
         return True
@@ -369,16 +496,24 @@ def test_nominal() -> None:
         beacon: Beacon,
         beacon_type: BeaconType,
         epoch: int,
-        net_epoch2active_idx2val: dict[int, Validator],
-        our_epoch2active_idx2val: dict[int, Validator],
+        net_epoch2active_idx2val: LimitedDict,
+        our_epoch2active_idx2val: LimitedDict,
+        store: ValidatorStore | None = None,
     ) -> None:
         assert isinstance(beacon, Beacon)
+        assert store is None
         assert isinstance(beacon_type, BeaconType)
         assert epoch == 1
         assert net_epoch2active_idx2val[1] == {
-            0: Validator(pubkey="0xaaa", effective_balance=32000000000, slashed=False),
-            2: Validator(pubkey="0xccc", effective_balance=32000000000, slashed=False),
-            4: Validator(pubkey="0xeee", effective_balance=32000000000, slashed=False),
+            0: ValidatorRecord(
+                pubkey=PUBKEY_A, effective_balance=32000000000, slashed=False
+            ),
+            2: ValidatorRecord(
+                pubkey=PUBKEY_C, effective_balance=32000000000, slashed=False
+            ),
+            4: ValidatorRecord(
+                pubkey=PUBKEY_E, effective_balance=32000000000, slashed=False
+            ),
         }
 
     def write_liveness_file(liveness_file: Path) -> None:
@@ -388,6 +523,7 @@ def test_nominal() -> None:
     entrypoint.Coinbase = Coinbase  # type: ignore
     entrypoint.Web3Signer = Web3Signer  # type: ignore
     entrypoint.Relays = Relays  # type: ignore
+    entrypoint.EpochInclusions = EpochInclusions  # type: ignore
     entrypoint.get_our_pubkeys = get_our_pubkeys  # type: ignore
     entrypoint.process_missed_attestations = process_missed_attestations  # type: ignore
 
@@ -407,7 +543,7 @@ def test_nominal() -> None:
     environ["TELEGRAM_TOKEN"] = "my_telegram_token"
 
     _handler(
-        beacon_url="http://localhost:5052",
+        beacon_url=["http://localhost:5052"],
         execution_url=None,
         pubkeys_file_path=Path("/path/to/pubkeys"),
         web3signer_url="http://localhost:9000",
@@ -0,0 +1,78 @@
+"""Stub beacon node serving Server-Sent Events, for tests."""
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Queue
+from threading import Thread
+from typing import Any
+
+
+class SSEServer:
+    """Beacon node stub serving `/eth/v1/events`.
+
+    Events pushed with `push` are sent to the connected client. `disconnect` closes
+    the current connection, so the client has to reconnect.
+    """
+
+    def __init__(self) -> None:
+        self.events: Queue[tuple[str, Any] | None] = Queue()
+        self.paths: list[str] = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                server.paths.append(self.path)
+
+                if not self.path.startswith("/eth/v1/events"):
+                    self.send_error(404)
+                    self.close_connection = True
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                # Keep alive comment
+                self.__write_chunk(b": connected\n\n")
+
+                while (item := server.events.get()) is not None:
+                    event, data = item
+                    self.__write_chunk(
+                        f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+                    )
+
+                self.__write_chunk(b"")
+                self.close_connection = True
+
+            def __write_chunk(self, chunk: bytes) -> None:
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.__server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.__server.server_port}"
+        self.__thread = Thread(target=self.__server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "SSEServer":
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.disconnect()
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def push(self, event: str, data: Any) -> None:
+        """Send an event to the connected client."""
+        self.events.put((event, data))
+
+    def disconnect(self) -> None:
+        """Close the connection with the connected client."""
+        self.events.put(None)
@@ -0,0 +1,100 @@
+from eth_validator_watcher import events
+from eth_validator_watcher.events import EventStream
+
+from .sse_server import SSEServer
+
+ROOT = "0x" + "a" * 64
+
+
+def head(slot: int) -> dict:
+    return dict(
+        slot=str(slot),
+        block=ROOT,
+        state=ROOT,
+        epoch_transition=False,
+        previous_duty_dependent_root=ROOT,
+        current_duty_dependent_root=ROOT,
+        execution_optimistic=False,
+    )
+
+
+def test_event_stream_wait_for_block() -> None:
+    with SSEServer() as server:
+        event_stream = EventStream(server.url)
+        event_stream.start()
+
+        # No block received yet
+        assert not event_stream.wait_for_block(1, 0.1)
+
+        server.push("block", dict(slot="1", block=ROOT, execution_optimistic=False))
+        assert event_stream.wait_for_block(1, 5)
+        assert event_stream.last_head is None
+
+        server.push("head", head(3))
+        assert event_stream.wait_for_block(3, 5)
+        assert event_stream.last_head is not None
+        assert event_stream.last_head.slot == 3
+
+        # An older block does not go back in time
+        server.push("block", dict(slot="2", block=ROOT, execution_optimistic=False))
+        assert not event_stream.wait_for_block(4, 0.1)
+        assert event_stream.last_block_slot == 3
+
+        assert event_stream.pop_chain_reorgs() == []
+
+        server.push(
+            "chain_reorg",
+            dict(
+                slot="4",
+                depth="1",
+                old_head_block=ROOT,
+                new_head_block=ROOT,
+                old_head_state=ROOT,
+                new_head_state=ROOT,
+                epoch="0",
+                execution_optimistic=False,
+            ),
+        )
+
+        server.push("head", head(4))
+        assert event_stream.wait_for_block(4, 5)
+
+        (reorg,) = event_stream.pop_chain_reorgs()
+        assert (reorg.slot, reorg.depth) == (4, 1)
+        assert event_stream.pop_chain_reorgs() == []
+
+        event_stream.stop()
+
+    assert server.paths == ["/eth/v1/events?topics=head%2Cblock%2Cchain_reorg"]
+
+
+def test_event_stream_invalid_event() -> None:
+    with SSEServer() as server:
+        event_stream = EventStream(server.url, topics=["block"])
+        event_stream.start()
+
+        server.push("block", dict(slot="not a slot"))
+        server.push("block", dict(slot="5", block=ROOT, execution_optimistic=False))
+
+        assert event_stream.wait_for_block(5, 5)
+
+        event_stream.stop()
+
+
+def test_event_stream_reconnect(monkeypatch) -> None:
+    monkeypatch.setattr(events, "RECONNECT_DELAY_SEC", 0.01)
+
+    with SSEServer() as server:
+        event_stream = EventStream(server.url, topics=["block"])
+        event_stream.start()
+
+        server.push("block", dict(slot="1", block=ROOT, execution_optimistic=False))
+        assert event_stream.wait_for_block(1, 5)
+
+        server.disconnect()
+        server.push("block", dict(slot="2", block=ROOT, execution_optimistic=False))
+        assert event_stream.wait_for_block(2, 5)
+
+        event_stream.stop()
+
+    assert len(server.paths) == 2
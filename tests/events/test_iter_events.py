@@ -0,0 +1,27 @@
+from eth_validator_watcher.events import iter_events
+
+
+def test_iter_events() -> None:
+    lines = [
+        ": keep alive",
+        "",
+        "event: head",
+        'data: {"slot": "1"}',
+        "",
+        "event:block",
+        "data: first line",
+        "data: second line",
+        "",
+        "data: no event name",
+        "",
+        "event: ignored, no data",
+        "",
+        "event: truncated",
+        "data: not yielded",
+    ]
+
+    assert list(iter_events(lines)) == [
+        ("head", '{"slot": "1"}'),
+        ("block", "first line\nsecond line"),
+        ("message", "no event name"),
+    ]
@@ -4,6 +4,7 @@ from eth_validator_watcher.exited_validators import (
 )
 from eth_validator_watcher.models import Validators
 from eth_validator_watcher.messengers import Messenger
+from eth_validator_watcher.registry import WITHDRAWABLE_STATUSES, ValidatorRegistry
 
 Validator = Validators.DataItem.Validator
 
@@ -58,3 +59,29 @@ def test_process_exited_validators():
         exited_validators._ExitedValidators__our_exited_unslashed_indexes  # type: ignore
         == {44, 45, 48}
     )
+
+
+def test_process_exited_validators_registry_views():
+    StatusEnum = Validators.DataItem.StatusEnum
+
+    registry = ValidatorRegistry.from_items(
+        [
+            (44, StatusEnum.exitedUnslashed, "0x" + "4" * 96, 32000000000, False),
+            (46, StatusEnum.withdrawalDone, "0x" + "6" * 96, 0, False),
+            (47, StatusEnum.withdrawalPossible, "0x" + "7" * 96, 0, True),
+        ]
+    )
+
+    exited_validators = ExitedValidators(None)
+
+    exited_validators.process(
+        registry.view({StatusEnum.exitedUnslashed}),
+        registry.view(WITHDRAWABLE_STATUSES),
+    )
+
+    assert metric_our_exited_validators_count.collect()[0].samples[0].value == 2  # type: ignore
+
+    assert (
+        exited_validators._ExitedValidators__our_exited_unslashed_indexes  # type: ignore
+        == {44}
+    )
@@ -0,0 +1,135 @@
+from pathlib import Path
+
+from eth_validator_watcher.committee_positions import CommitteePositions
+from eth_validator_watcher.inclusions import (
+    EpochInclusions,
+    metric_inclusion_distance_slots,
+    metric_not_included_attestations_rate_gauge,
+)
+from eth_validator_watcher.lean_models import Attestation, Block, Body
+from eth_validator_watcher.models import Validators
+from eth_validator_watcher.store import ValidatorStore
+from eth_validator_watcher.utils import LimitedDict
+
+Validator = Validators.DataItem.Validator
+
+
+class Beacon:
+    def __init__(self) -> None:
+        self.epochs: list[int] = []
+
+    def get_duty_slot_to_committee_index_to_validators_index(
+        self, epoch: int, state_slot: int | None
+    ) -> dict[int, dict[int, list[int]]]:
+        assert epoch == 1
+        assert state_slot == 4
+        self.epochs.append(epoch)
+
+        return {
+            4: {0: [10, 11, 12]},
+            5: {0: [13, 14]},
+            6: {0: [15]},
+            7: {0: [16]},
+        }
+
+
+def make_block(slot: int, attestations: list[tuple[int, str]]) -> Block:
+    return Block(
+        data=Block.Data(
+            message=Block.Data.Message(
+                slot=slot,
+                proposer_index=0,
+                body=Body(
+                    attestations=[
+                        Attestation(
+                            aggregation_bits=aggregation_bits,
+                            data=Attestation.Data(slot=attestation_slot, index=0),
+                        )
+                        for attestation_slot, aggregation_bits in attestations
+                    ],
+                    execution_payload=Body.ExecutionPayload(
+                        fee_recipient="0x", block_hash="0x"
+                    ),
+                ),
+            )
+        )
+    )
+
+
+SLOT_TO_BLOCK = {
+    4: make_block(4, [(3, "0x03")]),  # Previous epoch
+    5: make_block(5, [(4, "0x0b")]),  # Validators 10 and 11
+    6: None,
+    7: make_block(7, [(4, "0x0d"), (5, "0x05")]),  # 10 (again), 12 and 13
+    8: make_block(8, [(6, "0x03")]),  # Validator 15
+    12: None,
+}
+
+OUR_ACTIVE_VALIDATORS_INDEX_TO_VALIDATOR = {
+    index: Validator(pubkey=f"0x{index}", effective_balance=32, slashed=False)
+    for index in (10, 12, 13, 15, 16)
+}
+
+
+def test_epoch_inclusions(tmp_path: Path) -> None:
+    beacon = Beacon()
+    store = ValidatorStore(tmp_path / "store.db")
+    inclusions = EpochInclusions(
+        CommitteePositions(beacon), slots_per_epoch=4, store=store  # type: ignore
+    )
+
+    # Validator 11 was not active yet during epoch 1, validator 16 is not active
+    # anymore
+    our_epoch_to_index_to_validator = LimitedDict(3)
+    our_epoch_to_index_to_validator[1] = OUR_ACTIVE_VALIDATORS_INDEX_TO_VALIDATOR
+    our_index_to_validator = {
+        index: Validator(pubkey=f"0x{index}", effective_balance=32, slashed=False)
+        for index in (10, 11, 12, 13, 15)
+    }
+
+    sum_before = metric_inclusion_distance_slots._sum.get()
+
+    epoch_to_index_to_inclusion_delay = {
+        slot: inclusions.process(
+            slot, block, our_epoch_to_index_to_validator, our_index_to_validator
+        )
+        for slot, block in SLOT_TO_BLOCK.items()
+    }
+
+    assert epoch_to_index_to_inclusion_delay == {
+        4: {},
+        5: {},
+        6: {},
+        7: {},
+        8: {},
+        12: {1: {10: 1, 12: 3, 13: 2, 15: 2, 16: None}},
+    }
+
+    # Committees are retrieved once
+    assert beacon.epochs == [1]
+
+    # One observation per included attestation
+    assert metric_inclusion_distance_slots._sum.get() - sum_before == 1 + 3 + 2 + 2
+    assert metric_not_included_attestations_rate_gauge._value.get() == 20
+    assert store.history(12)[0].inclusion_delay == 3
+    assert store.history(16)[0].inclusion_delay is None
+
+
+def test_epoch_inclusions_partial_epoch() -> None:
+    beacon = Beacon()
+    inclusions = EpochInclusions(CommitteePositions(beacon), slots_per_epoch=4)  # type: ignore
+
+    for slot, block in SLOT_TO_BLOCK.items():
+        if slot >= 5:
+            # Inclusions of the block of slot 4 are unknown
+            assert (
+                inclusions.process(
+                    slot,
+                    block,
+                    LimitedDict(3),
+                    OUR_ACTIVE_VALIDATORS_INDEX_TO_VALIDATOR,
+                )
+                == {}
+            )
+
+    assert beacon.epochs == []
@@ -0,0 +1,90 @@
+from pytest import raises
+from requests import ConnectionError, Response
+
+from eth_validator_watcher.instrumentation import (
+    metric_beacon_request_duration_sec,
+    metric_slot_processing_margin_sec,
+    metric_slot_processing_overrun_count,
+    metric_stage_duration_sec,
+    observe_slot_end,
+    path_template,
+    stage,
+    timed_request,
+)
+
+
+def count(metric, **labels) -> float:
+    return sum(bucket.get() for bucket in metric.labels(**labels)._buckets)
+
+
+def test_path_template() -> None:
+    assert (
+        path_template("http://localhost:5052/eth/v2/beacon/blocks/42?foo=1")
+        == "/eth/v2/beacon/blocks/{id}"
+    )
+
+    assert (
+        path_template("http://localhost:5052/eth/v1/beacon/headers/0xabCD01")
+        == "/eth/v1/beacon/headers/{id}"
+    )
+
+    assert (
+        path_template("http://localhost:5052/eth/v1/beacon/headers/finalized")
+        == "/eth/v1/beacon/headers/finalized"
+    )
+
+
+def test_stage() -> None:
+    with stage("test_stage"):
+        pass
+
+    with raises(ValueError):
+        with stage("test_stage"):
+            raise ValueError
+
+    assert count(metric_stage_duration_sec, stage="test_stage") == 2
+
+
+def test_timed_request() -> None:
+    response = Response()
+    response.status_code = 404
+
+    def send(url: str, timeout: int) -> Response:
+        assert url == "http://beacon/test/timed_request/1"
+        assert timeout == 3
+        return response
+
+    def send_error(url: str) -> Response:
+        raise ConnectionError
+
+    url = "http://beacon/test/timed_request/1"
+    assert timed_request("GET", send, url, timeout=3) is response
+
+    with raises(ConnectionError):
+        timed_request("POST", send_error, url)
+
+    path = "/test/timed_request/{id}"
+
+    assert (
+        count(metric_beacon_request_duration_sec, method="GET", path=path, status="404")
+        == 1
+    )
+
+    assert (
+        count(
+            metric_beacon_request_duration_sec, method="POST", path=path, status="error"
+        )
+        == 1
+    )
+
+
+def test_observe_slot_end() -> None:
+    overruns_before = metric_slot_processing_overrun_count._value.get()
+
+    observe_slot_end(slot_start_time_sec=100, seconds_per_slot=12, now=105.5)
+    assert metric_slot_processing_margin_sec._value.get() == 6.5
+    assert metric_slot_processing_overrun_count._value.get() == overruns_before
+
+    observe_slot_end(slot_start_time_sec=100, seconds_per_slot=12, now=113)
+    assert metric_slot_processing_margin_sec._value.get() == -1
+    assert metric_slot_processing_overrun_count._value.get() == overruns_before + 1
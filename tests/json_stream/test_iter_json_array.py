@@ -0,0 +1,87 @@
+import json
+from typing import Iterator
+
+from pytest import raises
+
+from eth_validator_watcher.json_stream import iter_json_array, iter_json_arrays
+
+
+def split(content: bytes, size: int) -> list[bytes]:
+    return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+def test_iter_json_array_nominal() -> None:
+    document = {
+        "execution_optimistic": False,
+        "finalized": True,
+        "data": [
+            {"index": "0", "pubkey": "0xé😀"},
+            {"index": "1"},
+            42,
+            [1, -2.5e-3],
+        ],
+        "trailing": {"a": [1, 2, 3]},
+    }
+
+    content = json.dumps(document).encode()
+
+    # Every chunk size, including the ones splitting multi-bytes UTF-8 characters and
+    # numbers, must lead to the same result
+    for size in range(1, len(content) + 1):
+        actual = list(iter_json_array(split(content, size), "data"))
+        assert actual == document["data"]
+
+
+def test_iter_json_array_compact_and_empty() -> None:
+    assert list(iter_json_array([b'{"data":[]}'], "data")) == []
+    assert list(iter_json_array([b"{}"], "data")) == []
+    assert list(iter_json_array([b'{"other": [1]}'], "data")) == []
+    assert list(iter_json_array([b'{"data":[1234]}'], "data")) == [1234]
+
+
+def test_iter_json_array_invalid() -> None:
+    with raises(ValueError):
+        list(iter_json_array([b"[1, 2]"], "data"))
+
+    with raises(ValueError):
+        list(iter_json_array([b'{"data": [1, 2'], "data"))
+
+
+def test_iter_json_array_invalid_fails_fast() -> None:
+    def chunks(first: bytes) -> Iterator[bytes]:
+        yield first
+        raise AssertionError("The rest of the stream should not be read")
+
+    for first in (
+        b'{"data": [1 2',
+        b'{"data": [{"a" 1',
+        b'{"data": [x, 1',
+        b'{"data": ["\\x", 1',
+        b'{"data": [[1, 2 3',
+    ):
+        with raises(ValueError):
+            list(iter_json_array(chunks(first), "data"))
+
+
+def test_iter_json_arrays() -> None:
+    document = {
+        "execution_optimistic": False,
+        "data": {
+            "ideal_rewards": [{"effective_balance": "1"}],
+            "other": [1, 2],
+            "total_rewards": [{"validator_index": "0"}, {"validator_index": "1"}],
+        },
+    }
+
+    content = json.dumps(document).encode()
+    keys = {"ideal_rewards", "total_rewards"}
+
+    for size in range(1, len(content) + 1):
+        assert list(iter_json_arrays(split(content, size), keys, ["data"])) == [
+            ("ideal_rewards", {"effective_balance": "1"}),
+            ("total_rewards", {"validator_index": "0"}),
+            ("total_rewards", {"validator_index": "1"}),
+        ]
+
+    assert list(iter_json_arrays([b'{"data": {}}'], keys, ["data"])) == []
+    assert list(iter_json_arrays([b'{"other": {"a": 1}}'], keys, ["data"])) == []
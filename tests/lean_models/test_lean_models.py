@@ -0,0 +1,190 @@
+import json
+from copy import deepcopy
+from pathlib import Path
+from typing import Any
+
+from pytest import MonkeyPatch, raises
+
+from benchmarks.simulator import SyntheticChain
+from eth_validator_watcher import models
+from eth_validator_watcher import lean_models
+from eth_validator_watcher.json_stream import iter_json_arrays
+from eth_validator_watcher.lean_models import (
+    TotalRewards,
+    decode_block,
+    decode_rewards,
+    decode_streamed_rewards,
+)
+from tests.beacon import assets
+
+
+def load(name: str) -> dict[str, Any]:
+    with (Path(assets.__file__).parent / name).open() as file_descriptor:
+        return json.load(file_descriptor)
+
+
+def synthetic_rewards(nb_validators: int) -> dict[str, Any]:
+    return {
+        "execution_optimistic": False,
+        "data": {
+            "ideal_rewards": [
+                {
+                    "effective_balance": str(effective_balance * 10**9),
+                    "head": "2948",
+                    "target": "5689",
+                    "source": "3062",
+                }
+                for effective_balance in range(1, 33)
+            ],
+            "total_rewards": [
+                {
+                    "validator_index": str(index),
+                    "head": "2948",
+                    "target": "5689",
+                    "source": "3062",
+                    "inclusion_delay": "0",
+                    "inactivity": "0",
+                }
+                for index in range(nb_validators)
+            ],
+        },
+    }
+
+
+def test_decode_block() -> None:
+    block_dict = load("block.json")
+    expected = models.Block(**block_dict)
+    block = decode_block(block_dict)
+
+    message, expected_message = block.data.message, expected.data.message
+    assert message.slot == expected_message.slot
+    assert message.proposer_index == expected_message.proposer_index
+
+    assert [
+        (attestation.aggregation_bits, attestation.data.slot, attestation.data.index)
+        for attestation in message.body.attestations
+    ] == [
+        (attestation.aggregation_bits, attestation.data.slot, attestation.data.index)
+        for attestation in expected_message.body.attestations
+    ]
+
+    payload = message.body.execution_payload
+    assert (
+        payload.fee_recipient == expected_message.body.execution_payload.fee_recipient
+    )
+    assert payload.block_hash == expected_message.body.execution_payload.block_hash
+
+
+def test_decode_block_invalid() -> None:
+    block_dict = deepcopy(load("block.json"))
+    block_dict["data"]["message"]["slot"] = "not a slot"
+
+    with raises(ValueError):
+        decode_block(block_dict)
+
+    del block_dict["data"]["message"]["body"]
+
+    with raises(ValueError):
+        decode_block(block_dict)
+
+
+def test_decode_rewards() -> None:
+    rewards_dict = load("rewards.json")
+    expected = models.Rewards(**rewards_dict)
+    rewards = decode_rewards(rewards_dict)
+
+    assert [
+        (reward.effective_balance, reward.source, reward.target, reward.head)
+        for reward in rewards.data.ideal_rewards
+    ] == [
+        (reward.effective_balance, reward.source, reward.target, reward.head)
+        for reward in expected.data.ideal_rewards
+    ]
+
+    assert [
+        (reward.validator_index, reward.source, reward.target, reward.head)
+        for reward in rewards.data.total_rewards
+    ] == [
+        (reward.validator_index, reward.source, reward.target, reward.head)
+        for reward in expected.data.total_rewards
+    ]
+
+
+def test_total_rewards() -> None:
+    expected = models.Rewards(**load("rewards.json")).data.total_rewards
+    total_rewards = TotalRewards.from_items(expected)
+
+    assert len(total_rewards) == 2
+    assert list(total_rewards.validator_indexes) == [8499, 8500]
+    assert list(total_rewards.sources) == [3062, -3073]
+    assert total_rewards[1].target == -5707
+    assert [reward.validator_index for reward in total_rewards[1:]] == [8500]
+    assert TotalRewards.from_items(total_rewards) is total_rewards
+    assert total_rewards == decode_rewards(load("rewards.json")).data.total_rewards
+
+
+def test_total_rewards_preallocated_and_select() -> None:
+    total_rewards = TotalRewards.preallocated([1, 2, 3])
+    total_rewards.set(2, 10, -20, 30)
+
+    assert list(total_rewards.sources) == [0, 0, 10]
+    assert total_rewards.select(b"\x00\x00\x01") == [total_rewards[2]]
+
+
+def test_decode_streamed_rewards(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(lean_models, "STREAM_BATCH_SIZE", 1)
+    rewards_dict = load("rewards.json")
+    content = json.dumps(rewards_dict).encode()
+
+    rewards = decode_streamed_rewards(
+        iter_json_arrays([content], {"ideal_rewards", "total_rewards"}, ["data"])
+    )
+
+    assert rewards == decode_rewards(rewards_dict)
+
+    rewards_dict["data"]["total_rewards"][0]["head"] = None
+    content = json.dumps(rewards_dict).encode()
+
+    with raises(ValueError):
+        decode_streamed_rewards(
+            iter_json_arrays([content], {"ideal_rewards", "total_rewards"}, ["data"])
+        )
+
+
+def test_decode_rewards_invalid() -> None:
+    rewards_dict = deepcopy(load("rewards.json"))
+    rewards_dict["data"]["total_rewards"][0]["head"] = None
+
+    with raises(ValueError):
+        decode_rewards(rewards_dict)
+
+
+# Decoding latencies are compared by `benchmarks.lean_models`
+
+
+def test_decode_block_synthetic() -> None:
+    block_dict = SyntheticChain(1_000).block(100)
+    expected = models.Block(**block_dict)
+    block = decode_block(block_dict)
+
+    assert [
+        (attestation.aggregation_bits, attestation.data.slot, attestation.data.index)
+        for attestation in block.data.message.body.attestations
+    ] == [
+        (attestation.aggregation_bits, attestation.data.slot, attestation.data.index)
+        for attestation in expected.data.message.body.attestations
+    ]
+
+
+def test_decode_rewards_synthetic() -> None:
+    rewards_dict = synthetic_rewards(1_000)
+    expected = models.Rewards(**rewards_dict)
+    rewards = decode_rewards(rewards_dict)
+
+    assert [
+        (reward.validator_index, reward.source, reward.target, reward.head)
+        for reward in rewards.data.total_rewards
+    ] == [
+        (reward.validator_index, reward.source, reward.target, reward.head)
+        for reward in expected.data.total_rewards
+    ]
@@ -27,9 +27,15 @@ def test_process_missed_attestations_some_dead_indexes() -> None:
     class Beacon:
         @staticmethod
         def get_validators_liveness(
-            beacon_type: BeaconType, epoch: int, validators_index: set[int]
+            beacon_type: BeaconType,
+            epoch: int,
+            validators_index: set[int],
+            assume_live: bool = True,
+            warn_epoch_too_old: bool = True,
         ) -> dict[int, bool]:
             assert beacon_type is BeaconType.OLD_TEKU
+            assert assume_live is False
+            assert warn_epoch_too_old is True
             assert epoch == 0
             assert validators_index == {42, 43, 44}
 
@@ -58,9 +64,15 @@ def test_process_missed_attestations_no_dead_indexes() -> None:
     class Beacon:
         @staticmethod
         def get_validators_liveness(
-            beacon_type: BeaconType, epoch: int, validators_index: set[int]
+            beacon_type: BeaconType,
+            epoch: int,
+            validators_index: set[int],
+            assume_live: bool = True,
+            warn_epoch_too_old: bool = True,
         ) -> dict[int, bool]:
             assert beacon_type is BeaconType.OLD_TEKU
+            assert assume_live is False
+            assert warn_epoch_too_old is True
             assert epoch == 0
             assert validators_index == {42, 43, 44}
 
@@ -10,6 +10,7 @@ from eth_validator_watcher.missed_blocks import (
 )
 from eth_validator_watcher.models import BlockIdentierType, Header, ProposerDuties
 from eth_validator_watcher.messengers import Messenger
+from eth_validator_watcher.proposer_schedule import ProposerSchedule
 
 
 def test_process_missed_blocks_finalized_future_slot() -> None:
@@ -55,7 +56,7 @@ def test_process_missed_blocks_finalized_nominal() -> None:
                 raise NoBlockError
 
         @staticmethod
-        def get_proposer_duties(epoch: int) -> ProposerDuties:
+        def get_proposer_schedule(epoch: int) -> ProposerSchedule:
             epoch_to_duties = {
                 1: ProposerDuties(
                     dependent_root="0xfff",
@@ -170,7 +171,7 @@ def test_process_missed_blocks_finalized_nominal() -> None:
                 ),
             }
 
-            return epoch_to_duties[epoch]
+            return ProposerSchedule(epoch_to_duties[epoch])
 
     beacon = Beacon()
     messenger = MockMessenger()
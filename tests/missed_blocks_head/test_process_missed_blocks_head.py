@@ -4,22 +4,25 @@ from eth_validator_watcher.missed_blocks import (
 )
 from eth_validator_watcher.models import ProposerDuties
 from eth_validator_watcher.messengers import Messenger
+from eth_validator_watcher.proposer_schedule import ProposerSchedule
 
 
 def test_process_missed_blocks_head_no_block() -> None:
     class Beacon:
         @staticmethod
-        def get_proposer_duties(epoch: int) -> ProposerDuties:
+        def get_proposer_schedule(epoch: int) -> ProposerSchedule:
             assert epoch == 0
 
-            return ProposerDuties(
-                dependent_root="0xfff",
-                data=[
-                    ProposerDuties.Data(pubkey="0xaaa", validator_index=0, slot=0),
-                    ProposerDuties.Data(pubkey="0xbbb", validator_index=1, slot=1),
-                    ProposerDuties.Data(pubkey="0xccc", validator_index=2, slot=2),
-                    ProposerDuties.Data(pubkey="0xddd", validator_index=3, slot=3),
-                ],
+            return ProposerSchedule(
+                ProposerDuties(
+                    dependent_root="0xfff",
+                    data=[
+                        ProposerDuties.Data(pubkey="0xaaa", validator_index=0, slot=0),
+                        ProposerDuties.Data(pubkey="0xbbb", validator_index=1, slot=1),
+                        ProposerDuties.Data(pubkey="0xccc", validator_index=2, slot=2),
+                        ProposerDuties.Data(pubkey="0xddd", validator_index=3, slot=3),
+                    ],
+                )
             )
 
     class MockMessenger(Messenger):
@@ -43,17 +46,19 @@ def test_process_missed_blocks_head_no_block() -> None:
 def test_process_missed_blocks_head_habemus_blockam() -> None:
     class Beacon:
         @staticmethod
-        def get_proposer_duties(epoch: int) -> ProposerDuties:
+        def get_proposer_schedule(epoch: int) -> ProposerSchedule:
             assert epoch == 0
 
-            return ProposerDuties(
-                dependent_root="0xfff",
-                data=[
-                    ProposerDuties.Data(pubkey="0xaaa", validator_index=0, slot=0),
-                    ProposerDuties.Data(pubkey="0xbbb", validator_index=1, slot=1),
-                    ProposerDuties.Data(pubkey="0xccc", validator_index=2, slot=2),
-                    ProposerDuties.Data(pubkey="0xddd", validator_index=3, slot=3),
-                ],
+            return ProposerSchedule(
+                ProposerDuties(
+                    dependent_root="0xfff",
+                    data=[
+                        ProposerDuties.Data(pubkey="0xaaa", validator_index=0, slot=0),
+                        ProposerDuties.Data(pubkey="0xbbb", validator_index=1, slot=1),
+                        ProposerDuties.Data(pubkey="0xccc", validator_index=2, slot=2),
+                        ProposerDuties.Data(pubkey="0xddd", validator_index=3, slot=3),
+                    ],
+                )
             )
 
     class MockMessenger(Messenger):
@@ -1,11 +1,12 @@
 from eth_validator_watcher.models import ProposerDuties
 from eth_validator_watcher.next_blocks_proposal import process_future_blocks_proposal
+from eth_validator_watcher.proposer_schedule import ProposerSchedule
 
 
 class Beacon:
     @staticmethod
-    def get_proposer_duties(epoch: int) -> ProposerDuties:
-        return {
+    def get_proposer_schedule(epoch: int) -> ProposerSchedule:
+        epoch_to_duties = {
             42: ProposerDuties(
                 dependent_root="0xfff",
                 data=[
@@ -18,7 +19,9 @@ class Beacon:
                     ProposerDuties.Data(pubkey="0xbbb", validator_index=1, slot=1376)
                 ],
             ),
-        }[epoch]
+        }
+
+        return ProposerSchedule(epoch_to_duties[epoch])
 
 
 def test_handle_next_blocks_proposal_no_work():
@@ -0,0 +1,102 @@
+import json
+import tracemalloc
+from collections import Counter
+from threading import Event, Thread
+from typing import Any
+
+from eth_validator_watcher.profiling import (
+    make_debug_app,
+    memory_snapshot,
+    sample_stacks,
+    to_collapsed,
+    to_speedscope,
+)
+
+STACKS = Counter({("MainThread", "main", "process"): 3, ("MainThread", "main"): 1})
+
+
+def test_sample_stacks() -> None:
+    stop = Event()
+
+    def busy_function() -> None:
+        while not stop.is_set():
+            pass
+
+    thread = Thread(target=busy_function, name="busy")
+    thread.start()
+
+    try:
+        stack_to_count = sample_stacks(0.1, interval_sec=0.005)
+    finally:
+        stop.set()
+        thread.join()
+
+    busy_stacks = [stack for stack in stack_to_count if stack[0] == "busy"]
+    assert len(busy_stacks) > 0
+    assert all(any("busy_function" in name for name in stack) for stack in busy_stacks)
+
+
+def test_to_collapsed() -> None:
+    assert to_collapsed(STACKS) == "MainThread;main;process 3\nMainThread;main 1\n"
+
+
+def test_to_speedscope() -> None:
+    speedscope = to_speedscope(STACKS, interval_sec=0.5)
+
+    assert speedscope["shared"]["frames"] == [
+        {"name": "MainThread"},
+        {"name": "main"},
+        {"name": "process"},
+    ]
+
+    (profile,) = speedscope["profiles"]
+    assert profile["samples"] == [[0, 1, 2], [0, 1]]
+    assert profile["weights"] == [1.5, 0.5]
+    assert profile["endValue"] == 2
+
+
+def test_memory_snapshot() -> None:
+    assert not tracemalloc.is_tracing()
+
+    try:
+        assert "started" in memory_snapshot(top=3)
+        assert tracemalloc.is_tracing()
+
+        lines = memory_snapshot(top=3).splitlines()
+        assert lines[0].startswith("Traced: ")
+        assert len(lines) <= 4
+    finally:
+        tracemalloc.stop()
+
+
+def test_make_debug_app() -> None:
+    def metrics_app(environ: dict[str, Any], start_response: Any) -> list[bytes]:
+        start_response("200 OK", [])
+        return [b"metrics"]
+
+    app = make_debug_app(metrics_app)
+    statuses: list[str] = []
+
+    def call(path: str, query: str = "") -> bytes:
+        environ = {"PATH_INFO": path, "QUERY_STRING": query}
+        return b"".join(app(environ, lambda status, _: statuses.append(status)))
+
+    assert call("/") == b"metrics"
+
+    body = call("/debug/profile", "seconds=0.05&format=speedscope")
+    assert json.loads(body)["profiles"][0]["type"] == "sampled"
+
+    call("/debug/profile", "seconds=1000")
+    call("/debug/profile", "format=svg")
+    call("/debug/memory", "group_by=traceback")
+
+    assert call("/debug/memory", "stop=true") == b"Memory tracing stopped.\n"
+
+    assert statuses == [
+        "200 OK",
+        "200 OK",
+        "400 Bad Request",
+        "400 Bad Request",
+        "400 Bad Request",
+        "200 OK",
+    ]
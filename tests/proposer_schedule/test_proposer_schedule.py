@@ -0,0 +1,42 @@
+from pytest import raises
+
+from eth_validator_watcher.models import ProposerDuties
+from eth_validator_watcher.proposer_schedule import ProposerSchedule
+
+Data = ProposerDuties.Data
+
+
+def test_proposer_schedule() -> None:
+    proposer_duties = ProposerDuties(
+        dependent_root="0xfff",
+        data=[
+            Data(pubkey="0xccc", validator_index=2, slot=34),
+            Data(pubkey="0xaaa", validator_index=0, slot=32),
+            Data(pubkey="0xbbb", validator_index=1, slot=33),
+            Data(pubkey="0xaaa", validator_index=0, slot=35),
+        ],
+    )
+
+    schedule = ProposerSchedule(proposer_duties)
+
+    assert schedule.dependent_root == "0xfff"
+    assert [duty.slot for duty in schedule.duties] == [32, 33, 34, 35]
+
+    assert 33 in schedule
+    assert 36 not in schedule
+
+    assert schedule.proposer(33) == ("0xbbb", 1)
+
+    with raises(KeyError):
+        schedule.proposer(36)
+
+    our_pubkeys = {"0xaaa", "0xccc"}
+    our_duties = schedule.our_duties(our_pubkeys)
+
+    assert [duty.slot for duty in our_duties] == [32, 34, 35]
+
+    # Memoized for the same set of public keys
+    assert schedule.our_duties(our_pubkeys) is our_duties
+
+    assert [duty.slot for duty in schedule.our_duties({"0xbbb"})] == [33]
+    assert schedule.our_duties(set()) == []
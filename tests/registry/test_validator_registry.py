@@ -0,0 +1,100 @@
+from pytest import raises
+
+from eth_validator_watcher.models import Validators
+from eth_validator_watcher.registry import (
+    ACTIVE_STATUSES,
+    WITHDRAWABLE_STATUSES,
+    ValidatorRecord,
+    ValidatorRegistry,
+)
+
+StatusEnum = Validators.DataItem.StatusEnum
+
+PUBKEY_0 = "0x" + "0" * 96
+PUBKEY_1 = "0x" + "1" * 96
+PUBKEY_2 = "0x" + "2" * 96
+PUBKEY_3 = "0x" + "3" * 96
+PUBKEY_5 = "0x" + "5" * 96
+
+ITEMS = [
+    (0, StatusEnum.activeOngoing, PUBKEY_0, 32000000000, False),
+    (1, StatusEnum.pendingQueued, PUBKEY_1, 32000000000, False),
+    (2, StatusEnum.activeSlashed, PUBKEY_2, 31000000000, True),
+    (3, StatusEnum.withdrawalDone, PUBKEY_3, 0, False),
+    (5, StatusEnum.activeExiting, PUBKEY_5, 32000000000, False),
+]
+
+
+def test_validator_registry() -> None:
+    registry = ValidatorRegistry.from_items(ITEMS)
+
+    assert len(registry) == 5
+    assert registry.count(ACTIVE_STATUSES) == 3
+    assert registry.count({StatusEnum.pendingQueued}) == 1
+    assert registry.count({StatusEnum.exitedSlashed}) == 0
+
+    assert registry.row(3) == 3
+    assert registry.row(5) == 4
+    assert registry.row(4) is None
+    assert registry.row(42) is None
+
+    assert registry.pubkey(4) == PUBKEY_5
+    assert registry.validator(2) == ValidatorRecord(
+        pubkey=PUBKEY_2, effective_balance=31000000000, slashed=True
+    )
+
+    active = registry.view(ACTIVE_STATUSES)
+
+    assert len(active) == 3
+    assert list(active) == [0, 2, 5]
+    assert list(active.rows()) == [0, 2, 4]
+    assert 2 in active
+    assert 1 not in active
+    assert "2" not in active
+
+    assert active == {
+        0: ValidatorRecord(
+            pubkey=PUBKEY_0, effective_balance=32000000000, slashed=False
+        ),
+        2: ValidatorRecord(
+            pubkey=PUBKEY_2, effective_balance=31000000000, slashed=True
+        ),
+        5: ValidatorRecord(
+            pubkey=PUBKEY_5, effective_balance=32000000000, slashed=False
+        ),
+    }
+
+    with raises(KeyError):
+        active[1]
+
+    assert dict(registry.view(WITHDRAWABLE_STATUSES)) == {
+        3: ValidatorRecord(pubkey=PUBKEY_3, effective_balance=0, slashed=False)
+    }
+
+
+def test_validator_registry_unsorted() -> None:
+    registry = ValidatorRegistry.from_items(reversed(ITEMS))
+
+    assert list(registry.indexes) == [0, 1, 2, 3, 5]
+    assert registry.pubkey(4) == PUBKEY_5
+
+
+def test_validator_registry_select_pubkeys() -> None:
+    registry = ValidatorRegistry.from_items(ITEMS)
+    ours = registry.select_pubkeys({PUBKEY_1, PUBKEY_5[2:], "0xinvalid"})
+
+    assert list(ours.indexes) == [1, 5]
+    assert ours.row(5) == 1
+    assert ours.count({StatusEnum.pendingQueued}) == 1
+    assert dict(ours.view(ACTIVE_STATUSES)) == {
+        5: ValidatorRecord(
+            pubkey=PUBKEY_5, effective_balance=32000000000, slashed=False
+        )
+    }
+
+
+def test_validator_registry_invalid_pubkey() -> None:
+    with raises(ValueError):
+        ValidatorRegistry.from_items(
+            [(0, StatusEnum.activeOngoing, "0x1234", 32000000000, False)]
+        )
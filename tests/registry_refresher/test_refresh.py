@@ -0,0 +1,71 @@
+from typing import Sequence
+
+from eth_validator_watcher.models import Validators
+from eth_validator_watcher.registry import ValidatorRegistry
+from eth_validator_watcher.registry_refresher import RegistryRefresher
+
+StatusEnum = Validators.DataItem.StatusEnum
+
+PUBKEY_0 = "0x" + "0" * 96
+PUBKEY_1 = "0x" + "1" * 96
+PUBKEY_2 = "0x" + "2" * 96
+PUBKEY_3 = "0x" + "3" * 96
+
+ITEMS = [
+    (0, StatusEnum.activeOngoing, PUBKEY_0, 32000000000, False),
+    (1, StatusEnum.activeOngoing, PUBKEY_1, 32000000000, False),
+    (2, StatusEnum.pendingQueued, PUBKEY_2, 32000000000, False),
+    (3, StatusEnum.activeOngoing, PUBKEY_3, 32000000000, False),
+]
+
+
+class Beacon:
+    def __init__(self) -> None:
+        self.calls: list[list[int | str] | None] = []
+
+    def get_validator_registry(
+        self, ids: Sequence[int | str] | None = None, epoch: int | None = None
+    ) -> ValidatorRegistry:
+        assert epoch in (10, 11, 12, 13)
+        self.calls.append(None if ids is None else list(ids))
+
+        if ids is None:
+            return ValidatorRegistry.from_items(ITEMS)
+
+        return ValidatorRegistry.from_items(
+            item for item in ITEMS if item[0] in ids or item[2] in ids
+        )
+
+
+def test_refresh_every_epoch() -> None:
+    beacon = Beacon()
+    refresher = RegistryRefresher(beacon)  # type: ignore
+
+    for epoch in (10, 11):
+        net_registry, our_registry = refresher.refresh(epoch, {PUBKEY_1, PUBKEY_3})
+
+        assert len(net_registry) == 4
+        assert list(our_registry.indexes) == [1, 3]
+
+    assert beacon.calls == [None, None]
+
+
+def test_refresh_incremental() -> None:
+    beacon = Beacon()
+    refresher = RegistryRefresher(beacon, full_refresh_epochs=3)  # type: ignore
+
+    net_registry, our_registry = refresher.refresh(10, {PUBKEY_1})
+    assert list(our_registry.indexes) == [1]
+
+    # Our known validator is retrieved by index, the new one by public key
+    net_registry_11, our_registry = refresher.refresh(11, {PUBKEY_1, PUBKEY_2})
+    assert net_registry_11 is net_registry
+    assert list(our_registry.indexes) == [1, 2]
+
+    net_registry_12, our_registry = refresher.refresh(12, {PUBKEY_1, PUBKEY_2})
+    assert net_registry_12 is net_registry
+    assert list(our_registry.indexes) == [1, 2]
+
+    refresher.refresh(13, {PUBKEY_1, PUBKEY_2})
+
+    assert beacon.calls == [None, [1, PUBKEY_2], [1, 2], None]
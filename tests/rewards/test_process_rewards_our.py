@@ -1,6 +1,10 @@
 from math import isclose
+from pathlib import Path
 
+from eth_validator_watcher import lean_models
 from eth_validator_watcher.models import BeaconType, Rewards, Validators
+from eth_validator_watcher.registry import ValidatorRegistry
+from eth_validator_watcher.store import ValidatorStore
 from eth_validator_watcher.rewards import (
     metric_our_actual_heads_count,
     metric_our_actual_neg_sources_count,
@@ -13,10 +17,12 @@ from eth_validator_watcher.rewards import (
     metric_our_suboptimal_heads_rate_gauge,
     metric_our_suboptimal_sources_rate_gauge,
     metric_our_suboptimal_targets_rate_gauge,
+    process_past_rewards,
     process_rewards,
 )
 from eth_validator_watcher.utils import LimitedDict
 
+StatusEnum = Validators.DataItem.StatusEnum
 Validator = Validators.DataItem.Validator
 
 
@@ -464,3 +470,152 @@ def test_process_rewards_no_our_validator_is_ideal() -> None:
     assert isclose(metric_our_suboptimal_sources_rate_gauge.collect()[0].samples[0].value, 1.0)  # type: ignore
     assert isclose(metric_our_suboptimal_targets_rate_gauge.collect()[0].samples[0].value, 1.0)  # type: ignore
     assert isclose(metric_our_suboptimal_heads_rate_gauge.collect()[0].samples[0].value, 1.0)  # type: ignore
+
+
+def test_process_rewards_our_validators_from_network_rewards(tmp_path: Path) -> None:
+    """Rewards are retrieved once, for the whole network, not sorted by index.
+    Validators are registry views. Validator 4 has no rewards."""
+
+    class Beacon:
+        def __init__(self) -> None:
+            self.nb_calls = 0
+
+        def get_rewards(
+            self,
+            beacon_type: BeaconType,
+            epoch: int,
+            validators_index: set[int] | None = None,
+        ) -> lean_models.Rewards:
+            assert validators_index is None
+            self.nb_calls += 1
+
+            return lean_models.decode_rewards(
+                {
+                    "data": {
+                        "ideal_rewards": [
+                            {
+                                "effective_balance": "32000000000",
+                                "source": "3062",
+                                "target": "5689",
+                                "head": "2948",
+                            }
+                        ],
+                        "total_rewards": [
+                            {
+                                "validator_index": str(index),
+                                "source": str(source),
+                                "target": "5689",
+                                "head": "2948",
+                            }
+                            for index, source in ((3, -3073), (1, 3062), (2, 3062))
+                        ],
+                    }
+                }
+            )
+
+    registry = ValidatorRegistry.from_items(
+        (index, StatusEnum.activeOngoing, f"0x{index:096x}", 32_000_000_000, False)
+        for index in (1, 2, 3, 4)
+    )
+
+    our_registry = registry.select_pubkeys({f"0x{3:096x}", f"0x{4:096x}"})
+
+    net_epoch_to_index_to_validator = LimitedDict(2)
+    net_epoch_to_index_to_validator[42] = registry.view([StatusEnum.activeOngoing])
+
+    our_epoch_to_index_to_validator = LimitedDict(2)
+    our_epoch_to_index_to_validator[42] = our_registry.view([StatusEnum.activeOngoing])
+
+    ideal_sources_count_before = metric_our_ideal_sources_count.collect()[0].samples[0].value  # type: ignore
+    actual_negative_sources_count_before = metric_our_actual_neg_sources_count.collect()[0].samples[0].value  # type: ignore
+
+    beacon = Beacon()
+    store = ValidatorStore(tmp_path / "store.db")
+
+    process_rewards(
+        beacon,  # type: ignore
+        BeaconType.LIGHTHOUSE,
+        42,
+        net_epoch_to_index_to_validator,
+        our_epoch_to_index_to_validator,
+        store=store,
+    )
+
+    ideal_sources_count_after = metric_our_ideal_sources_count.collect()[0].samples[0].value  # type: ignore
+    actual_negative_sources_count_after = metric_our_actual_neg_sources_count.collect()[0].samples[0].value  # type: ignore
+
+    assert beacon.nb_calls == 1
+    assert [row.validator_index for row in store.worst_validators()] == [3]
+    assert store.history(3)[0].actual_source == -3_073
+    assert ideal_sources_count_after - ideal_sources_count_before == 3_062
+
+    assert (
+        actual_negative_sources_count_after - actual_negative_sources_count_before
+        == 3_073
+    )
+
+    assert isclose(metric_our_suboptimal_sources_rate_gauge.collect()[0].samples[0].value, 1.0)  # type: ignore
+    assert isclose(metric_our_suboptimal_targets_rate_gauge.collect()[0].samples[0].value, 0.0)  # type: ignore
+
+
+def test_process_past_rewards(tmp_path: Path) -> None:
+    """Only rewards of our validators are retrieved, and metrics are untouched.
+    Validator 4 has no rewards."""
+
+    class Beacon:
+        def get_rewards(
+            self,
+            beacon_type: BeaconType,
+            epoch: int,
+            validators_index: set[int] | None = None,
+        ) -> lean_models.Rewards:
+            assert epoch == 40
+            assert validators_index == {3, 4}
+
+            return lean_models.decode_rewards(
+                {
+                    "data": {
+                        "ideal_rewards": [
+                            {
+                                "effective_balance": "32000000000",
+                                "source": "3062",
+                                "target": "5689",
+                                "head": "2948",
+                            }
+                        ],
+                        "total_rewards": [
+                            {
+                                "validator_index": "3",
+                                "source": "-3073",
+                                "target": "5689",
+                                "head": "2948",
+                            }
+                        ],
+                    }
+                }
+            )
+
+    our_registry = ValidatorRegistry.from_items(
+        (index, StatusEnum.activeOngoing, f"0x{index:096x}", 32_000_000_000, False)
+        for index in (3, 4)
+    )
+
+    ideal_sources_count_before = metric_our_ideal_sources_count.collect()[0].samples[0].value  # type: ignore
+
+    store = ValidatorStore(tmp_path / "store.db")
+
+    process_past_rewards(
+        Beacon(),  # type: ignore
+        BeaconType.LIGHTHOUSE,
+        40,
+        our_registry.view([StatusEnum.activeOngoing]),
+        store=store,
+    )
+
+    ideal_sources_count_after = metric_our_ideal_sources_count.collect()[0].samples[0].value  # type: ignore
+
+    assert ideal_sources_count_after == ideal_sources_count_before
+    assert [row.validator_index for row in store.worst_validators()] == [3]
+    assert store.history(3)[0].epoch == 40
+    assert store.history(3)[0].actual_source == -3_073
+    assert store.history(4) == []
@@ -0,0 +1,67 @@
+from threading import Event
+
+from pytest import raises
+
+from eth_validator_watcher.scheduler import EpochPipeline
+
+
+def test_epoch_pipeline_get() -> None:
+    pipeline: EpochPipeline[int] = EpochPipeline()
+    pipeline.submit(1, lambda x, y: x + y, 40, y=2)
+
+    assert pipeline.get(1) == 42
+    assert pipeline.is_ready(1)
+
+    pipeline.shutdown()
+
+
+def test_epoch_pipeline_is_ready() -> None:
+    pipeline: EpochPipeline[int] = EpochPipeline()
+    release = Event()
+
+    def stage() -> int:
+        release.wait()
+        return 42
+
+    assert not pipeline.is_ready(1)
+
+    pipeline.submit(1, stage)
+    assert not pipeline.is_ready(1)
+
+    release.set()
+    assert pipeline.get(1) == 42
+    assert pipeline.is_ready(1)
+
+    pipeline.shutdown()
+
+
+def test_epoch_pipeline_runs_stages_in_order() -> None:
+    pipeline: EpochPipeline[None] = EpochPipeline()
+    epochs: list[int] = []
+
+    for epoch in range(5):
+        pipeline.submit(epoch, epochs.append, epoch)
+
+    pipeline.shutdown()
+
+    assert epochs == [0, 1, 2, 3, 4]
+
+    # Only the last stages are kept
+    with raises(KeyError):
+        pipeline.get(1)
+
+    assert pipeline.is_ready(4)
+
+
+def test_epoch_pipeline_exception() -> None:
+    pipeline: EpochPipeline[None] = EpochPipeline()
+
+    def stage() -> None:
+        raise ValueError("boom")
+
+    pipeline.submit(1, stage)
+
+    with raises(ValueError):
+        pipeline.get(1)
+
+    pipeline.shutdown()
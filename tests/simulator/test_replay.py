@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from pytest import MonkeyPatch
+
+from benchmarks.simulator import SLOTS_PER_EPOCH, Simulator, SyntheticChain, pubkey
+from eth_validator_watcher import (
+    beacon,
+    coinbase,
+    entrypoint,
+    inclusions,
+    missed_attestations,
+    missed_blocks,
+    next_blocks_proposal,
+    relays,
+    rewards,
+    suboptimal_attestations,
+    utils,
+    web3signer,
+)
+from eth_validator_watcher.entrypoint import _handler
+from eth_validator_watcher.models import BeaconType
+from eth_validator_watcher.rewards import metric_net_ideal_sources_count
+
+
+def test_replay(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    # Other tests replace entrypoint dependencies with mocks
+    for module, name in (
+        (beacon, "Beacon"),
+        (coinbase, "Coinbase"),
+        (web3signer, "Web3Signer"),
+        (relays, "Relays"),
+        (inclusions, "EpochInclusions"),
+        (utils, "get_our_pubkeys"),
+        (utils, "slots"),
+        (utils, "write_liveness_file"),
+        (missed_attestations, "process_missed_attestations"),
+        (missed_attestations, "process_double_missed_attestations"),
+        (next_blocks_proposal, "process_future_blocks_proposal"),
+        (missed_blocks, "process_missed_blocks_finalized"),
+        (missed_blocks, "process_missed_blocks_head"),
+        (suboptimal_attestations, "process_suboptimal_attestations"),
+        (rewards, "process_rewards"),
+    ):
+        monkeypatch.setattr(entrypoint, name, getattr(module, name))
+
+    monkeypatch.setattr(entrypoint, "start_http_server", lambda _: None)
+
+    chain = SyntheticChain(5_000, seconds_per_slot=12)
+    pubkeys_file_path = tmp_path / "pubkeys.txt"
+    archive_path = tmp_path / "archive"
+
+    pubkeys_file_path.write_text(
+        "\n".join(pubkey(index) for index in chain.active_indexes[:500])
+    )
+
+    epoch = chain.current_slot() // SLOTS_PER_EPOCH - 3
+
+    def replay(beacon_url: str) -> float:
+        before = metric_net_ideal_sources_count._value.get()
+
+        _handler(
+            beacon_url=[beacon_url],
+            execution_url=None,
+            pubkeys_file_path=pubkeys_file_path,
+            web3signer_url=None,
+            fee_recipient=None,
+            slack_channel=None,
+            telegram_channel=None,
+            beacon_type=BeaconType.OTHER,
+            relays_url=[],
+            liveness_file=None,
+            explorer_url=None,
+            replay_from_epoch=epoch,
+            replay_to_epoch=epoch + 1,
+            replay_archive=archive_path,
+        )
+
+        return metric_net_ideal_sources_count._value.get() - before
+
+    with Simulator(chain) as simulator:
+        ideal_sources_count = replay(simulator.url)
+
+    assert ideal_sources_count > 0
+    assert (archive_path / f"epoch-{epoch}.bin.z").exists()
+
+    # Second replay is served from the archive only
+    assert replay("http://127.0.0.1:9") == ideal_sources_count
@@ -0,0 +1,108 @@
+from benchmarks.simulator import (
+    FEE_RECIPIENT,
+    SLOTS_PER_EPOCH,
+    Simulator,
+    SyntheticChain,
+)
+from eth_validator_watcher.beacon import Beacon
+from eth_validator_watcher.events import EventStream
+from eth_validator_watcher.execution import Execution
+from eth_validator_watcher.models import BeaconType, BlockIdentierType
+from eth_validator_watcher.registry import ACTIVE_STATUSES
+from eth_validator_watcher.suboptimal_attestations import aggregate_attestation_bits
+
+
+def test_simulator() -> None:
+    chain = SyntheticChain(
+        5_000,
+        seconds_per_slot=1,
+        missed_slots_rate=0,
+        missed_attestations_rate=0.1,
+        block_delay_ratio=0,
+    )
+
+    with Simulator(chain) as simulator:
+        beacon = Beacon(simulator.url)
+
+        assert beacon.get_genesis().data.genesis_time == chain.genesis_time
+        assert beacon.get_spec().data.SECONDS_PER_SLOT == 1
+        assert beacon.get_spec().data.SLOTS_PER_EPOCH == SLOTS_PER_EPOCH
+
+        head_slot = beacon.get_header(BlockIdentierType.HEAD).data.header.message.slot
+        finalized_slot = beacon.get_header(
+            BlockIdentierType.FINALIZED
+        ).data.header.message.slot
+
+        assert finalized_slot < head_slot
+        epoch = (head_slot - 1) // SLOTS_PER_EPOCH
+
+        # Validators registry
+        registry = beacon.get_validator_registry()
+        assert len(registry) == 5_000
+        assert registry.count(ACTIVE_STATUSES) == len(chain.active_indexes)
+        assert len(beacon.get_validator_registry([1, 2, "0x" + f"{3:096x}"])) == 3
+
+        # Duties
+        schedule = beacon.get_proposer_schedule(epoch)
+        assert len(schedule.duties) == SLOTS_PER_EPOCH
+
+        committees = beacon.get_duty_slot_to_committee_index_to_validators_index(epoch)
+
+        assert sum(
+            len(validators)
+            for committee_index_to_validators in committees.values()
+            for validators in committee_index_to_validators.values()
+        ) == len(chain.active_indexes)
+
+        # Block attestations match liveness
+        block = beacon.get_block(head_slot)
+        previous_slot = head_slot - 1
+        previous_epoch = previous_slot // SLOTS_PER_EPOCH
+
+        committee_index_to_validators = (
+            beacon.get_duty_slot_to_committee_index_to_validators_index(previous_epoch)[
+                previous_slot
+            ]
+        )
+
+        attesting = {
+            index
+            for committee_index, bits in aggregate_attestation_bits(
+                block, previous_slot
+            ).items()
+            for position, index in enumerate(
+                committee_index_to_validators[committee_index]
+            )
+            if bits >> position & 1
+        }
+
+        duties = {
+            index
+            for validators in committee_index_to_validators.values()
+            for index in validators
+        }
+
+        liveness = beacon.get_validators_liveness(
+            BeaconType.OTHER, previous_epoch, duties
+        )
+
+        assert attesting == {index for index, live in liveness.items() if live}
+        assert attesting != duties
+
+        # Rewards
+        rewards = beacon.get_rewards(BeaconType.OTHER, previous_epoch, {1, 2})
+        assert [item.validator_index for item in rewards.data.total_rewards] == [1, 2]
+
+        # Execution
+        execution = Execution(simulator.url)
+        execution_block = execution.eth_get_block_by_hash(
+            block.data.message.body.execution_payload.block_hash
+        )
+
+        assert execution_block.result.transactions[-1].to == FEE_RECIPIENT
+
+        # Events
+        event_stream = EventStream(simulator.url)
+        event_stream.start()
+        assert event_stream.wait_for_block(head_slot + 1, 5)
+        event_stream.stop()
@@ -0,0 +1,34 @@
+from copy import deepcopy
+
+from pytest import raises
+
+from benchmarks.simulator import SyntheticChain, ssz_block
+from eth_validator_watcher.lean_models import decode_block as decode_json_block
+from eth_validator_watcher.ssz import decode_block
+
+
+def test_decode_block() -> None:
+    block_dict = SyntheticChain(10_000).block(100)
+    block = decode_block(ssz_block(block_dict), "deneb")
+
+    assert len(block.data.message.body.attestations) > 0
+    assert block == decode_json_block(block_dict)
+
+
+def test_decode_block_without_attestations() -> None:
+    block_dict = deepcopy(SyntheticChain(10_000).block(100))
+    block_dict["data"]["message"]["body"]["attestations"] = []
+    block = decode_block(ssz_block(block_dict), "capella")
+
+    assert block.data.message.slot == 100
+    assert block.data.message.body.attestations == []
+
+
+def test_decode_block_invalid() -> None:
+    content = ssz_block(SyntheticChain(10_000).block(100))
+
+    with raises(ValueError):
+        decode_block(content, "altair")
+
+    with raises(ValueError):
+        decode_block(content[:200], "deneb")
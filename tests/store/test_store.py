@@ -0,0 +1,125 @@
+from pathlib import Path
+
+from eth_validator_watcher.store import ValidatorEpoch, ValidatorStore, ValidatorTotals
+
+
+def add_epoch(store: ValidatorStore, epoch: int, source: tuple[int, int]) -> None:
+    """Add an epoch of validators 1 and 2, having the given actual sources."""
+    store.add_rewards(
+        epoch, [1, 2], ([10, 10], [20, 20], [5, 5]), (source, [20, 20], [5, 5])
+    )
+
+
+def test_store(tmp_path: Path) -> None:
+    store = ValidatorStore(tmp_path / "store.db")
+
+    add_epoch(store, 10, (10, -10))
+    store.add_liveness(10, {1: True, 2: False})
+    store.add_inclusions(10, [1, 2], {2})
+    store.add_inclusion_delays(10, {1: 1, 2: None})
+
+    assert store.worst_validators() == [
+        ValidatorTotals(
+            validator_index=2,
+            missed_reward=20,
+            missed_attestations=1,
+            suboptimal_inclusions=1,
+        ),
+        ValidatorTotals(
+            validator_index=1,
+            missed_reward=0,
+            missed_attestations=0,
+            suboptimal_inclusions=0,
+        ),
+    ]
+
+    assert store.history(2) == [
+        ValidatorEpoch(
+            epoch=10,
+            ideal_source=10,
+            ideal_target=20,
+            ideal_head=5,
+            actual_source=-10,
+            actual_target=20,
+            actual_head=5,
+            is_live=False,
+            is_optimal_inclusion=False,
+            inclusion_delay=None,
+        )
+    ]
+
+    # Written again: rows are replaced, totals are not counted twice
+    add_epoch(store, 10, (10, 0))
+    store.add_liveness(10, {1: True, 2: True})
+
+    assert store.worst_validators(count=1) == [
+        ValidatorTotals(
+            validator_index=2,
+            missed_reward=10,
+            missed_attestations=0,
+            suboptimal_inclusions=1,
+        )
+    ]
+
+    store.close()
+
+    # Reopened
+    store = ValidatorStore(tmp_path / "store.db")
+    assert store.worst_validators(count=1)[0].missed_reward == 10
+
+
+def test_store_retention(tmp_path: Path) -> None:
+    store = ValidatorStore(tmp_path / "store.db", retention_epochs=2)
+
+    add_epoch(store, 10, (10, 0))
+    add_epoch(store, 11, (0, 10))
+    assert [totals.missed_reward for totals in store.worst_validators()] == [10, 10]
+
+    # Epoch 10 is pruned
+    add_epoch(store, 12, (0, 10))
+    assert store.worst_validators() == [
+        ValidatorTotals(
+            validator_index=1,
+            missed_reward=20,
+            missed_attestations=0,
+            suboptimal_inclusions=0,
+        ),
+        ValidatorTotals(
+            validator_index=2,
+            missed_reward=0,
+            missed_attestations=0,
+            suboptimal_inclusions=0,
+        ),
+    ]
+
+    assert [epoch.epoch for epoch in store.history(1)] == [11, 12]
+
+    # Epochs out of the retention window are ignored
+    add_epoch(store, 9, (0, 0))
+    assert [epoch.epoch for epoch in store.history(1)] == [11, 12]
+
+
+def test_store_worst_validators_last_epochs(tmp_path: Path) -> None:
+    store = ValidatorStore(tmp_path / "store.db")
+    assert store.worst_validators(nb_epochs=1) == []
+
+    add_epoch(store, 10, (0, 10))
+    add_epoch(store, 11, (10, 5))
+
+    assert store.worst_validators(count=1, nb_epochs=1) == [
+        ValidatorTotals(
+            validator_index=2,
+            missed_reward=5,
+            missed_attestations=0,
+            suboptimal_inclusions=0,
+        )
+    ]
+
+    assert store.worst_validators(count=1) == [
+        ValidatorTotals(
+            validator_index=1,
+            missed_reward=10,
+            missed_attestations=0,
+            suboptimal_inclusions=0,
+        )
+    ]
@@ -0,0 +1,32 @@
+from pytest import raises
+
+from eth_validator_watcher.models import Block
+from eth_validator_watcher.suboptimal_attestations import aggregate_attestation_bits
+
+
+def test_aggregate_attestation_bits_different_lengths():
+    Attestation = Block.Data.Message.Body.Attestation
+
+    block = Block.model_construct(
+        data=Block.Data.model_construct(
+            message=Block.Data.Message.model_construct(
+                body=Block.Data.Message.Body.model_construct(
+                    attestations=[
+                        Attestation(
+                            aggregation_bits="0x0d",
+                            data=Attestation.Data(slot=41, index=0),
+                        ),
+                        Attestation(
+                            aggregation_bits="0x0102",
+                            data=Attestation.Data(slot=41, index=0),
+                        ),
+                    ]
+                )
+            )
+        )
+    )
+
+    with raises(ValueError):
+        aggregate_attestation_bits(block, 41)
+
+    assert aggregate_attestation_bits(block, 42) == {}
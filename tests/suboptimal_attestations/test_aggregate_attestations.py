@@ -1,15 +1,12 @@
 import json
 from pathlib import Path
 
-import requests_mock
-
 from eth_validator_watcher.models import Block
-from eth_validator_watcher.suboptimal_attestations import aggregate_attestations
+from eth_validator_watcher.suboptimal_attestations import aggregate_attestation_bits
 from tests.beacon import assets
 
 
 def test_aggregate_attestations():
-    beacon_url = "http://beacon:5052"
     block_path = Path(assets.__file__).parent / "block.json"
 
     expected = {
@@ -76,5 +73,18 @@ def test_aggregate_attestations():
 
     block = Block(**block_dict)
 
-    with requests_mock.Mocker() as mock:
-        assert aggregate_attestations(block, 4839774) == expected
+    actual = aggregate_attestation_bits(block, 4839774)
+
+    assert actual.keys() == expected.keys()
+
+    for committee_index, bools in expected.items():
+        positions = list(range(len(bools)))
+
+        # Validators after the last one attesting are not part of the committee
+        assert actual[committee_index] < 1 << len(bools)
+
+        assert [
+            position
+            for position in positions
+            if actual[committee_index] >> position & 1
+        ] == [position for position, bit in zip(positions, bools) if bit]
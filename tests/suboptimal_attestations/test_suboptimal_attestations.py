@@ -7,14 +7,14 @@ from eth_validator_watcher.suboptimal_attestations import (
 Validator = models.Validators.DataItem.Validator
 
 
-def aggregate_attestations(
+def aggregate_attestation_bits(
     block: str,
     slot: int,
-) -> dict[int, list[bool]]:
+) -> dict[int, int]:
     assert block == "A dummy block"
     assert slot == 41
 
-    return {
+    committee_index_to_bools = {
         0: [
             False,  # Not our key
             True,  # Not our key
@@ -57,6 +57,11 @@ def aggregate_attestations(
         ],
     }
 
+    return {
+        committee_index: sum(1 << index for index, bit in enumerate(bools) if bit)
+        for committee_index, bools in committee_index_to_bools.items()
+    }
+
 
 def test_low_slot() -> None:
     expected: set[int] = set()
@@ -84,9 +89,10 @@ def test_our_pubkeys() -> None:
     class Beacon:
         @staticmethod
         def get_duty_slot_to_committee_index_to_validators_index(
-            epoch: int,
+            epoch: int, state_slot: int | None
         ) -> dict[int, dict[int, list[int]]]:
             assert epoch == 1
+            assert state_slot is None
 
             return {
                 41: {
@@ -133,7 +139,7 @@ def test_our_pubkeys() -> None:
                 }
             }
 
-    suboptimal_attestations.aggregate_attestations = aggregate_attestations
+    suboptimal_attestations.aggregate_attestation_bits = aggregate_attestation_bits
 
     expected = {10, 70}
     actual = process_suboptimal_attestations(
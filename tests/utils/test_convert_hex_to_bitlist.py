@@ -0,0 +1,13 @@
+from pytest import raises
+
+from eth_validator_watcher.utils import convert_hex_to_bitlist
+
+
+def test_convert_hex_to_bitlist():
+    assert convert_hex_to_bitlist("0x0d") == (0b101, 3)
+    assert convert_hex_to_bitlist("0d") == (0b101, 3)
+    assert convert_hex_to_bitlist("0x0102") == (0b000000001, 9)
+    assert convert_hex_to_bitlist("0x01") == (0, 0)
+
+    with raises(ValueError):
+        convert_hex_to_bitlist("0x0000")
@@ -26,6 +26,7 @@ def test_nominal_increasing() -> None:
     assert 3 in limited_dict
     assert limited_dict[3] == "c"
     assert 1 not in limited_dict
+    assert sorted(limited_dict) == [2, 3]
 
     with raises(KeyError):
         limited_dict[1]
@@ -0,0 +1,9 @@
+from eth_validator_watcher.utils import replay_slots
+
+
+def test_replay_slots() -> None:
+    assert list(replay_slots(1672531200, 2, 4, seconds_per_slot=12)) == [
+        (2, 1672531224),
+        (3, 1672531236),
+        (4, 1672531248),
+    ]
@@ -16,3 +16,19 @@ def test_slots() -> None:
     iter_slots = iter(slots(1672531200))
     assert next(iter_slots) == (2, 1672531224)
     assert next(iter_slots) == (3, 1672531236)
+
+
+def test_slots_virtual_clock() -> None:
+    class Clock:
+        def __init__(self) -> None:
+            self.now = 1672531213.0
+
+        def time(self) -> float:
+            return self.now
+
+        def sleep(self, seconds: float) -> None:
+            self.now += seconds
+
+    iter_slots = iter(slots(1672531200, clock=Clock()))  # type: ignore
+    assert next(iter_slots) == (2, 1672531224)
+    assert next(iter_slots) == (3, 1672531236)